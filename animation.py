@@ -0,0 +1,771 @@
+"""
+Animation Module - Pixelate animated images and video frame by frame
+
+Usage:
+    python main.py animate clip.gif out.gif --segments 48
+    python animation.py clip.mp4 out.png --segments 64 --palette pico-8
+
+Frames are streamed: FrameReader decodes one at a time (Pillow's
+ImageSequence for GIF/APNG/WebP, raw RGB frames from a local ffmpeg pipe
+for video), pixelate_frames pixelates and encodes them on a thread pool
+while keeping their order, and AnimationWriter appends each encoded
+frame to the output as it comes back (GIF and APNG chunk by chunk, video
+into an ffmpeg pipe). Only a bounded window of frames is in memory,
+whatever the length of the animation. A frame identical to the one before
+it (same hash) reuses that frame's result; GIF/APNG write such runs as a
+single longer frame.
+
+Pillow's own animated save (save_all) keeps every frame until the end,
+so it is not used.
+"""
+
+import argparse
+import hashlib
+import importlib
+import io
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from PIL import GifImagePlugin, Image, ImageSequence
+
+from pixel_transform import DITHERS, PALETTES, REDUCERS, pixelate_grid, reduce_palette
+
+
+# Pillow formats read frame by frame (APNG is read by the PNG plugin)
+ANIMATED_FORMATS = {
+    "GIF": "GifImagePlugin",
+    "PNG": "PngImagePlugin",
+    "WEBP": "WebPImagePlugin",
+}
+
+# File extensions read and written through ffmpeg
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".mkv", ".webm", ".avi")
+
+# Output extensions AnimationWriter writes itself
+ANIMATION_EXTENSIONS = (".gif", ".png", ".apng")
+
+# Display time of frames that do not state one (what browsers use)
+DEFAULT_FRAME_MS = 100
+
+# Frames kept in flight per worker thread (bounds frames in memory)
+FRAMES_PER_WORKER = 2
+
+# Largest frame delay field (16-bit: GIF 1/100 s, APNG numerator)
+MAX_DELAY = 0xFFFF
+
+ProgressCallback = Callable[[float, str], None]
+
+
+@dataclass
+class Frame:
+    """One frame and how long it is shown"""
+
+    image: Image.Image
+    duration: float  # milliseconds
+
+
+@dataclass
+class AnimationResult:
+    """Outcome of pixelating one animation"""
+
+    source: str
+    destination: str
+    frames: int          # frames read
+    unique_frames: int   # frames pixelated (the others repeated their predecessor)
+    output_bytes: int
+    elapsed: float
+
+    @property
+    def frames_per_second(self) -> float:
+        return self.frames / self.elapsed if self.elapsed > 0 else float("inf")
+
+
+def _ffmpeg(tool: str = "ffmpeg") -> str:
+    """Path of a local ffmpeg/ffprobe executable"""
+    path = shutil.which(tool)
+    if path is None:
+        raise RuntimeError(f"{tool} not found: install FFmpeg to read or write video")
+    return path
+
+
+def _is_video(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in VIDEO_EXTENSIONS
+
+
+def _frame_key(image: Image.Image) -> bytes:
+    """Hash identifying a frame's pixels (SHA-256: hardware-accelerated on most CPUs)"""
+    digest = hashlib.sha256()
+    digest.update(f"{image.mode}{image.size}".encode("ascii"))
+    digest.update(image.tobytes())
+    return digest.digest()
+
+
+class FrameReader:
+    """
+    Read the frames of an animated image or a video one at a time
+
+    Attributes:
+        size (Tuple[int, int]): Frame (width, height)
+        mode (str): "RGB", or "RGBA" for animations with transparency
+        frame_count (int): Number of frames (None = unknown)
+        fps (Fraction): Frame rate of videos (None for animated images)
+        loop (int): Times to play, 0 = forever, None = once
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fps = None
+        if _is_video(path):
+            self._probe_video()
+            return
+
+        for module in ANIMATED_FORMATS.values():
+            try:
+                importlib.import_module(f"PIL.{module}")
+            except ImportError:
+                # e.g. Pillow built without WebP support
+                pass
+        self._formats = [fmt for fmt in ANIMATED_FORMATS if fmt in Image.OPEN]
+        with Image.open(path, formats=self._formats) as img:
+            self.size = img.size
+            has_alpha = img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info
+            self.mode = "RGBA" if has_alpha else "RGB"
+            self.frame_count = getattr(img, "n_frames", 1)
+            self.loop = img.info.get("loop")
+
+    def _probe_video(self):
+        """Read size, frame rate and frame count with ffprobe"""
+        output = subprocess.run(
+            [
+                _ffmpeg("ffprobe"), "-v", "error", "-select_streams", "v:0",
+                "-show_entries", "stream=width,height,avg_frame_rate,nb_frames",
+                "-of", "default=noprint_wrappers=1", self.path,
+            ],
+            capture_output=True, text=True,
+        )
+        fields = dict(
+            line.split("=", 1) for line in output.stdout.splitlines() if "=" in line
+        )
+        if output.returncode != 0 or "width" not in fields:
+            raise ValueError(f"Cannot read video '{self.path}': {output.stderr.strip()}")
+
+        self.size = (int(fields["width"]), int(fields["height"]))
+        self.mode = "RGB"
+        self.loop = 0
+        try:
+            self.fps = Fraction(fields.get("avg_frame_rate", ""))
+        except (ValueError, ZeroDivisionError):
+            self.fps = None
+        if not self.fps:
+            self.fps = None
+        count = fields.get("nb_frames", "")
+        self.frame_count = int(count) if count.isdigit() else None
+
+    def frames(self) -> Iterator[Frame]:
+        """
+        Decode the frames in order (each one only when it is requested)
+
+        Yields:
+            Frame: Image in self.mode with its display time
+        """
+        if _is_video(self.path):
+            yield from self._video_frames()
+            return
+
+        with Image.open(self.path, formats=self._formats) as img:
+            for frame in ImageSequence.Iterator(img):
+                # convert() copies, so the frame survives the next seek
+                yield Frame(
+                    frame.convert(self.mode),
+                    frame.info.get("duration") or DEFAULT_FRAME_MS,
+                )
+
+    def _video_frames(self) -> Iterator[Frame]:
+        """Raw RGB frames from an ffmpeg pipe"""
+        width, height = self.size
+        frame_bytes = width * height * 3
+        duration = float(1000 / self.fps) if self.fps else DEFAULT_FRAME_MS
+        process = subprocess.Popen(
+            [
+                _ffmpeg(), "-v", "error", "-i", self.path,
+                "-f", "rawvideo", "-pix_fmt", "rgb24", "-",
+            ],
+            stdout=subprocess.PIPE,
+        )
+        try:
+            while True:
+                data = process.stdout.read(frame_bytes)
+                if len(data) < frame_bytes:
+                    break
+                yield Frame(Image.frombytes("RGB", self.size, data), duration)
+        finally:
+            process.stdout.close()
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+
+
+@dataclass
+class EncodedFrame:
+    """A frame prepared by AnimationWriter.encode (thread-safe, no file access)"""
+
+    size: Tuple[int, int]
+    data: bytes
+    transparency: Optional[int] = None  # GIF palette index
+
+
+class AnimationWriter:
+    """
+    Write an animation frame by frame
+
+    GIF (one local palette per frame), APNG (.png/.apng) and, through a
+    local ffmpeg, video (VIDEO_EXTENSIONS). Frames are compressed by
+    encode(), which worker threads may call in parallel; write() appends
+    them in order. The file is written as <name>.part<ext> and renamed on
+    close, so a failed run never leaves a half-written result.
+
+    Example:
+        >>> with AnimationWriter("out.gif", "RGB", loop=0) as writer:
+        ...     for frame in frames:
+        ...         writer.write(writer.encode(frame.image), frame.duration)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "RGB",
+        loop: Optional[int] = 0,
+        fps: Optional[float] = None,
+        compress_level: Optional[int] = None
+    ):
+        """
+        Args:
+            path (str): Output file; the extension picks the format
+            mode (str): "RGB" or "RGBA" (APNG and video store this mode)
+            loop (int): Times to play, 0 = forever, None = once
+            fps (float): Frame rate of video output (default: from the
+                         first frame's duration)
+            compress_level (int): zlib level of APNG frames (default: Pillow's)
+
+        Raises:
+            ValueError: If the extension or mode is not supported
+        """
+        root, ext = os.path.splitext(path)
+        ext = ext.lower()
+        if ext == ".gif":
+            self.kind = "gif"
+        elif ext in (".png", ".apng"):
+            self.kind = "apng"
+        elif ext in VIDEO_EXTENSIONS:
+            self.kind = "video"
+            _ffmpeg()
+        else:
+            supported = ", ".join(ANIMATION_EXTENSIONS + VIDEO_EXTENSIONS)
+            raise ValueError(f"Unsupported animation format: '{ext}' (use {supported})")
+        if mode not in ("RGB", "RGBA"):
+            raise ValueError(f"Unsupported animation mode: {mode}")
+
+        self.path = path
+        self.mode = "RGB" if self.kind == "video" else mode
+        self.loop = loop
+        self.fps = fps
+        self.compress_level = compress_level
+        self.size = None
+        self.frames_written = 0
+        self._temp_path = f"{root}.part{ext}"
+        self._file = None
+        self._process = None
+        self._stderr = None
+        self._pending = None   # (EncodedFrame, duration) not written yet
+        self._elapsed = 0.0    # milliseconds written so far
+        self._sequence = 0     # APNG chunk sequence number
+        self._actl_offset = 0
+
+    def encode(self, image: Image.Image) -> EncodedFrame:
+        """
+        Compress one frame for this writer (safe to call from worker threads)
+
+        Args:
+            image (PIL.Image): Frame; GIF takes palette ("P") images as they
+                               are and reduces others to 256 colors
+
+        Returns:
+            EncodedFrame: Data for write()
+        """
+        if self.kind == "gif":
+            return self._encode_gif(image)
+        if image.mode != self.mode:
+            image = image.convert(self.mode)
+        if self.kind == "video":
+            return EncodedFrame(image.size, image.tobytes())
+
+        buffer = io.BytesIO()
+        params = {} if self.compress_level is None else {"compress_level": self.compress_level}
+        image.save(buffer, format="PNG", **params)
+        return EncodedFrame(image.size, _png_image_data(buffer.getvalue()))
+
+    def _encode_gif(self, image: Image.Image) -> EncodedFrame:
+        """Image descriptor, local palette and LZW data of one GIF frame"""
+        if image.mode != "P":
+            image = reduce_palette(image, 256)
+
+        transparency = image.info.get("transparency")
+        if image.palette.mode == "RGBA" or isinstance(transparency, bytes):
+            # Alpha kept in the palette: entries below 128 become the one
+            # transparent entry (like reduce_palette's fixed palettes)
+            alpha = image.getpalette("RGBA")[3::4]
+            clear = [i for i, a in enumerate(alpha) if a < 128]
+            transparency = clear[0] if clear else None
+            if len(clear) > 1:
+                lut = list(range(256))
+                for i in clear:
+                    lut[i] = transparency
+                image = image.point(lut)
+        if image.palette.mode != "RGB":
+            rgb = image.getpalette("RGB")
+            image = image.copy()
+            image.putpalette(rgb)
+
+        data = GifImagePlugin.getdata(image, include_color_table=True)
+        return EncodedFrame(image.size, b"".join(data), transparency)
+
+    def write(self, frame: EncodedFrame, duration: float):
+        """
+        Append a frame shown for duration milliseconds
+
+        Writing the same EncodedFrame again extends the previous frame
+        (one longer GIF/APNG frame; repeated video frames).
+
+        Raises:
+            ValueError: If the frame size differs from the first frame's
+            RuntimeError: If ffmpeg fails
+        """
+        if self.size is None:
+            self._open(frame, duration)
+        elif frame.size != self.size:
+            raise ValueError(f"Frame size {frame.size} differs from {self.size}")
+
+        if self._pending is not None and self._pending[0] is frame:
+            self._pending = (frame, self._pending[1] + duration)
+            return
+        self._flush()
+        self._pending = (frame, duration)
+
+    def _open(self, frame: EncodedFrame, duration: float):
+        """Start the output with the first frame's size"""
+        self.size = frame.size
+        width, height = self.size
+        if self.kind == "video":
+            fps = self.fps or 1000 / duration
+            self.fps = fps
+            self._stderr = tempfile.TemporaryFile()
+            self._process = subprocess.Popen(
+                [
+                    _ffmpeg(), "-v", "error", "-y",
+                    "-f", "rawvideo", "-pix_fmt", "rgb24",
+                    "-s", f"{width}x{height}", "-r", f"{fps:g}", "-i", "-",
+                    # yuv420p plays everywhere but needs even dimensions
+                    "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p",
+                    self._temp_path,
+                ],
+                stdin=subprocess.PIPE, stderr=self._stderr,
+            )
+            return
+
+        if self.kind == "gif" and max(width, height) > 0xFFFF:
+            raise ValueError(f"GIF frames are at most 65535 pixels wide and high, got {width}x{height}")
+        self._file = open(self._temp_path, "wb")
+        if self.kind == "gif":
+            # GIF89a header without a global palette (each frame has its own)
+            self._file.write(b"GIF89a" + struct.pack("<HHBBB", width, height, 0, 0, 0))
+            if self.loop is not None:
+                self._file.write(
+                    b"!\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", self.loop) + b"\x00"
+                )
+        else:
+            color_type = 6 if self.mode == "RGBA" else 2
+            self._file.write(b"\x89PNG\r\n\x1a\n")
+            self._write_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0))
+            # Frame count is patched in on close
+            self._actl_offset = self._file.tell() + 8
+            plays = 1 if self.loop is None else self.loop
+            self._write_chunk(b"acTL", struct.pack(">II", 0, plays))
+
+    def _flush(self):
+        """Write the pending frame"""
+        if self._pending is None:
+            return
+        frame, duration = self._pending
+        self._pending = None
+        start, self._elapsed = self._elapsed, self._elapsed + duration
+
+        if self.kind == "gif":
+            # Delays are in 1/100 s; rounding the running time keeps the sum exact
+            delay = round(self._elapsed / 10) - round(start / 10)
+            packed = 1 if frame.transparency is not None else 0
+            if frame.transparency is not None:
+                packed |= 2 << 2  # restore to background before the next frame
+            # The delay field is 16-bit (up to ~11 minutes): longer frames
+            # are written again for the rest of their time
+            while True:
+                part = min(delay, MAX_DELAY)
+                delay -= part
+                self._file.write(
+                    b"!\xf9\x04" + struct.pack("<BHB", packed, part, frame.transparency or 0) + b"\x00"
+                )
+                self._file.write(frame.data)
+                if not delay:
+                    break
+                self.frames_written += 1
+        elif self.kind == "apng":
+            width, height = self.size
+            # Milliseconds while they fit the 16-bit numerator, else coarser units
+            delay = round(self._elapsed) - round(start)
+            for denominator in (1000, 100, 10, 1):
+                numerator = round(delay * denominator / 1000)
+                if numerator <= MAX_DELAY:
+                    break
+            numerator = min(numerator, MAX_DELAY)
+            self._write_chunk(b"fcTL", struct.pack(
+                ">IIIIIHHBB", self._next_sequence(), width, height, 0, 0,
+                numerator, denominator, 0, 0
+            ))
+            if self.frames_written == 0:
+                self._write_chunk(b"IDAT", frame.data)
+            else:
+                self._write_chunk(b"fdAT", struct.pack(">I", self._next_sequence()) + frame.data)
+        else:
+            # Constant frame rate: show each frame for as many video frames
+            # as its time span covers
+            repeats = round(self._elapsed * self.fps / 1000) - round(start * self.fps / 1000)
+            try:
+                for _ in range(repeats):
+                    self._process.stdin.write(frame.data)
+            except BrokenPipeError:
+                raise RuntimeError(f"ffmpeg failed: {self._ffmpeg_errors()}") from None
+        self.frames_written += 1
+
+    def _next_sequence(self) -> int:
+        self._sequence += 1
+        return self._sequence - 1
+
+    def _write_chunk(self, kind: bytes, data: bytes):
+        self._file.write(struct.pack(">I", len(data)) + kind + data)
+        self._file.write(struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    def _ffmpeg_errors(self) -> str:
+        self._stderr.seek(0)
+        return self._stderr.read().decode(errors="replace").strip()
+
+    def close(self) -> int:
+        """
+        Finish the file
+
+        Returns:
+            int: Size of the written file in bytes
+
+        Raises:
+            ValueError: If no frame was written
+            RuntimeError: If ffmpeg fails
+        """
+        try:
+            if self.size is None:
+                raise ValueError("No frames were written")
+            self._flush()
+            if self.kind == "video":
+                self._process.stdin.close()
+                if self._process.wait() != 0:
+                    raise RuntimeError(f"ffmpeg failed: {self._ffmpeg_errors()}")
+            elif self.kind == "gif":
+                self._file.write(b";")
+            else:
+                self._write_chunk(b"IEND", b"")
+                self._file.seek(self._actl_offset)
+                actl = struct.pack(">II", self.frames_written, 1 if self.loop is None else self.loop)
+                self._file.write(actl)
+                self._file.write(struct.pack(">I", zlib.crc32(b"acTL" + actl) & 0xFFFFFFFF))
+        except BaseException:
+            self._discard()
+            raise
+        self._release()
+        os.replace(self._temp_path, self.path)
+        return os.path.getsize(self.path)
+
+    def _release(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._process is not None:
+            if self._process.stdin and not self._process.stdin.closed:
+                self._process.stdin.close()
+            self._process.wait()
+            self._process = None
+        if self._stderr is not None:
+            self._stderr.close()
+            self._stderr = None
+
+    def _discard(self):
+        """Stop writing and remove the partial file"""
+        if self._process is not None and self._process.poll() is None:
+            self._process.kill()
+        self._release()
+        if os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._discard()
+
+
+def _png_image_data(png: bytes) -> bytes:
+    """Concatenated IDAT payload (the zlib stream) of an encoded PNG"""
+    parts = []
+    offset = 8
+    while offset < len(png):
+        length, kind = struct.unpack(">I4s", png[offset:offset + 8])
+        if kind == b"IDAT":
+            parts.append(png[offset + 8:offset + 8 + length])
+        offset += length + 12
+    return b"".join(parts)
+
+
+def _pixelate_frame(
+    image: Image.Image,
+    segments_count: int,
+    scale: Optional[int],
+    encode: Callable[[Image.Image], EncodedFrame],
+    options: dict
+) -> EncodedFrame:
+    """Pixelate and encode one frame (runs on a worker thread)"""
+    grid = pixelate_grid(image, segments_count, **options)
+    return encode(grid.to_image() if scale is None else grid.scaled(scale))
+
+
+def pixelate_frames(
+    frames: Iterable[Frame],
+    segments_count: int,
+    encode: Callable[[Image.Image], EncodedFrame],
+    scale: Optional[int] = None,
+    workers: Optional[int] = None,
+    window: Optional[int] = None,
+    **options
+) -> Iterator[Tuple[EncodedFrame, float, bool]]:
+    """
+    Pixelate and encode frames on a thread pool, in order
+
+    At most window frames are submitted but not yet yielded, so memory is
+    bounded however many frames there are. A frame with the same hash as
+    the one before it is not submitted; its predecessor's result (the same
+    object) is yielded again.
+
+    Args:
+        frames (Iterable[Frame]): Frames in display order (see FrameReader.frames)
+        segments_count (int): Pixelation segments along width
+        encode (Callable): Compresses a pixelated frame (AnimationWriter.encode)
+        scale (int): Enlarge the pixel grid this many times instead of
+                     keeping the frame size (None = frame size)
+        workers (int): Worker threads (default: CPU count)
+        window (int): Frames in flight (default: FRAMES_PER_WORKER x workers)
+        **options: Passed to pixel_transform.pixelate_grid (reducing_gap,
+                   colors, palette, dither, reducer, linear)
+
+    Yields:
+        Tuple[EncodedFrame, float, bool]: (result, duration in ms, reused)
+    """
+    workers = workers or os.cpu_count() or 1
+    window = window or workers * FRAMES_PER_WORKER
+    inflight = deque()  # (future, duration, reused)
+    previous_key = previous_future = None
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for frame in frames:
+            key = _frame_key(frame.image)
+            reused = key == previous_key
+            if not reused:
+                previous_key = key
+                previous_future = pool.submit(
+                    _pixelate_frame, frame.image, segments_count, scale, encode, options
+                )
+            inflight.append((previous_future, frame.duration, reused))
+
+            while len(inflight) >= window:
+                future, duration, reused = inflight.popleft()
+                yield future.result(), duration, reused
+
+        while inflight:
+            future, duration, reused = inflight.popleft()
+            yield future.result(), duration, reused
+
+
+def pixelate_animation(
+    source: str,
+    destination: str,
+    segments_count: int,
+    scale: Optional[int] = None,
+    workers: Optional[int] = None,
+    window: Optional[int] = None,
+    fps: Optional[float] = None,
+    compress_level: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None,
+    **options
+) -> AnimationResult:
+    """
+    Pixelate every frame of an animated image or video into an animation
+
+    GIF output without colors/palette reduces each frame's grid to its
+    own 256 colors (far cheaper than quantizing the full-size frame).
+
+    Args:
+        source (str): Animated GIF/APNG/WebP or video
+        destination (str): .gif, .png/.apng or a video extension
+        segments_count (int): Pixelation segments along width
+        scale (int): Grid enlargement instead of the frame size (see pixelate_frames)
+        workers (int): Worker threads (default: CPU count)
+        window (int): Frames in flight (see pixelate_frames)
+        fps (float): Frame rate of video output (default: the source's)
+        compress_level (int): zlib level of APNG frames
+        progress (Callable): Called as progress(fraction, stage) per frame
+                             (fraction 0 if the frame count is unknown)
+        **options: Passed to pixel_transform.pixelate_grid
+
+    Returns:
+        AnimationResult: Frame counts, size and time
+
+    Raises:
+        ValueError: If a format or a pixelation option is not supported
+        RuntimeError: If pixelation or ffmpeg fails
+    """
+    start = time.perf_counter()
+    reader = FrameReader(source)
+    if _is_video(destination) and fps is None and reader.fps is not None:
+        fps = float(reader.fps)
+    writer = AnimationWriter(destination, reader.mode, reader.loop, fps, compress_level)
+    if writer.kind == "gif" and options.get("colors") is None and options.get("palette") is None:
+        options["colors"] = 256
+
+    frames = unique = 0
+    with writer:
+        for encoded, duration, reused in pixelate_frames(
+            reader.frames(), segments_count, writer.encode, scale, workers, window, **options
+        ):
+            writer.write(encoded, duration)
+            frames += 1
+            unique += not reused
+            if progress is not None:
+                fraction = frames / reader.frame_count if reader.frame_count else 0.0
+                progress(min(fraction, 1.0), f"Frame {frames}")
+
+    return AnimationResult(
+        source, destination, frames, unique,
+        os.path.getsize(destination), time.perf_counter() - start
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the command-line parser for the animation entry point"""
+    parser = argparse.ArgumentParser(
+        prog="image2pixel animate",
+        description="Pixelate an animated GIF/APNG/WebP or a video frame by frame",
+    )
+    parser.add_argument("input", help="Animated image, or video (needs ffmpeg)")
+    parser.add_argument(
+        "output",
+        help="Output .gif, .png (APNG) or video (mp4, mov, mkv, webm, avi; needs ffmpeg)"
+    )
+    parser.add_argument(
+        "--segments", type=int, required=True, help="Pixelation segments along width"
+    )
+    parser.add_argument(
+        "--scale", type=int, default=None,
+        help="Write the pixel grid enlarged N times instead of at the frame size"
+    )
+    parser.add_argument("--reducer", choices=REDUCERS, default="mean", help="Block color")
+    parser.add_argument(
+        "--colors", type=int, default=None,
+        help="Reduce every frame to N colors, 2-256 (GIF: 256 by default)"
+    )
+    parser.add_argument(
+        "--palette", choices=list(PALETTES), default=None, help="Map frames to a fixed palette"
+    )
+    parser.add_argument(
+        "--dither", choices=DITHERS, default="none",
+        help="Dither the reduced palette (ordered keeps a stable pattern between frames)"
+    )
+    parser.add_argument(
+        "--fps", type=float, default=None, help="Frame rate of video output (default: the input's)"
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, default=None, help="Worker threads (default: CPU count)"
+    )
+    parser.add_argument(
+        "--window", type=int, default=None,
+        help=f"Frames in flight (default: {FRAMES_PER_WORKER} x workers)"
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Animation entry point
+
+    Args:
+        argv (List[str]): Command-line arguments (default: sys.argv[1:])
+
+    Returns:
+        int: Process exit code
+    """
+    args = build_parser().parse_args(argv)
+
+    if args.segments <= 0:
+        print(f"error: --segments must be > 0, got {args.segments}", file=sys.stderr)
+        return 2
+    if args.scale is not None and args.scale < 1:
+        print(f"error: --scale must be >= 1, got {args.scale}", file=sys.stderr)
+        return 2
+    if args.colors is not None and not 2 <= args.colors <= 256:
+        print(f"error: --colors must be 2-256, got {args.colors}", file=sys.stderr)
+        return 2
+    if args.dither != "none" and args.colors is None and args.palette is None \
+            and not args.output.lower().endswith(".gif"):
+        print("error: --dither needs --colors or --palette", file=sys.stderr)
+        return 2
+
+    def report(fraction, stage):
+        print(f"\r{stage}" + (f" ({fraction:.0%})" if fraction else ""), end="", flush=True)
+
+    try:
+        result = pixelate_animation(
+            args.input, args.output, args.segments, scale=args.scale,
+            workers=args.workers, window=args.window, fps=args.fps, progress=report,
+            reducer=args.reducer, colors=args.colors, palette=args.palette, dither=args.dither,
+        )
+    except (OSError, ValueError, RuntimeError, struct.error) as e:
+        print(f"\nerror: {e}", file=sys.stderr)
+        return 1
+
+    print(
+        f"\n{result.frames} frames ({result.unique_frames} pixelated) in "
+        f"{result.elapsed:.2f} s  |  {result.frames_per_second:.1f} frames/s  |  "
+        f"{result.output_bytes / 1024:.0f} KB"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,867 @@
+"""
+Image2Pixel - Main Application Logic
+A PyQt6-based image cropping and pixelation tool
+
+Started by main.py, which keeps the headless entry points free of Qt.
+"""
+
+import os
+from pathlib import Path
+from PyQt6 import QtWidgets, QtCore
+from gui import SimpleAppGui
+from display_image import pil_to_qimage, qimage_to_pixmap
+from edit_graph import editing_graph, frozen_options, source_params
+from edit_history import EditHistory, HistoryStep
+from edit_image import compute_crop_box
+from export import DEFAULT_OPTIONS, EXPORT_FORMATS, encoder_params, write_file
+from image_io import decode_preview, read_header
+from pixel_transform import DEFAULT_REDUCING_GAP, PixelGrid, make_proxy, pixelate_proxy
+from image_cache import decoded_images
+from workers import JobLane
+
+
+class AppLogic(SimpleAppGui):
+    """Main application logic handling user interactions and image processing"""
+    
+    # Constants
+    DEFAULT_ZOOM = 100
+    MIN_ZOOM = 100
+    MAX_ZOOM = 500
+    REDUCING_GAP = DEFAULT_REDUCING_GAP  # None = exact pixelation
+    PREVIEW_DEBOUNCE_MS = 15
+    
+    def __init__(self):
+        super().__init__()
+        # Every result is an output of the edit graph for some settings
+        # (edit_graph.Settings); its memos make going back to earlier
+        # crops and pixel settings instant
+        self.edit_graph = editing_graph()
+        self.edit_settings = {}  # Source and crop of the current image
+        self.current_header = None  # image_io.ImageHeader of current_file_path
+        
+        self.image_after_crop = None  # Crop node output (clean crop before pixelation)
+        self.last_processed_image = None  # PIL Image or PixelGrid shown
+        self.applied_settings = None  # Settings last_processed_image was made with
+        
+        # Undo/redo: settings, control values and small grids, no bitmaps
+        self.history = EditHistory()
+        self._load_label = "Load"  # History label of the running load ("Load" / "Reset")
+        
+        # Loading, crop and pixelation run in the background; only the
+        # latest request of each kind is applied
+        self.load_jobs = JobLane(self)
+        self.coarse_jobs = JobLane(self)  # Quick preview while load_jobs decodes
+        self.crop_jobs = JobLane(self)
+        self.pixel_jobs = JobLane(self)
+        self.preview_jobs = JobLane(self)
+        self.export_jobs = JobLane(self)  # Not cancelled: started saves complete
+        self.display_jobs = JobLane(self)  # Full-size image of a result not memoized
+        
+        # Live preview: debounced slider changes, rendered on a display-sized proxy
+        self._preview_proxy = None  # (source image, view size, proxy)
+        self._preview_timer = QtCore.QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(self.PREVIEW_DEBOUNCE_MS)
+
+        self._connect_signals()
+
+    @property
+    def current_file_path(self):
+        """File the edit settings start from (None = no image)"""
+        source = self.edit_settings.get("source")
+        return None if source is None else source["path"]
+
+    def _pixel_settings(self):
+        """(block color, palette, dither, linear light) choices shown by the controls"""
+        # Dithering only applies to reduced palettes, linear light to
+        # averaging (the controls are disabled otherwise)
+        dither_choice = self.combo_dither.currentText() if self.combo_dither.isEnabled() else None
+        linear = self.check_linear.isEnabled() and self.check_linear.isChecked()
+        return (
+            self.combo_reducer.currentText(), self.combo_palette.currentText(), dither_choice, linear
+        )
+
+    def _palette_args(self, pixel_settings):
+        """pixel_transform palette keyword arguments for pixel settings"""
+        _, palette_choice, dither_choice, _ = pixel_settings
+        colors, palette = self.PALETTE_CHOICES[palette_choice]
+        if colors is None and palette is None:
+            return {}
+        return {"colors": colors, "palette": palette, "dither": self.DITHER_CHOICES.get(dither_choice)}
+
+    def _reducer(self, pixel_settings):
+        return self.REDUCER_CHOICES[pixel_settings[0]]
+
+    def _linear(self, pixel_settings):
+        return pixel_settings[3]
+
+    def _settings_for(self, segments_count, pixel_settings):
+        """Edit settings of the current crop pixelated with these controls"""
+        if segments_count == 0:
+            return self.edit_settings
+        return dict(
+            self.edit_settings,
+            reduce={
+                "segments_count": segments_count,
+                "reducing_gap": self.REDUCING_GAP,
+                "reducer": self._reducer(pixel_settings),
+                "linear": self._linear(pixel_settings),
+            },
+            palette=self._palette_args(pixel_settings),
+        )
+
+    def _is_applied(self, segments_count, pixel_settings):
+        """True if last_processed_image already shows these pixel settings"""
+        return self._settings_for(segments_count, pixel_settings) == self.applied_settings
+
+    def _on_palette_changed(self):
+        self.combo_dither.setEnabled(bool(self._palette_args(self._pixel_settings())))
+        self._schedule_preview()
+
+    def _controls(self):
+        """Pixel control values, as stored in history steps"""
+        return self.slider_pixel.value(), self._pixel_settings()
+
+    def _apply_controls(self, controls):
+        """Show control values of a history step (without triggering previews)"""
+        segments_count, (reducer_choice, palette_choice, dither_choice, linear) = controls
+        widgets = (
+            self.slider_pixel, self.combo_reducer, self.combo_palette, self.combo_dither,
+            self.check_linear
+        )
+        for widget in widgets:
+            widget.blockSignals(True)
+        
+        self.slider_pixel.setValue(segments_count)
+        self.update_pixel_label(segments_count)
+        self.combo_reducer.setCurrentText(reducer_choice)
+        self.combo_palette.setCurrentText(palette_choice)
+        if dither_choice is not None:
+            self.combo_dither.setCurrentText(dither_choice)
+        self.check_linear.setChecked(linear)
+        
+        for widget in widgets:
+            widget.blockSignals(False)
+        
+        pixel_settings = self._pixel_settings()
+        self.combo_dither.setEnabled(bool(self._palette_args(pixel_settings)))
+        self.check_linear.setEnabled(self._reducer(pixel_settings) == "mean")
+
+    def _on_reducer_changed(self):
+        self.check_linear.setEnabled(self._reducer(self._pixel_settings()) == "mean")
+        self._schedule_preview()
+
+    def _connect_signals(self):
+        """Connect all UI signals to their handlers"""
+        # Button connections
+        self.btn_load.clicked.connect(self.load_image)
+        self.btn_apply.clicked.connect(self.apply_transform)
+        self.btn_pixel_apply.clicked.connect(self.apply_pixel)
+        self.btn_save.clicked.connect(self.save_image)
+        self.btn_reset.clicked.connect(self.reset_image)
+        self.btn_undo.clicked.connect(self.undo)
+        self.btn_redo.clicked.connect(self.redo)
+
+        # UI control signals
+        self.combo_ratio.currentTextChanged.connect(self.image_display.set_ratio)
+        self.combo_ratio.activated.connect(lambda: self.image_display.set_overlay_visible(True))
+        
+        self.slider_zoom.valueChanged.connect(self.update_zoom_label) 
+        self.slider_zoom.valueChanged.connect(self.image_display.set_zoom)
+        self.check_free_mode.stateChanged.connect(self.image_display.set_free_mode)
+        self.slider_pixel.valueChanged.connect(self.update_pixel_label)
+        self.slider_pixel.valueChanged.connect(self._schedule_preview)
+        self.combo_palette.currentTextChanged.connect(self._on_palette_changed)
+        self.combo_dither.currentTextChanged.connect(self._schedule_preview)
+        self.combo_reducer.currentTextChanged.connect(self._on_reducer_changed)
+        self.check_linear.toggled.connect(self._schedule_preview)
+        self.check_live_preview.toggled.connect(self._on_live_preview_toggled)
+        self._preview_timer.timeout.connect(self.update_preview)
+        
+        # Export options
+        self.combo_ext.currentTextChanged.connect(self._sync_export_controls)
+        self.combo_preset.currentTextChanged.connect(self._sync_export_controls)
+        self._sync_export_controls()
+        
+        # Busy indicator (previews are too short-lived to show it)
+        self.load_jobs.busy_changed.connect(self._update_busy)
+        self.crop_jobs.busy_changed.connect(self._update_busy)
+        self.pixel_jobs.busy_changed.connect(self._update_busy)
+        self.export_jobs.busy_changed.connect(self._update_busy)
+        self.display_jobs.busy_changed.connect(self._update_busy)
+
+    def update_zoom_label(self, value):
+        """Update zoom label text with current zoom percentage"""
+        self.label_zoom.setText(f"Zoom: {value}%")
+
+    def update_pixel_label(self, value):
+        """Update pixelation label text"""
+        text = "Pixelation: Off" if value == 0 else f"Pixelation: {value} segments"
+        self.label_pixel.setText(text)
+
+    def update_info_status(self, width, height, elapsed=None):
+        """Update status bar with current image info and last operation time"""
+        if self.current_file_path:
+            name = Path(self.current_file_path).name
+            text = f" 📂 {name}  |  📏 {width} x {height} px"
+            if self.current_header is not None and self.current_header.orientation != 1:
+                text += f"  |  🧭 EXIF orientation {self.current_header.orientation} (not applied)"
+            if self.load_jobs.busy:
+                text += "  |  ⏳ loading…"
+            elif elapsed is not None:
+                text += f"  |  ⏱ {elapsed * 1000:.0f} ms"
+            if len(self.history):
+                # Memory of the undo history itself (results are memoized by the edit graph)
+                kb = self.history.nbytes / 1024
+                size = f"{kb:.0f} KB" if kb < 1024 else f"{kb / 1024:.1f} MB"
+                text += f"  |  🕘 {self.history.position}/{len(self.history)} steps, {size}"
+            self.info_label.setText(text)
+
+    def _update_busy(self):
+        """Show the busy indicator while any background job runs"""
+        if not self.export_jobs.busy:
+            # Back to indeterminate after an export's progress display
+            self.busy_bar.setRange(0, 0)
+            self.busy_bar.setTextVisible(False)
+        self.busy_bar.setVisible(
+            self.load_jobs.busy or self.crop_jobs.busy or self.pixel_jobs.busy
+            or self.export_jobs.busy or self.display_jobs.busy
+        )
+
+    def _cancel_jobs(self):
+        """Drop results of all pending load/crop/pixelation/preview/display jobs"""
+        self.load_jobs.cancel()
+        self.coarse_jobs.cancel()
+        self.crop_jobs.cancel()
+        self.pixel_jobs.cancel()
+        self.display_jobs.cancel()
+        self._cancel_preview()
+
+    def _cancel_preview(self):
+        self._preview_timer.stop()
+        self.preview_jobs.cancel()
+
+    def load_image(self):
+        """Load an image file: header now, pixels in the background"""
+        file_path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, 
+            "Open Image", 
+            "", 
+            "Images (*.png *.jpg *.jpeg *.webp *.bmp *.tif *.tiff)"
+        )
+        
+        if not file_path:
+            return
+            
+        try:
+            # Validate file exists and is readable
+            if not os.path.isfile(file_path):
+                raise FileNotFoundError(f"File not found: {file_path}")
+            
+            # Size, mode and orientation without decoding the pixels
+            header = read_header(file_path)
+            
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(
+                self, 
+                "Error Loading Image", 
+                f"Failed to load image:\n{str(e)}"
+            )
+            return
+        
+        self._cancel_jobs()
+        self.edit_settings = {"source": source_params(file_path)}
+        self.current_header = header
+        self._clear_images()
+        self.history.clear()
+        self._update_history_controls()
+        self._load_label = "Load"
+        
+        self.image_display.set_image(None)
+        self.image_display.set_overlay_visible(True)
+        self._start_load()
+
+    def _clear_images(self):
+        """Forget the decoded image and its results (until loading finishes)"""
+        self.last_processed_image = None
+        self.image_after_crop = None
+        self.applied_settings = None
+
+    def _start_load(self):
+        """Decode current_file_path in the background, coarse preview first"""
+        path = self.current_file_path
+        self.load_jobs.submit(
+            self._decode_for_display,
+            self.edit_graph,
+            self.edit_settings,
+            on_done=self._on_load_done,
+            on_error=self._on_load_error
+        )
+        
+        # Already decoded images (reset) need no preview
+        if path not in decoded_images:
+            view_size = (self.image_display.width(), self.image_display.height())
+            self.coarse_jobs.submit(
+                self._decode_coarse, path, view_size, on_done=self._on_coarse_done
+            )
+        
+        self.update_info_status(*self.current_header.size)
+
+    @staticmethod
+    def _decode_for_display(edit_graph, settings):
+        """
+        Decode an image once and pack it for Qt (worker thread)
+        
+        The source node shares the decoded image with crop/reset through
+        decoded_images; the QImage is built here so the GUI thread only
+        wraps it in a pixmap.
+        """
+        img = edit_graph.output("source", settings)
+        return img, pil_to_qimage(img)
+
+    @staticmethod
+    def _decode_coarse(file_path, view_size):
+        """Reduced-scale decode for display while loading (worker thread)"""
+        preview = decode_preview(file_path, view_size)
+        return None if preview is None else pil_to_qimage(preview)
+
+    def _on_coarse_done(self, qimage, elapsed):
+        # Too late if the full decode already finished
+        if qimage is not None and self.load_jobs.busy:
+            self.image_display.set_image(qimage_to_pixmap(qimage))
+
+    def _on_load_done(self, result, elapsed):
+        """Show a fully decoded image (GUI thread)"""
+        img, qimage = result
+        pixmap = qimage_to_pixmap(qimage)
+        if pixmap.isNull():
+            self._on_load_error("Failed to load image into Qt")
+            return
+        
+        self.coarse_jobs.cancel()
+        self.last_processed_image = img
+        self.image_after_crop = img
+        self.applied_settings = self.edit_settings
+        self._record(self._load_label)
+        
+        self.image_display.set_image(pixmap)
+        self.update_info_status(img.width, img.height, elapsed)
+
+    def _on_load_error(self, message):
+        self.coarse_jobs.cancel()
+        self.edit_settings = {}
+        self.current_header = None
+        self.history.clear()
+        self._update_history_controls()
+        self._clear_images()
+        self.image_display.set_image(None)
+        self.info_label.setText("No image loaded")
+        
+        QtWidgets.QMessageBox.critical(
+            self, 
+            "Error Loading Image", 
+            f"Failed to load image:\n{message}"
+        )
+
+    def apply_transform(self):
+        """Apply crop transformation to the original image"""
+        if not self.current_file_path:
+            QtWidgets.QMessageBox.information(
+                self, 
+                "No Image", 
+                "Please load an image first"
+            )
+            return
+        
+        if self.load_jobs.busy:
+            QtWidgets.QMessageBox.information(
+                self, 
+                "Loading", 
+                "Please wait until the image has loaded"
+            )
+            return
+            
+        params = self.image_display.get_transform_params()
+        
+        if params["ratio"] is None:
+            QtWidgets.QMessageBox.information(
+                self, 
+                "No Aspect Ratio", 
+                "Please select an aspect ratio first"
+            )
+            return
+
+        try:
+            # Always a crop of the original image, replacing the previous one
+            box = compute_crop_box(
+                self.current_header.size,
+                params["ratio"],
+                params["zoom"],
+                params["offset"],
+                params["view_size"]
+            )
+        except ValueError as e:
+            self._on_crop_error(str(e))
+            return
+        
+        settings = {"source": self.edit_settings["source"], "crop": {"box": box}}
+        self.crop_jobs.submit(
+            self._evaluate,
+            "crop",
+            settings,
+            on_done=self._on_crop_done,
+            on_error=self._on_crop_error
+        )
+
+    def _evaluate(self, node, settings):
+        """Evaluate a node of the edit graph (worker thread)"""
+        return settings, self.edit_graph.output(node, settings)
+
+    def _on_crop_done(self, result, elapsed):
+        """Apply a finished crop job (GUI thread)"""
+        # Pixelation of the previous crop is stale now
+        self.pixel_jobs.cancel()
+        self._cancel_preview()
+        
+        self.edit_settings, cropped = result
+        self.image_after_crop = cropped
+        self.last_processed_image = cropped
+        self.applied_settings = self.edit_settings
+        self._record("Crop")
+        self.refresh_display(elapsed=elapsed)
+        
+        # Hide crop overlay and dimming
+        self.image_display.set_overlay_visible(False)
+        
+        # Reset crop UI controls
+        self._reset_crop_controls()
+
+    def _on_crop_error(self, message):
+        QtWidgets.QMessageBox.critical(
+            self, 
+            "Crop Error", 
+            f"Failed to crop image:\n{message}"
+        )
+
+    def apply_pixel(self):
+        """Apply pixelation effect to the cropped image"""
+        if self.image_after_crop is None:
+            QtWidgets.QMessageBox.information(
+                self, 
+                "No Image", 
+                "Please crop an image first"
+            )
+            return
+        
+        val = self.slider_pixel.value()
+        pixel_settings = self._pixel_settings()
+        self._cancel_preview()
+        
+        if val == 0:
+            # Reset to clean crop when slider is at 0
+            self.pixel_jobs.cancel()
+            self.last_processed_image = self.image_after_crop
+            self.applied_settings = self.edit_settings
+            self._record("Pixelation Off")
+            self.refresh_display()
+            return
+        
+        # Always pixelate from clean crop to avoid cumulative blur; the
+        # graph recomputes only the nodes whose settings changed
+        self.pixel_jobs.submit(
+            self._pixelate_for_display,
+            self._settings_for(val, pixel_settings),
+            on_done=self._on_pixel_done,
+            on_error=self._on_pixel_error
+        )
+
+    def _pixelate_for_display(self, settings):
+        """Grid and its full-size image (worker thread)"""
+        return (
+            settings,
+            self.edit_graph.output("palette", settings),
+            self.edit_graph.output("upscale", settings),
+        )
+
+    def _on_pixel_done(self, result, elapsed):
+        """Apply a finished pixelation job (GUI thread)"""
+        # The small grid is kept, the graph memoizes the full-size image
+        self.applied_settings, self.last_processed_image, display_image = result
+        self._record("Pixelate")
+        self.refresh_display(display_image, elapsed)
+
+    def _on_pixel_error(self, message):
+        QtWidgets.QMessageBox.critical(
+            self, 
+            "Pixelation Error", 
+            f"Failed to apply pixelation:\n{message}"
+        )
+
+    def _schedule_preview(self):
+        """Restart the preview debounce timer after a slider change"""
+        if self.check_live_preview.isChecked() and self.image_after_crop is not None:
+            self._preview_timer.start()
+
+    def _on_live_preview_toggled(self, checked):
+        if checked:
+            self._schedule_preview()
+        else:
+            # Back to the applied result
+            self._cancel_preview()
+            self.refresh_display()
+
+    def update_preview(self):
+        """Render the slider value as a preview on a display-sized proxy (background)"""
+        if self.image_after_crop is None:
+            return
+        
+        val = self.slider_pixel.value()
+        pixel_settings = self._pixel_settings()
+        if self._is_applied(val, pixel_settings):
+            # The applied result is already what the controls show
+            self.preview_jobs.cancel()
+            self.refresh_display()
+            return
+        
+        source = self.image_after_crop
+        view_size = (self.image_display.width(), self.image_display.height())
+        proxy = None
+        if self._preview_proxy is not None:
+            cached_source, cached_view, cached_proxy = self._preview_proxy
+            if cached_source is source and cached_view == view_size:
+                proxy = cached_proxy
+        
+        self.preview_jobs.submit(
+            self._render_preview, source, proxy, view_size, val, pixel_settings,
+            self.edit_graph.cached("palette", self._settings_for(val, pixel_settings)),
+            on_done=self._on_preview_done
+        )
+
+    def _render_preview(
+        self, source, proxy, view_size, segments_count, pixel_settings, pixel_grid=None
+    ):
+        """Pixelate a display-sized proxy of source (worker thread)"""
+        if proxy is None:
+            # Built once per crop and display size
+            proxy = make_proxy(source, view_size)
+        
+        if segments_count == 0:
+            preview = proxy
+        elif pixel_grid is not None:
+            # Memoized full-resolution grid: exact colors at proxy size
+            preview = PixelGrid(pixel_grid.grid, proxy.size).to_image()
+        else:
+            pixel_grid = pixelate_proxy(
+                proxy, source.size, segments_count,
+                self._reducer(pixel_settings), self._linear(pixel_settings)
+            )
+            palette_args = self._palette_args(pixel_settings)
+            if palette_args:
+                # The proxy grid has the full grid size, so this costs the same
+                pixel_grid = pixel_grid.quantized(**palette_args)
+            preview = pixel_grid.to_image()
+        return source, view_size, proxy, preview
+
+    def _on_preview_done(self, result, elapsed):
+        source, view_size, proxy, preview = result
+        self._preview_proxy = (source, view_size, proxy)
+        self.image_display.update_from_pil(preview)
+        self.update_info_status(source.width, source.height, elapsed)
+
+    def _finish_preview(self):
+        """
+        Settings of the previewed pixel settings, for saving at full resolution
+        
+        Returns:
+            Settings: None if the controls show the applied result
+        """
+        val = self.slider_pixel.value()
+        pixel_settings = self._pixel_settings()
+        if not self.check_live_preview.isChecked() or self._is_applied(val, pixel_settings):
+            return None
+        
+        self._cancel_preview()
+        self.pixel_jobs.cancel()
+        return self._settings_for(val, pixel_settings)
+
+    def _record(self, label):
+        """Add the applied result to the undo history"""
+        checkpoint = self.last_processed_image
+        if not isinstance(checkpoint, PixelGrid):
+            checkpoint = None  # Crops are rematerialized from the source
+        self.history.push(HistoryStep(label, self.applied_settings, self._controls(), checkpoint))
+        self._update_history_controls()
+
+    def _update_history_controls(self):
+        self.btn_undo.setEnabled(self.history.can_undo)
+        self.btn_redo.setEnabled(self.history.can_redo)
+        current, following = self.history.current, self.history.next
+        self.btn_undo.setToolTip(f"Undo {current.label}" if self.history.can_undo else "")
+        self.btn_redo.setToolTip(f"Redo {following.label}" if following is not None else "")
+
+    def undo(self):
+        """Go back to the previous result in the history"""
+        if not self.load_jobs.busy:
+            self._restore(self.history.undo())
+
+    def redo(self):
+        """Go forward to the next result in the history"""
+        if not self.load_jobs.busy:
+            self._restore(self.history.redo())
+
+    def _restore(self, step):
+        """Rematerialize a history step in the background"""
+        if step is None:
+            return
+        
+        self._cancel_jobs()
+        self._apply_controls(step.controls)
+        self.edit_settings = {
+            name: params for name, params in step.settings.items() if name in ("source", "crop")
+        }
+        if step.checkpoint is not None:
+            # Nearest checkpoint: only the upscale (and the crop for further edits) remain
+            self.edit_graph.remember("palette", step.settings, step.checkpoint)
+        
+        self.pixel_jobs.submit(
+            self._materialize,
+            step.settings,
+            on_done=self._on_restore_done,
+            on_error=self._on_pixel_error
+        )
+        self._update_history_controls()
+
+    def _materialize(self, settings):
+        """Clean crop, result and its full-size image of settings (worker thread)"""
+        return (
+            settings,
+            self.edit_graph.output("crop", settings),
+            self.edit_graph.output("palette", settings),
+            self.edit_graph.output("upscale", settings),
+        )
+
+    def _on_restore_done(self, result, elapsed):
+        settings, cropped, processed, display_image = result
+        self.image_after_crop = cropped
+        self.last_processed_image = processed
+        self.applied_settings = settings
+        # The crop overlay is shown until a crop is applied
+        self.image_display.set_overlay_visible("crop" not in settings)
+        self.refresh_display(display_image, elapsed)
+
+    def refresh_display(self, display_image=None, elapsed=None):
+        """
+        Synchronize PIL Image to display
+        
+        Args:
+            display_image (PIL.Image): Full-size pixels of last_processed_image,
+                                       if already computed
+            elapsed (float): Duration of the operation shown in the status bar
+        """
+        if self.last_processed_image is None:
+            return
+        
+        self.display_jobs.cancel()
+        image = display_image
+        if image is None:
+            image = self.last_processed_image
+            if isinstance(image, PixelGrid):
+                # Usually memoized by the graph, else upscaled in the background
+                image = self.edit_graph.cached("upscale", self.applied_settings)
+                if image is None:
+                    self.display_jobs.submit(
+                        self.last_processed_image.to_image,
+                        on_done=lambda full, _: self.refresh_display(full, elapsed)
+                    )
+                    return
+            
+        self.image_display.update_from_pil(image)
+        self.update_info_status(
+            self.last_processed_image.width, 
+            self.last_processed_image.height,
+            elapsed
+        )
+
+    def _export_format(self):
+        return EXPORT_FORMATS[self.combo_ext.currentText().lower()]
+
+    def _sync_export_controls(self):
+        """Show the current preset's options and enable those the format takes"""
+        fmt = self._export_format()
+        preset = self.combo_preset.currentText().lower()
+        values = dict(DEFAULT_OPTIONS[fmt], **encoder_params(fmt, preset))
+        
+        self.spin_quality.setEnabled("quality" in values)
+        self.spin_quality.setValue(values.get("quality", self.spin_quality.value()))
+        # Pillow's optimize always compresses at level 9
+        self.spin_compress_level.setEnabled(
+            "compress_level" in values and not values.get("optimize")
+        )
+        self.spin_compress_level.setValue(
+            values.get("compress_level", self.spin_compress_level.value())
+        )
+        self.check_lossless.setEnabled("lossless" in values)
+        self.check_lossless.setChecked(values.get("lossless", False))
+
+    def _export_params(self):
+        """Encoder options: the preset, with the values shown in the controls"""
+        fmt = self._export_format()
+        params = encoder_params(
+            fmt,
+            self.combo_preset.currentText().lower(),
+            quality=self.spin_quality.value(),
+            compress_level=self.spin_compress_level.value(),
+            lossless=self.check_lossless.isChecked(),
+        )
+        if params.get("optimize") and fmt == "PNG":
+            params.pop("compress_level", None)  # Overridden by optimize
+        return params
+
+    def save_image(self):
+        """Encode and save the processed image (background)"""
+        if self.last_processed_image is None:
+            QtWidgets.QMessageBox.information(
+                self, 
+                "No Image", 
+                "No processed image to save"
+            )
+            return
+            
+        ext = self.combo_ext.currentText().lower()
+        default_name = f"result.{ext}"
+        
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, 
+            "Save Image", 
+            default_name, 
+            f"*.{ext}"
+        )
+        
+        if not path:
+            return
+            
+        # Ensure path has correct extension
+        if not path.lower().endswith(f".{ext}"):
+            path = f"{path}.{ext}"
+        
+        # Live preview shows the slider value: save it at full resolution
+        # (the export job computes it, then it becomes the applied result)
+        applied = self.applied_settings
+        settings = self._finish_preview() or applied
+        
+        self.export_jobs.submit(
+            self._export,
+            settings,
+            path,
+            self._export_format(),
+            self._export_params(),
+            on_done=lambda result, elapsed: self._on_export_done(path, applied, result, elapsed),
+            on_error=self._on_export_error,
+            on_progress=self._on_export_progress
+        )
+
+    def _export(self, settings, path, fmt, params, progress):
+        """
+        Encode (memoized by the edit graph) and write a result (worker thread)
+        
+        Returns:
+            Tuple: (settings, result of settings, file size in bytes)
+        """
+        encode_settings = dict(settings, encode={"format": fmt, "options": frozen_options(params)})
+        size = write_file(self.edit_graph.output("encode", encode_settings, progress), path)
+        progress(1.0, "Done")
+        # Computed for the encode, so a memo hit
+        return settings, self.edit_graph.output("palette", settings), size
+
+    def _on_export_progress(self, fraction, stage):
+        self.busy_bar.setRange(0, 100)
+        self.busy_bar.setValue(int(fraction * 100))
+        self.busy_bar.setFormat(f"{stage} %p%")
+        self.busy_bar.setTextVisible(True)
+
+    def _on_export_done(self, path, applied, result, elapsed):
+        settings, processed, size = result
+        if settings != applied and self.applied_settings is applied:
+            # A saved live preview, and nothing else was applied meanwhile
+            self.last_processed_image = processed
+            self.applied_settings = settings
+            self._record("Pixelate")
+        
+        QtWidgets.QMessageBox.information(
+            self, 
+            "Success", 
+            f"Image saved successfully to:\n{path}\n\n"
+            f"{size / 1024:.0f} KB in {elapsed * 1000:.0f} ms"
+        )
+
+    def _on_export_error(self, message):
+        QtWidgets.QMessageBox.critical(
+            self, 
+            "Save Error", 
+            f"Failed to save image:\n{message}"
+        )
+
+    def reset_image(self):
+        """Reset all transformations and reload original image"""
+        if not self.current_file_path:
+            return
+
+        self._cancel_jobs()
+
+        try:
+            # The file may have changed since it was loaded (new version:
+            # decoded again, otherwise every node is a memo hit)
+            self.current_header = read_header(self.current_file_path)
+            self.edit_settings = {"source": source_params(self.current_file_path)}
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(
+                self, 
+                "Reset Error", 
+                f"Failed to reset image:\n{str(e)}"
+            )
+            return
+        
+        self._clear_images()
+        
+        # Show crop overlay again
+        self.image_display.set_overlay_visible(True)
+        
+        # Reset all UI controls
+        self._reset_crop_controls()
+        self._reset_pixel_controls()
+        self.image_display.set_zoom(self.DEFAULT_ZOOM)
+        
+        # Usually a cache hit: only the Qt conversion runs in the background
+        self._load_label = "Reset"
+        self._start_load()
+
+    def _reset_crop_controls(self):
+        """Reset crop-related UI controls to default state"""
+        self.slider_zoom.blockSignals(True)
+        self.slider_zoom.setValue(self.DEFAULT_ZOOM)
+        self.update_zoom_label(self.DEFAULT_ZOOM)
+        self.slider_zoom.blockSignals(False)
+        
+        self.check_free_mode.setChecked(False)
+        
+        self.combo_ratio.blockSignals(True)
+        self.combo_ratio.setCurrentIndex(0)
+        self.combo_ratio.blockSignals(False)
+
+    def _reset_pixel_controls(self):
+        """Reset pixelation-related UI controls to default state"""
+        self.slider_pixel.blockSignals(True)
+        self.slider_pixel.setValue(0)
+        self.update_pixel_label(0)
+        self.slider_pixel.blockSignals(False)
+        
+        for combo in (self.combo_reducer, self.combo_palette, self.combo_dither):
+            combo.blockSignals(True)
+            combo.setCurrentIndex(0)
+            combo.blockSignals(False)
+        self.combo_dither.setEnabled(False)
+        
+        self.check_linear.blockSignals(True)
+        self.check_linear.setChecked(False)
+        self.check_linear.setEnabled(True)
+        self.check_linear.blockSignals(False)
\ No newline at end of file
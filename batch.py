@@ -0,0 +1,522 @@
+"""
+Batch Processing Module - Headless crop + pixelate over many files
+
+Usage:
+    python main.py batch photos/ --crop 1:1 --segments 64 -o out/
+    python batch.py "shots/**/*.jpg" --crop 0,0,800,600 --segments 32 -o out/
+"""
+
+import argparse
+import glob
+import io
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from PIL import Image
+
+from edit_graph import batch_graph, frozen_options
+from edit_image import centered_crop_box
+from export import DEFAULT_PRESET, PRESETS, encoder_params, format_for_path, write_file
+from image_io import open_image
+from pixel_transform import DEFAULT_REDUCING_GAP, DITHERS, PALETTES, REDUCERS
+
+
+# File extensions picked up when a directory is given as input
+SUPPORTED_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".bmp", ".tif", ".tiff", ".ppm")
+
+# Jobs kept in flight per worker process (bounds queued results in memory)
+INFLIGHT_PER_WORKER = 2
+
+BYTES_PER_MB = 1024 * 1024
+
+
+@dataclass
+class BatchResult:
+    """Outcome of processing a single file"""
+
+    source: str
+    destination: str
+    input_bytes: int
+    output_bytes: int
+    output_size: Tuple[int, int]
+    elapsed: float
+    error: Optional[str] = None
+
+
+def parse_crop_spec(spec: str):
+    """
+    Parse a crop specification
+
+    Args:
+        spec (str): "none", an aspect ratio "W:H" (largest centered crop),
+                    or a pixel box "LEFT,TOP,RIGHT,BOTTOM"
+
+    Returns:
+        None, float ratio, or Tuple[int, int, int, int] box
+
+    Raises:
+        ValueError: If the specification cannot be parsed
+    """
+    spec = spec.strip().lower()
+    if spec in ("", "none", "original"):
+        return None
+
+    try:
+        if ":" in spec:
+            w, h = (float(part) for part in spec.split(":"))
+            if w <= 0 or h <= 0:
+                raise ValueError
+            return w / h
+
+        left, top, right, bottom = (int(part) for part in spec.split(","))
+    except ValueError:
+        raise ValueError(
+            f"Invalid crop spec '{spec}'. Use 'none', 'W:H' or 'L,T,R,B'"
+        ) from None
+
+    if right <= left or bottom <= top:
+        raise ValueError(f"Invalid crop box: ({left}, {top}, {right}, {bottom})")
+    return (left, top, right, bottom)
+
+
+def collect_inputs(patterns: Iterable[str]) -> List[str]:
+    """
+    Expand directories and glob patterns into a sorted list of image files
+
+    Args:
+        patterns (Iterable[str]): Directories, files or glob patterns
+
+    Returns:
+        List[str]: Unique image file paths
+    """
+    found = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            candidates = (
+                os.path.join(pattern, name) for name in os.listdir(pattern)
+            )
+        else:
+            candidates = glob.glob(pattern, recursive=True)
+
+        for path in candidates:
+            if os.path.isfile(path) and path.lower().endswith(SUPPORTED_EXTENSIONS):
+                found.add(os.path.normpath(path))
+
+    return sorted(found)
+
+
+def output_paths(files: List[str], output_dir: str, ext: Optional[str] = None) -> List[str]:
+    """
+    Output path for each input file, mirroring its folder under output_dir
+
+    Folders are taken relative to the deepest one holding all inputs, so
+    in/a/x.jpg and in/b/x.jpg become out/a/x.jpg and out/b/x.jpg, while
+    files from a single folder land directly in output_dir.
+
+    Args:
+        files (List[str]): Input image paths
+        output_dir (str): Directory for results
+        ext (str): Output extension without dot, None keeps the input's
+
+    Returns:
+        List[str]: One path per input, in the same order
+    """
+    folders = [os.path.dirname(os.path.abspath(path)) for path in files]
+    try:
+        base = os.path.commonpath(folders) if folders else None
+    except ValueError:
+        # Inputs on different drives: no common folder to mirror from
+        base = None
+
+    paths = []
+    for path, folder in zip(files, folders):
+        stem, src_ext = os.path.splitext(os.path.basename(path))
+        subdir = os.path.relpath(folder, base) if base else ""
+        name = f"{stem}.{ext}" if ext else f"{stem}{src_ext}"
+        paths.append(os.path.normpath(os.path.join(output_dir, subdir, name)))
+    return paths
+
+
+def _box_inside(box, size) -> bool:
+    left, top, right, bottom = box
+    return 0 <= left < right <= size[0] and 0 <= top < bottom <= size[1]
+
+
+def process_file(
+    source: str,
+    destination: str,
+    crop,
+    segments_count: int,
+    scale: Optional[int] = None,
+    reducing_gap: Optional[float] = None,
+    preset: str = DEFAULT_PRESET,
+    encoder_options: Optional[dict] = None,
+    colors: Optional[int] = None,
+    palette: Optional[str] = None,
+    dither: Optional[str] = None,
+    reducer: str = "mean",
+    linear: bool = False,
+) -> BatchResult:
+    """
+    Crop and pixelate one file (runs inside a worker process)
+
+    Args:
+        source (str): Input image path
+        destination (str): Output image path
+        crop: Parsed crop spec (see parse_crop_spec)
+        segments_count (int): Pixelation segments, 0 disables pixelation
+        scale (int): Save the pixel grid enlarged this many times instead of
+                     at the cropped size (None = cropped size)
+        reducing_gap (float): Decode/reduce tolerance for pixelation
+                              (see pixel_transform.pixelate_crop_file,
+                              None = exact)
+        preset (str): Encoder preset (see export.PRESETS)
+        encoder_options (dict): Options overriding the preset, e.g.
+                                {"quality": 90} (see export.encoder_params)
+        colors (int): Reduce the pixel grid to this many colors (None = all)
+        palette (str): Map the pixel grid to a fixed palette in
+                       pixel_transform.PALETTES (None = adaptive)
+        dither (str): Dithering of the reduced grid (see pixel_transform.DITHERS)
+        reducer (str): Block reducer, "mean", "median" or "mode" (see
+                       pixel_transform.apply_pixelate)
+        linear (bool): Average the mean reducer in linear light
+
+    Returns:
+        BatchResult: Timing and size information, with error set on failure
+    """
+    start = time.perf_counter()
+    input_bytes = os.path.getsize(source) if os.path.exists(source) else 0
+
+    try:
+        with open_image(source) as img:
+            image_size = img.size
+
+        box = None
+        if crop is not None:
+            box = crop if isinstance(crop, tuple) else centered_crop_box(image_size, crop)
+
+        fmt = format_for_path(destination)
+        settings = {
+            "palette": {"colors": colors, "palette": palette, "dither": dither},
+            "upscale": {"scale": scale},
+            "encode": {
+                "format": fmt,
+                "options": frozen_options(encoder_params(fmt, preset, **(encoder_options or {}))),
+            },
+        }
+
+        # Median/mode and linear light need the crop's own pixels, so only
+        # the plain mean takes the fused path
+        fused = (
+            segments_count > 0 and reducer == "mean" and not linear
+            and (box is None or _box_inside(box, image_size))
+        )
+        if fused:
+            # Fused path: no intermediate crop, decodes only what the grid needs
+            settings["reduce"] = {
+                "path": source, "box": box,
+                "segments_count": segments_count, "reducing_gap": reducing_gap,
+            }
+        else:
+            settings["source"] = {"path": source}
+            settings["crop"] = {"box": box}
+            settings["reduce"] = {
+                "segments_count": segments_count, "reducing_gap": reducing_gap,
+                "reducer": reducer, "linear": linear,
+            }
+
+        data = batch_graph(fused).output("encode", settings)
+        output_bytes = write_file(data, destination)
+        with Image.open(io.BytesIO(data)) as encoded:
+            output_size = encoded.size
+
+        return BatchResult(
+            source, destination, input_bytes, output_bytes,
+            output_size, time.perf_counter() - start
+        )
+
+    except Exception as e:
+        return BatchResult(
+            source, destination, input_bytes, 0, (0, 0),
+            time.perf_counter() - start, error=str(e)
+        )
+
+
+def run_batch(
+    files: List[str],
+    output_dir: str,
+    crop,
+    segments_count: int,
+    ext: Optional[str] = None,
+    workers: Optional[int] = None,
+    max_inflight: Optional[int] = None,
+    scale: Optional[int] = None,
+    reducing_gap: Optional[float] = None,
+    preset: str = DEFAULT_PRESET,
+    encoder_options: Optional[dict] = None,
+    colors: Optional[int] = None,
+    palette: Optional[str] = None,
+    dither: Optional[str] = None,
+    reducer: str = "mean",
+    linear: bool = False,
+) -> Iterator[BatchResult]:
+    """
+    Process files on a process pool, yielding results as they complete
+
+    At most max_inflight jobs are submitted at once, so memory stays bounded
+    no matter how many files are queued. Outputs mirror the input folders
+    (see output_paths); an input whose output path was already taken by
+    an earlier one (x.jpg and x.png with ext "png") is not processed and
+    fails instead of overwriting it.
+
+    Args:
+        files (List[str]): Input image paths
+        output_dir (str): Directory for results
+        crop: Parsed crop spec (see parse_crop_spec)
+        segments_count (int): Pixelation segments, 0 disables pixelation
+        ext (str): Output extension without dot, None keeps the input's
+        workers (int): Worker processes (default: CPU count)
+        max_inflight (int): Maximum submitted-but-unfinished jobs
+        scale (int): Grid enlargement for output (see process_file)
+        reducing_gap (float): Decode/reduce tolerance (see process_file)
+        preset (str): Encoder preset (see process_file)
+        encoder_options (dict): Encoder options (see process_file)
+        colors (int): Palette size of the pixel grid (see process_file)
+        palette (str): Fixed palette name (see process_file)
+        dither (str): Dithering (see process_file)
+        reducer (str): Block reducer (see process_file)
+        linear (bool): Linear-light averaging (see process_file)
+
+    Yields:
+        BatchResult: One per input file, in completion order
+    """
+    workers = workers or os.cpu_count() or 1
+    max_inflight = max_inflight or workers * INFLIGHT_PER_WORKER
+    os.makedirs(output_dir, exist_ok=True)
+
+    pending = zip(files, output_paths(files, output_dir, ext))
+    claimed = {}  # output path -> input writing it
+    inflight = set()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            for path, destination in pending:
+                owner = claimed.setdefault(os.path.normcase(destination), path)
+                if owner != path:
+                    yield BatchResult(
+                        path, destination, 0, 0, (0, 0), 0.0,
+                        error=f"output {destination} is already written from {owner}"
+                    )
+                    continue
+
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+                inflight.add(pool.submit(
+                    process_file, path, destination, crop, segments_count,
+                    scale, reducing_gap, preset, encoder_options,
+                    colors, palette, dither, reducer, linear
+                ))
+                if len(inflight) >= max_inflight:
+                    break
+
+            if not inflight:
+                return
+
+            done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def _format_rate(count: float, elapsed: float) -> str:
+    return f"{count / elapsed:.2f}" if elapsed > 0 else "inf"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the command-line parser for the batch entry point"""
+    parser = argparse.ArgumentParser(
+        prog="image2pixel batch",
+        description="Crop and pixelate many images in parallel",
+    )
+    parser.add_argument(
+        "inputs", nargs="+",
+        help="Image files, directories or glob patterns (quote patterns)"
+    )
+    parser.add_argument(
+        "-o", "--output", required=True, help="Output directory"
+    )
+    parser.add_argument(
+        "--crop", default="none",
+        help="'none', aspect ratio 'W:H' (centered) or box 'L,T,R,B' (default: none)"
+    )
+    parser.add_argument(
+        "--segments", type=int, default=0,
+        help="Pixelation segments along width, 0 = off (default: 0)"
+    )
+    parser.add_argument(
+        "--scale", type=int, default=None,
+        help="Save the pixel grid enlarged N times instead of at full size "
+             "(fast for heavy pixelation)"
+    )
+    parser.add_argument(
+        "--reducing-gap", type=float, default=DEFAULT_REDUCING_GAP,
+        help="Decode JPEGs at reduced scale / pre-shrink while at least this "
+             f"many source pixels remain per segment, 0 = exact (default: {DEFAULT_REDUCING_GAP:g})"
+    )
+    parser.add_argument(
+        "--format", choices=["keep", "png", "jpg", "webp", "gif"], default="keep",
+        help="Output format (default: same as input)"
+    )
+    parser.add_argument(
+        "--reducer", choices=REDUCERS, default="mean",
+        help="Block color: mean, median or mode (dominant color; crisp for pixel/line art)"
+    )
+    parser.add_argument(
+        "--linear", action="store_true",
+        help="Average blocks in linear light (keeps the brightness of fine detail; mean only)"
+    )
+    parser.add_argument(
+        "--colors", type=int, default=None,
+        help="Reduce the pixelated image to N colors, 2-256 (PNG/GIF save it indexed)"
+    )
+    parser.add_argument(
+        "--palette", choices=list(PALETTES), default=None,
+        help="Map the pixelated image to a fixed palette (with --colors: its N most used colors)"
+    )
+    parser.add_argument(
+        "--dither", choices=DITHERS, default="none",
+        help="Dither the reduced palette: ordered (Bayer) or diffusion (default: none)"
+    )
+    parser.add_argument(
+        "--preset", choices=list(PRESETS), default=DEFAULT_PRESET,
+        help=f"Encoder preset: fast encoding or smallest files (default: {DEFAULT_PRESET})"
+    )
+    parser.add_argument(
+        "--quality", type=int, default=None,
+        help="JPEG/WebP quality 1-100 (default: from the preset)"
+    )
+    parser.add_argument(
+        "--compress-level", type=int, default=None,
+        help="PNG compression 0-9 (default: from the preset)"
+    )
+    parser.add_argument(
+        "--lossless", action="store_true",
+        help="Lossless WebP (much smaller for heavy pixelation, larger for photos)"
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, default=None,
+        help="Worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--max-inflight", type=int, default=None,
+        help=f"Max queued jobs (default: {INFLIGHT_PER_WORKER} x workers)"
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Batch entry point
+
+    Args:
+        argv (List[str]): Command-line arguments (default: sys.argv[1:])
+
+    Returns:
+        int: Process exit code (0 = all files succeeded)
+    """
+    args = build_parser().parse_args(argv)
+
+    if args.segments < 0:
+        print(f"error: --segments must be >= 0, got {args.segments}", file=sys.stderr)
+        return 2
+
+    if args.scale is not None and (args.scale < 1 or args.segments == 0):
+        print("error: --scale needs a value >= 1 and --segments > 0", file=sys.stderr)
+        return 2
+
+    if args.reducing_gap != 0 and args.reducing_gap < 1:
+        print(f"error: --reducing-gap must be 0 or >= 1, got {args.reducing_gap}", file=sys.stderr)
+        return 2
+
+    if (args.colors is not None or args.palette is not None) and args.segments == 0:
+        print("error: --colors and --palette need --segments > 0", file=sys.stderr)
+        return 2
+
+    if args.dither != "none" and args.colors is None and args.palette is None:
+        print("error: --dither needs --colors or --palette", file=sys.stderr)
+        return 2
+
+    if args.linear and args.reducer != "mean":
+        print("error: --linear needs --reducer mean", file=sys.stderr)
+        return 2
+
+    if args.colors is not None and not 2 <= args.colors <= 256:
+        print(f"error: --colors must be 2-256, got {args.colors}", file=sys.stderr)
+        return 2
+
+    if args.quality is not None and not 1 <= args.quality <= 100:
+        print(f"error: --quality must be 1-100, got {args.quality}", file=sys.stderr)
+        return 2
+
+    if args.compress_level is not None and not 0 <= args.compress_level <= 9:
+        print(f"error: --compress-level must be 0-9, got {args.compress_level}", file=sys.stderr)
+        return 2
+
+    encoder_options = {
+        "quality": args.quality,
+        "compress_level": args.compress_level,
+        "lossless": args.lossless or None,
+    }
+
+    try:
+        crop = parse_crop_spec(args.crop)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    files = collect_inputs(args.inputs)
+    if not files:
+        print("error: no input images found", file=sys.stderr)
+        return 2
+
+    ext = None if args.format == "keep" else args.format
+    total_in = 0
+    failures = 0
+    start = time.perf_counter()
+
+    for result in run_batch(
+        files, args.output, crop, args.segments,
+        ext=ext, workers=args.workers, max_inflight=args.max_inflight,
+        scale=args.scale, reducing_gap=args.reducing_gap or None,
+        preset=args.preset, encoder_options=encoder_options,
+        colors=args.colors, palette=args.palette, dither=args.dither, reducer=args.reducer,
+        linear=args.linear
+    ):
+        name = os.path.basename(result.source)
+        if result.error:
+            failures += 1
+            print(f"FAIL {name}: {result.error}", file=sys.stderr)
+            continue
+
+        total_in += result.input_bytes
+        mb = result.input_bytes / BYTES_PER_MB
+        print(
+            f"ok   {name}: {result.output_size[0]}x{result.output_size[1]}  "
+            f"{result.elapsed * 1000:.0f} ms  "
+            f"{_format_rate(mb, result.elapsed)} MB/s"
+        )
+
+    elapsed = time.perf_counter() - start
+    done = len(files) - failures
+    print(
+        f"\n{done}/{len(files)} images in {elapsed:.2f} s  |  "
+        f"{_format_rate(done, elapsed)} images/s  |  "
+        f"{_format_rate(total_in / BYTES_PER_MB, elapsed)} MB/s"
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
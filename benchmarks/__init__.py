@@ -0,0 +1,5 @@
+"""
+Benchmarks - run from the repository root, e.g.:
+
+    python -m benchmarks.bench_import
+"""
\ No newline at end of file
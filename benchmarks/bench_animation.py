@@ -0,0 +1,77 @@
+"""
+Animation benchmark: frames/s and memory of the streaming frame pipeline
+
+Writes two 400-frame 640x360 APNG clips, one changing every frame and one
+holding every picture for 2 frames (half the frames are repeats), and
+pixelates them to GIF and APNG with 1 and all worker threads. Each run
+happens in a fresh process, so its peak RSS can be compared with the
+memory all frames would take.
+
+    python -m benchmarks.bench_animation
+"""
+
+import os
+import resource
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import ImageChops
+
+from animation import AnimationWriter, pixelate_animation
+from benchmarks.common import make_test_image, print_table
+
+
+FRAME_SIZE = (640, 360)
+FRAMES = 400
+SEGMENTS = 64
+CLIPS = (("moving", 1), ("held x2", 2))
+
+
+def write_clip(path, hold):
+    """Pan over a test image, each position shown for hold frames (streamed)"""
+    base = make_test_image(FRAME_SIZE)
+    with AnimationWriter(path, "RGB", compress_level=1) as writer:
+        for n in range(FRAMES):
+            frame = ImageChops.offset(base, 3 * (n // hold), n // hold)
+            writer.write(writer.encode(frame), 40)
+
+
+def run(source, destination, workers):
+    """Pixelate in this (fresh) process; returns (result, peak RSS in MB)"""
+    result = pixelate_animation(source, destination, SEGMENTS, workers=workers)
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return result, peak_mb
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    frame_mb = FRAME_SIZE[0] * FRAME_SIZE[1] * 3 / (1024 * 1024)
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, hold in CLIPS:
+            source = os.path.join(tmp, f"clip{hold}.png")
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                pool.submit(write_clip, source, hold).result()
+
+            for ext in ("gif", "png"):
+                for workers in sorted({1, cpus}):
+                    destination = os.path.join(tmp, f"out.{ext}")
+                    with ProcessPoolExecutor(max_workers=1) as pool:
+                        result, peak_mb = pool.submit(run, source, destination, workers).result()
+                    rows.append([
+                        name, ext, workers, result.unique_frames,
+                        f"{result.frames_per_second:.0f}",
+                        f"{result.output_bytes / 1024:.0f}", f"{peak_mb:.0f}",
+                    ])
+
+    print(
+        f"{FRAMES} frames {FRAME_SIZE[0]}x{FRAME_SIZE[1]}, {SEGMENTS} segments "
+        f"(all frames decoded: {FRAMES * frame_mb:.0f} MB)\n"
+    )
+    print_table(
+        ["clip", "output", "threads", "pixelated", "frames/s", "size KB", "peak RSS MB"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
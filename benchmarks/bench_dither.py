@@ -0,0 +1,89 @@
+"""
+Dithering benchmark: ordered (Bayer) vs error diffusion vs a Python loop
+
+Times reduce_palette on pixel grids of growing size with each dither
+mode, next to a straightforward per-pixel Python Floyd-Steinberg loop
+(the approach the vectorized / C paths replace), and reports how far
+each result's local average strays from the source (lower = gradients
+better kept).
+
+    python -m benchmarks.bench_dither
+"""
+
+import time
+
+import numpy as np
+
+from benchmarks.common import best_of, make_test_image, print_table
+from pixel_transform import PALETTES, _palette_colors, pixelate_grid, reduce_palette
+
+
+IMAGE_SIZE = (4000, 3000)
+SEGMENTS = (64, 200, 800)
+PALETTE = "pico-8"
+REPEAT = 5
+
+# Only the smallest grids: the Python loop takes seconds beyond that
+PYTHON_MAX_SEGMENTS = 200
+
+
+def python_floyd_steinberg(grid, colors):
+    """Per-pixel error diffusion in pure Python (reference only)"""
+    width, height = grid.size
+    pixels = [[list(map(float, grid.getpixel((x, y)))) for x in range(width)] for y in range(height)]
+    indices = [[0] * width for _ in range(height)]
+    for y in range(height):
+        for x in range(width):
+            old = pixels[y][x]
+            best = min(
+                range(len(colors)),
+                key=lambda i: sum((old[c] - colors[i][c]) ** 2 for c in range(3))
+            )
+            indices[y][x] = best
+            error = [old[c] - colors[best][c] for c in range(3)]
+            for dx, dy, weight in ((1, 0, 7), (-1, 1, 3), (0, 1, 5), (1, 1, 1)):
+                if 0 <= x + dx < width and y + dy < height:
+                    target = pixels[y + dy][x + dx]
+                    for c in range(3):
+                        target[c] += error[c] * weight / 16
+    return indices
+
+
+def local_error(grid, reduced, block=4) -> float:
+    """Mean absolute difference of block averages (source vs reduced)"""
+    a = np.asarray(grid.convert("RGB"), dtype=np.float64)
+    b = np.asarray(reduced.convert("RGB"), dtype=np.float64)
+    h, w = (a.shape[0] // block) * block, (a.shape[1] // block) * block
+    shape = (h // block, block, w // block, block, 3)
+    means_a = a[:h, :w].reshape(shape).mean(axis=(1, 3))
+    means_b = b[:h, :w].reshape(shape).mean(axis=(1, 3))
+    return float(np.abs(means_a - means_b).mean())
+
+
+def main():
+    photo = make_test_image(IMAGE_SIZE)
+    colors = _palette_colors(PALETTE)
+    rows = []
+    for segments in SEGMENTS:
+        grid = pixelate_grid(photo, segments).grid
+        for dither in ("none", "ordered", "diffusion"):
+            seconds = best_of(lambda: reduce_palette(grid, palette=PALETTE, dither=dither), REPEAT)
+            reduced = reduce_palette(grid, palette=PALETTE, dither=dither)
+            rows.append([
+                f"{grid.width}x{grid.height}", dither, f"{seconds * 1000:.2f}",
+                f"{local_error(grid, reduced):.1f}",
+            ])
+        if segments <= PYTHON_MAX_SEGMENTS:
+            start = time.perf_counter()
+            python_floyd_steinberg(grid, colors)
+            rows.append([
+                f"{grid.width}x{grid.height}", "python loop",
+                f"{(time.perf_counter() - start) * 1000:.0f}", "-",
+            ])
+
+    print(f"{PALETTE} ({len(PALETTES[PALETTE])} colors), best of {REPEAT}\n")
+    print_table(["grid", "dither", "ms", "block error"], rows)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
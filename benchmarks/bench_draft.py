@@ -0,0 +1,79 @@
+"""
+Reduced JPEG decoding benchmark: exact vs reducing_gap pixelation
+
+Pixelates a 24 MP JPEG straight from the file with
+pixel_transform.pixelate_crop_file, exact (reducing_gap=None) and with the
+default tolerance (DCT-domain draft decoding + reduce), and reports the
+time and the grid difference. Two sources are used: a smooth photo-like
+image and a noisy one (entropy decoding, which draft cannot skip,
+dominates on noisy/high-ISO files).
+
+    python -m benchmarks.bench_draft [WIDTH HEIGHT]
+"""
+
+import os
+import sys
+import tempfile
+
+from benchmarks.common import best_of, print_table
+from pixel_transform import DEFAULT_REDUCING_GAP, pixelate_crop_file
+
+
+SEGMENTS = (32, 64, 200, 800)
+REPEAT = 3
+
+
+def make_jpeg(path, size, noise):
+    """Write a photo-like JPEG with the given noise level"""
+    import numpy as np
+    from PIL import Image
+
+    w, h = size
+    y, x = np.mgrid[0:h, 0:w].astype(np.float32)
+    channels = [
+        128 + 100 * np.sin(x / (w / 7) + k) * np.cos(y / (h / 5) - k)
+        for k in range(3)
+    ]
+    data = np.stack(channels, axis=-1) + np.random.default_rng(0).normal(0, noise, (h, w, 3))
+    Image.fromarray(np.clip(data, 0, 255).astype(np.uint8)).save(path, quality=90)
+
+
+def main():
+    import numpy as np
+
+    size = tuple(int(v) for v in sys.argv[1:3]) if len(sys.argv) >= 3 else (6000, 4000)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, noise in (("smooth", 3), ("noisy", 12)):
+            path = os.path.join(tmp, f"{label}.jpg")
+            make_jpeg(path, size, noise)
+            size_mb = os.path.getsize(path) / (1024 * 1024)
+
+            for segments in SEGMENTS:
+                exact = best_of(lambda: pixelate_crop_file(path, None, segments), REPEAT)
+                fast = best_of(
+                    lambda: pixelate_crop_file(path, None, segments, DEFAULT_REDUCING_GAP),
+                    REPEAT
+                )
+                a = np.asarray(pixelate_crop_file(path, None, segments).grid, dtype=np.int16)
+                b = np.asarray(
+                    pixelate_crop_file(path, None, segments, DEFAULT_REDUCING_GAP).grid,
+                    dtype=np.int16
+                )
+                diff = np.abs(a - b)
+                rows.append([
+                    f"{label} ({size_mb:.1f} MB)", segments,
+                    f"{exact * 1000:.0f}", f"{fast * 1000:.0f}", f"{exact / fast:.1f}x",
+                    diff.max(), f"{diff.mean():.2f}",
+                ])
+
+    print(f"{size[0]}x{size[1]} JPEG, reducing_gap={DEFAULT_REDUCING_GAP:g}\n")
+    print_table(
+        ["source", "segments", "exact ms", "reduced ms", "speedup", "max diff", "mean diff"],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
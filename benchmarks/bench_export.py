@@ -0,0 +1,62 @@
+"""
+Export benchmark: encode time vs output size per format and preset
+
+Encodes the application's typical outputs (a plain photo crop and the
+same crop pixelated at 64 and 200 segments) with every preset of
+export.PRESETS, plus lossless WebP, and reports time and file size.
+
+    python -m benchmarks.bench_export
+"""
+
+import os
+import tempfile
+import time
+
+from benchmarks.common import make_test_image, print_table
+from export import PRESETS, encoder_params, export_image
+from pixel_transform import pixelate_grid
+
+
+IMAGE_SIZE = (3000, 2000)
+FORMATS = (("jpg", "JPEG"), ("png", "PNG"), ("webp", "WEBP"))
+
+
+def typical_outputs():
+    """(name, image) pairs of what users save"""
+    photo = make_test_image(IMAGE_SIZE)
+    return [
+        ("photo", photo),
+        ("pixel 64", pixelate_grid(photo, 64).to_image()),
+        ("pixel 200", pixelate_grid(photo, 200).to_image()),
+    ]
+
+
+def encode(image, path, fmt, params):
+    """Return (seconds, bytes) of one export"""
+    start = time.perf_counter()
+    size = export_image(image, path, fmt, params)
+    return time.perf_counter() - start, size
+
+
+def main():
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, image in typical_outputs():
+            for ext, fmt in FORMATS:
+                path = os.path.join(tmp, f"out.{ext}")
+                settings = [(preset, encoder_params(fmt, preset)) for preset in PRESETS]
+                if fmt == "WEBP":
+                    settings.append(("lossless", encoder_params(fmt, lossless=True)))
+
+                for label, params in settings:
+                    seconds, size = encode(image, path, fmt, params)
+                    rows.append([
+                        name, ext, label, f"{seconds * 1000:.0f}", f"{size / 1024:.0f}",
+                    ])
+
+    print(f"{IMAGE_SIZE[0]}x{IMAGE_SIZE[1]} RGB\n")
+    print_table(["output", "format", "preset", "encode ms", "size KB"], rows)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+Fused crop + pixelate benchmark: time and peak memory vs the two-step path
+
+Each run happens in a fresh interpreter so peak RSS is measured per run:
+
+- two-step:     Image.open -> crop -> pixelate_grid (what the GUI does)
+- fused:        pixelate_crop on the opened image (no intermediate crop)
+- fused-reader: pixelate_crop on a BandReader (raw PPM decodes only box rows)
+
+    python -m benchmarks.bench_fused [WIDTH HEIGHT]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.common import print_table
+
+
+SEGMENTS = 64
+REPEAT = 3
+
+RUNNERS = {
+    "two-step": """
+from image_io import open_image
+from pixel_transform import pixelate_grid
+def run():
+    with open_image(SRC) as img:
+        return pixelate_grid(img.crop(BOX), SEGMENTS).grid
+""",
+    "fused": """
+from image_io import open_image
+from pixel_transform import pixelate_crop
+def run():
+    with open_image(SRC) as img:
+        return pixelate_crop(img, BOX, SEGMENTS).grid
+""",
+    "fused-reader": """
+from image_io import BandReader
+from pixel_transform import pixelate_crop
+def run():
+    with BandReader(SRC) as reader:
+        return pixelate_crop(reader, BOX, SEGMENTS).grid
+""",
+}
+
+PROBE = """
+import json, resource, time
+from PIL import Image
+Image.MAX_IMAGE_PIXELS = None
+SRC, BOX, SEGMENTS = {src!r}, {box!r}, {segments}
+{body}
+best = float("inf")
+for _ in range({repeat}):
+    start = time.perf_counter()
+    grid = run()
+    best = min(best, time.perf_counter() - start)
+grid.save({dst!r})
+peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"s": best, "peak_mb": peak_kb / 1024}}))
+"""
+
+
+def make_sources(directory, width, height):
+    """Write the test image as JPEG and raw PPM"""
+    from benchmarks.common import make_test_image
+
+    img = make_test_image((width, height))
+    img.save(os.path.join(directory, "photo.jpg"), quality=90)
+    img.save(os.path.join(directory, "photo.ppm"))
+
+
+def main():
+    from PIL import Image, ImageChops
+
+    width, height = (int(v) for v in sys.argv[1:3]) if len(sys.argv) >= 3 else (6000, 4000)
+    # Centered square crop, as with the 1:1 preset
+    side = min(width, height)
+    box = ((width - side) // 2, (height - side) // 2, (width + side) // 2, (height + side) // 2)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Separate interpreter: a forked child inherits the parent's peak RSS
+        subprocess.run(
+            [sys.executable, "-c",
+             f"from benchmarks.bench_fused import make_sources; "
+             f"make_sources({tmp!r}, {width}, {height})"],
+            check=True, cwd=os.getcwd()
+        )
+
+        rows = []
+        for ext in ("jpg", "ppm"):
+            src = os.path.join(tmp, f"photo.{ext}")
+            grids = {}
+            for label, body in RUNNERS.items():
+                dst = os.path.join(tmp, f"{ext}-{label}.png")
+                code = PROBE.format(
+                    src=src, box=box, segments=SEGMENTS, body=body, repeat=REPEAT, dst=dst
+                )
+                out = subprocess.run(
+                    [sys.executable, "-c", code], capture_output=True, text=True,
+                    check=True, cwd=os.getcwd()
+                )
+                report = json.loads(out.stdout.strip().splitlines()[-1])
+                grids[label] = Image.open(dst).convert("RGB")
+                diff = ImageChops.difference(grids["two-step"], grids[label])
+                diff = ImageChops.lighter(ImageChops.lighter(*diff.split()[:2]), diff.split()[2])
+                changed = diff.point(lambda v: 255 if v else 0).histogram()[255]
+                rows.append([
+                    ext.upper(), label, f"{report['s'] * 1000:.0f}",
+                    f"{report['peak_mb']:.0f}", f"{changed}/{diff.width * diff.height}",
+                ])
+
+    print(f"{width}x{height} RGB, crop {box}, {SEGMENTS} segments (grid only)\n")
+    print_table(["source", "path", "time ms", "peak RSS MB", "grid cells differing"], rows)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
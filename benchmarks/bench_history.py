@@ -0,0 +1,113 @@
+"""
+Undo history benchmark: 100 steps on a 24 MP image
+
+Replays an editing session through the GUI's edit graph and an
+EditHistory (crops, segment counts, palettes), then undoes back to the
+start. Reports the memory of the history, of the graph memos and of the
+decoded image, the process peak RSS (decode, edits and undo), and how long undo takes when the
+result is still memoized vs when it is replayed from a checkpoint or
+from the source.
+
+    python -m benchmarks.bench_history
+"""
+
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.common import make_test_image, print_table
+from edit_graph import editing_graph, source_params
+from edit_history import EditHistory, HistoryStep
+from image_cache import decoded_images
+from pixel_transform import PixelGrid
+
+
+IMAGE_SIZE = (6000, 4000)  # 24 MP
+STEPS = 100
+BOXES = [None, (0, 0, 4000, 4000), (1000, 500, 5000, 3500), (2000, 0, 6000, 4000)]
+SEGMENTS = (0, 32, 64, 128, 200)
+PALETTES = ({}, {"palette": "pico-8", "dither": "ordered"}, {"colors": 16})
+
+
+def session(source):
+    """Settings of STEPS edits: a crop every 10 steps, pixel settings in between"""
+    for step in range(STEPS):
+        settings = dict(source)
+        box = BOXES[step // 10 % len(BOXES)]
+        if box is not None:
+            settings["crop"] = {"box": box}
+        segments = SEGMENTS[step % len(SEGMENTS)]
+        if segments:
+            settings["reduce"] = {"segments_count": segments, "reducing_gap": 3.0}
+            settings["palette"] = PALETTES[step % len(PALETTES)]
+        yield settings
+
+
+def materialize(graph, step):
+    """What AppLogic does on undo/redo"""
+    if step.checkpoint is not None:
+        graph.remember("palette", step.settings, step.checkpoint)
+    graph.output("crop", step.settings)
+    graph.output("palette", step.settings)
+    return graph.output("upscale", step.settings)
+
+
+def save_test_image(path):
+    """Write the test image (run in a child process: generating it peaks at ~2 GB)"""
+    make_test_image(IMAGE_SIZE).save(path, compress_level=1)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process (ru_maxrss is KB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "photo.png")
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            pool.submit(save_test_image, path).result()
+        source = {"source": source_params(path)}
+
+        graph = editing_graph()
+        history = EditHistory()
+        start = time.perf_counter()
+        for settings in session(source):
+            result = graph.output("palette", settings)
+            graph.output("upscale", settings)
+            checkpoint = result if isinstance(result, PixelGrid) else None
+            history.push(HistoryStep("edit", settings, None, checkpoint))
+        edit_seconds = time.perf_counter() - start
+
+        timings = {"memo hit": [], "replayed": []}
+        while history.can_undo:
+            step = history.undo()
+            hit = graph.cached("upscale", step.settings) is not None
+            start = time.perf_counter()
+            materialize(graph, step)
+            timings["memo hit" if hit else "replayed"].append(time.perf_counter() - start)
+
+        memory = [
+            ["history (settings + grids)", f"{history.nbytes / 2 ** 20:.1f}"],
+            ["edit graph memos", f"{graph.nbytes / 2 ** 20:.1f}"],
+            ["decoded image", f"{decoded_images.nbytes / 2 ** 20:.1f}"],
+            ["process peak RSS", f"{peak_rss_mb():.0f}"],
+        ]
+        undo = [
+            [kind, len(values),
+             f"{sum(values) / len(values) * 1000:.0f}" if values else "-",
+             f"{max(values) * 1000:.0f}" if values else "-"]
+            for kind, values in timings.items()
+        ]
+
+    print(f"{IMAGE_SIZE[0]}x{IMAGE_SIZE[1]} RGB, {len(history)} steps "
+          f"edited in {edit_seconds:.1f} s\n")
+    print_table(["memory", "MB"], memory)
+    print()
+    print_table(["undo", "steps", "mean ms", "max ms"], undo)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+Import-time benchmark for the Qt-free core modules
+
+Each import is timed in a fresh interpreter. The script also checks that
+PyQt6 stays unloaded and lists which Pillow plugins get registered after
+opening a JPEG and a PNG through image_io.open_image.
+
+    python -m benchmarks.bench_import
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.common import print_table
+
+
+RUNS = 5
+
+CASES = {
+    "core (edit_image, pixel_transform)": "import edit_image, pixel_transform",
+    "batch": "import batch",
+    "entry point (main)": "import main",
+    "gui (app_logic)": "import app_logic",
+}
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{stmt}
+elapsed = time.perf_counter() - start
+opened = {opened!r}
+if opened:
+    from image_io import open_image
+    for path in opened:
+        open_image(path).load()
+print(json.dumps({{
+    "ms": elapsed * 1000,
+    "qt": any(name.startswith("PyQt6") for name in sys.modules),
+    "plugins": sorted(m[4:] for m in sys.modules
+                      if m.startswith("PIL.") and m.endswith("ImagePlugin")),
+}}))
+"""
+
+
+def probe(stmt, opened=()):
+    """Run PROBE in a fresh interpreter and return its JSON report"""
+    code = PROBE.format(stmt=stmt, opened=list(opened))
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True,
+        check=True, cwd=os.getcwd()
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    rows = []
+    for label, stmt in CASES.items():
+        reports = [probe(stmt) for _ in range(RUNS)]
+        best = min(r["ms"] for r in reports)
+        rows.append([label, f"{best:.1f}", "yes" if reports[0]["qt"] else "no"])
+
+    print(f"Import time (best of {RUNS} fresh interpreters)\n")
+    print_table(["modules", "ms", "PyQt6 loaded"], rows)
+
+    from PIL import Image
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for name in ("sample.jpg", "sample.png"):
+            path = os.path.join(tmp, name)
+            Image.new("RGB", (64, 64), "red").save(path)
+            files.append(path)
+
+        report = probe("import edit_image, pixel_transform", files)
+
+    print("\nPillow plugins after opening a JPEG and a PNG with open_image:")
+    print("  " + ", ".join(report["plugins"]))
+    print(f"PyQt6 loaded: {'yes' if report['qt'] else 'no'}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Linear-light averaging benchmark: cost and accuracy vs sRGB averaging on 12 MP
+
+Times pixelate_grid with and without linear=True (exact, and with the
+default reducing_gap), and measures how far each grid is from a float64
+reference (decode, block mean, encode) on a high-contrast image of
+1-pixel black and white stripes, where sRGB averaging is darkest.
+With reducing_gap the early reduction is done in linear light (Pillow
+decodes each band through the LUT, premultiplies RGBA colors by alpha,
+then Image.reduce), so the stripes
+keep their brightness; the per-pixel decode dominates the cost either
+way, so "vs exact" compares with the exact sRGB BOX grid too.
+
+    python -m benchmarks.bench_linear
+"""
+
+import numpy as np
+from PIL import Image
+
+from benchmarks.common import best_of, make_test_image, print_table
+from pixel_transform import DEFAULT_REDUCING_GAP, _block_counts, _numpy_grid, pixelate_grid
+
+
+IMAGE_SIZE = (4000, 3000)  # 12 MP
+SEGMENTS = (64, 200, 800)
+REPEAT = 3
+
+
+def stripes(size):
+    """Alternating black/white columns, with a smooth gradient in the lower half"""
+    width, height = size
+    pixels = np.zeros((height, width, 3), dtype=np.uint8)
+    pixels[:height // 2, 1::2] = 255
+    pixels[height // 2:] = np.linspace(0, 255, width, dtype=np.uint8)[None, :, None]
+    return Image.fromarray(pixels)
+
+
+def reference_grid(image, grid_size):
+    """Float64 linear-light block means, encoded to 8-bit sRGB"""
+    srgb = np.asarray(image) / 255
+    linear = np.where(srgb <= 0.04045, srgb / 12.92, ((srgb + 0.055) / 1.055) ** 2.4)
+    x_starts = np.concatenate(([0], np.cumsum(_block_counts(grid_size[0], image.width))[:-1]))
+    y_starts = np.concatenate(([0], np.cumsum(_block_counts(grid_size[1], image.height))[:-1]))
+    sums = np.add.reduceat(np.add.reduceat(linear, y_starts, axis=0), x_starts, axis=1)
+    counts = np.outer(np.diff(np.append(y_starts, image.height)),
+                      np.diff(np.append(x_starts, image.width)))
+    means = sums / counts[:, :, None]
+    encoded = np.where(means <= 0.0031308, means * 12.92, 1.055 * means ** (1 / 2.4) - 0.055)
+    return np.rint(encoded * 255)
+
+
+def error(grid, reference):
+    """(mean, max) absolute difference in 8-bit levels"""
+    diff = np.abs(np.asarray(grid, dtype=np.float64) - reference)
+    return f"{diff.mean():.2f}", f"{diff.max():.0f}"
+
+
+def main():
+    timing = []
+    for mode in ("RGB", "RGBA"):
+        image = make_test_image(IMAGE_SIZE, mode)
+        for segments in SEGMENTS:
+            exact = None
+            for gap in (None, DEFAULT_REDUCING_GAP):
+                srgb = best_of(lambda: pixelate_grid(image, segments, reducing_gap=gap), REPEAT)
+                linear = best_of(
+                    lambda: pixelate_grid(image, segments, reducing_gap=gap, linear=True), REPEAT
+                )
+                exact = exact or srgb
+                timing.append([
+                    mode, segments, "exact" if gap is None else f"gap {gap:g}",
+                    f"{srgb * 1000:.0f}", f"{linear * 1000:.0f}", f"{linear / srgb:.2f}x",
+                    f"{linear / exact:.2f}x",
+                ])
+
+    high_contrast = stripes(IMAGE_SIZE)
+    accuracy = []
+    for segments in SEGMENTS:
+        grid_size = pixelate_grid(high_contrast, segments).grid.size
+        reference = reference_grid(high_contrast, grid_size)
+        # sRGB means over the same exact blocks as the linear path
+        srgb = _numpy_grid(high_contrast, grid_size)
+        accuracy.append([segments, "sRGB", *error(srgb, reference)])
+        for label, kwargs in (
+            ("linear", {"linear": True}),
+            (f"linear gap {DEFAULT_REDUCING_GAP:g}",
+             {"linear": True, "reducing_gap": DEFAULT_REDUCING_GAP}),
+        ):
+            grid = pixelate_grid(high_contrast, segments, **kwargs).grid
+            accuracy.append([segments, label, *error(grid, reference)])
+
+    print(f"{IMAGE_SIZE[0]}x{IMAGE_SIZE[1]}, best of {REPEAT}\n")
+    print_table(["mode", "segments", "path", "sRGB ms", "linear ms", "ratio", "vs exact"], timing)
+    print("\nDifference from float64 linear-light means (1-pixel stripes + gradient)\n")
+    print_table(["segments", "grid", "mean levels", "max levels"], accuracy)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""
+Paint benchmark: ImageDisplay frame time, full pixmap vs tiled pyramid
+
+Renders ImageDisplay on the offscreen Qt platform and reports:
+
+- pan: average frame time while panning at a fixed zoom
+  ("full" draws the whole original pixmap each frame, as before the
+  pyramid; "tiled" draws the visible cached tiles of the mipmap level)
+- zoom step: average frame time when every frame has a new zoom (wheel
+  zooming), i.e. visible tiles are rescaled each frame
+
+Tiled costs should barely change between image sizes.
+
+    python -m benchmarks.bench_paint
+"""
+
+import os
+import time
+
+from benchmarks.common import print_table
+
+
+VIEW_SIZE = (880, 640)
+IMAGE_SIZES = ((4240, 2832), (8660, 5773))  # 12 MP, 50 MP
+ZOOMS = (100, 200, 500)
+FRAMES = 20
+
+
+def pan_time(display, frames=FRAMES) -> float:
+    """Average seconds per repaint while panning"""
+    from PyQt6 import QtCore, QtGui
+
+    target = QtGui.QImage(display.size(), QtGui.QImage.Format.Format_ARGB32_Premultiplied)
+    display.render(target)  # Warm-up: pyramid level and first tiles
+    start = time.perf_counter()
+    for i in range(frames):
+        display._offset = QtCore.QPointF(i * 3, i * 2)
+        display.render(target)
+    return (time.perf_counter() - start) / frames
+
+
+def zoom_time(display, zoom, frames=FRAMES) -> float:
+    """Average seconds per repaint when each frame changes the zoom slightly"""
+    from PyQt6 import QtGui
+
+    target = QtGui.QImage(display.size(), QtGui.QImage.Format.Format_ARGB32_Premultiplied)
+    display.set_zoom(zoom)
+    display.render(target)
+    start = time.perf_counter()
+    for i in range(frames):
+        display.set_zoom(zoom + 1 + i)
+        display.render(target)
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6 import QtWidgets
+    from display_image import ImageDisplay, pil_to_pixmap
+    from benchmarks.common import make_test_image
+
+    app = QtWidgets.QApplication([])  # noqa: F841
+
+    rows = []
+    for size in IMAGE_SIZES:
+        display = ImageDisplay()
+        display.resize(*VIEW_SIZE)
+        display.set_image(pil_to_pixmap(make_test_image(size)))
+        renderer = display._renderer
+
+        for zoom in ZOOMS:
+            display.set_zoom(zoom)
+            display._renderer = None
+            full = pan_time(display)
+            display._renderer = renderer
+            tiled = pan_time(display)
+            step = zoom_time(display, zoom, frames=5)
+            rows.append([
+                f"{size[0] * size[1] / 1e6:.0f} MP", f"{zoom}%",
+                f"{full * 1000:.1f}", f"{tiled * 1000:.1f}", f"{step * 1000:.1f}",
+            ])
+
+    print(f"{VIEW_SIZE[0]}x{VIEW_SIZE[1]} view, offscreen platform\n")
+    print_table(
+        ["image", "zoom", "pan full ms", "pan tiled ms", "zoom step tiled ms"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
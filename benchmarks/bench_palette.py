@@ -0,0 +1,63 @@
+"""
+Palette reduction benchmark: quantizing the grid vs the full-size image
+
+Compares reduce_palette on the pixel grid (what pixelate_grid(...,
+colors=/palette=) does) with quantizing the upscaled full-resolution
+image, and the file sizes of the indexed result vs the RGB result.
+
+    python -m benchmarks.bench_palette
+"""
+
+import os
+import tempfile
+import time
+
+from benchmarks.common import best_of, make_test_image, print_table
+from export import export_image
+from pixel_transform import pixelate_grid, reduce_palette
+
+
+IMAGE_SIZE = (4000, 3000)
+SEGMENTS = (64, 200)
+SETTINGS = (("16 colors", 16, None), ("pico-8", None, "pico-8"))
+REPEAT = 3
+
+
+def file_size(image, path):
+    """Bytes of image written to path (default encoder settings)"""
+    return export_image(image, path)
+
+
+def main():
+    photo = make_test_image(IMAGE_SIZE)
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for segments in SEGMENTS:
+            pixel_grid = pixelate_grid(photo, segments)
+            full = pixel_grid.to_image()
+            png_rgb = file_size(full, os.path.join(tmp, "rgb.png"))
+
+            for label, colors, palette in SETTINGS:
+                on_grid = best_of(lambda: reduce_palette(pixel_grid.grid, colors, palette), REPEAT)
+                start = time.perf_counter()
+                reduce_palette(full, colors, palette)
+                on_full = time.perf_counter() - start
+
+                indexed = pixel_grid.quantized(colors, palette).to_image()
+                png = file_size(indexed, os.path.join(tmp, "out.png"))
+                gif = file_size(indexed, os.path.join(tmp, "out.gif"))
+                rows.append([
+                    segments, label, f"{on_grid * 1000:.1f}", f"{on_full * 1000:.0f}",
+                    f"{png_rgb / 1024:.0f}", f"{png / 1024:.0f}", f"{gif / 1024:.0f}",
+                ])
+
+    print(f"{IMAGE_SIZE[0]}x{IMAGE_SIZE[1]} RGB, grid best of {REPEAT}\n")
+    print_table(
+        ["segments", "palette", "grid ms", "full-size ms",
+         "RGB PNG KB", "indexed PNG KB", "GIF KB"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""
+Live preview benchmark: time per preview update on a 20 MP image
+
+A preview update pixelates a display-sized proxy (make_proxy +
+pixelate_proxy) and converts it to a QPixmap. The proxy is built once per
+crop; the full-resolution path (pixelate_grid + to_image + QPixmap) is
+shown for comparison.
+
+    python -m benchmarks.bench_preview [WIDTH HEIGHT]
+"""
+
+import os
+import sys
+
+from benchmarks.common import best_of, make_test_image, print_table
+from pixel_transform import make_proxy, pixelate_grid, pixelate_proxy
+
+
+VIEW_SIZE = (880, 640)  # Display widget of the default 1100x700 window
+SEGMENTS = (8, 32, 64, 128, 200)
+
+
+def main():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6 import QtWidgets
+    from display_image import pil_to_pixmap
+
+    app = QtWidgets.QApplication([])  # noqa: F841 (QPixmap needs an application)
+
+    size = tuple(int(v) for v in sys.argv[1:3]) if len(sys.argv) >= 3 else (5472, 3648)
+    image = make_test_image(size)
+
+    proxy_time = best_of(lambda: make_proxy(image, VIEW_SIZE), 3)
+    proxy = make_proxy(image, VIEW_SIZE)
+
+    rows = []
+    for segments in SEGMENTS:
+        preview = best_of(
+            lambda: pil_to_pixmap(pixelate_proxy(proxy, image.size, segments).to_image())
+        )
+        full = best_of(
+            lambda: pil_to_pixmap(pixelate_grid(image, segments).to_image()), 2
+        )
+        rows.append([segments, f"{preview * 1000:.1f}", f"{full * 1000:.0f}"])
+
+    print(
+        f"{size[0]}x{size[1]} RGB ({size[0] * size[1] / 1e6:.0f} MP), "
+        f"proxy {proxy.width}x{proxy.height} built once in {proxy_time * 1000:.0f} ms\n"
+    )
+    print_table(["segments", "preview update ms", "full resolution ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
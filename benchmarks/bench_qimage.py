@@ -0,0 +1,91 @@
+"""
+PIL -> Qt conversion benchmark: RGBA8888 copy path vs format-matched wrap
+
+For each PIL mode, compares the former conversion (convert to RGBA,
+tobytes, Format_RGBA8888, QPixmap.fromImage converts again) with
+pil_to_qimage / pil_to_pixmap, which pack once into the matching
+QImage format. Also checks that both paths show the same pixels.
+
+    python -m benchmarks.bench_qimage
+"""
+
+import os
+
+from benchmarks.common import best_of, make_test_image, print_table
+
+
+IMAGE_SIZE = (4000, 3000)
+MODES = ("RGB", "RGBA", "L", "P", "1", "I;16")
+REPEAT = 3
+
+
+def old_pixmap(pil_image):
+    """Conversion used before pil_to_qimage"""
+    from PyQt6 import QtGui
+
+    data = pil_image.convert("RGBA").tobytes("raw", "RGBA")
+    qimage = QtGui.QImage(
+        data, pil_image.size[0], pil_image.size[1], QtGui.QImage.Format.Format_RGBA8888
+    )
+    return QtGui.QPixmap.fromImage(qimage)
+
+
+def make_mode_image(mode):
+    """Test image in the given mode"""
+    from PIL import Image
+
+    image = make_test_image(IMAGE_SIZE, "RGBA" if mode == "RGBA" else "RGB")
+    if mode == "P":
+        return image.quantize(64)
+    if mode == "I;16":
+        return image.convert("L").convert("I").point(lambda v: v * 257).convert("I;16")
+    if mode == "1":
+        return image.convert("L").convert("1", dither=Image.Dither.NONE)
+    return image.convert(mode)
+
+
+def same_pixels(a, b, samples=500, tolerance=2) -> bool:
+    """Compare a sample of pixels of two pixmaps (each premultiplied path may round by 1)"""
+    import random
+
+    ia, ib = a.toImage(), b.toImage()
+    rng = random.Random(0)
+    for _ in range(samples):
+        x, y = rng.randrange(ia.width()), rng.randrange(ia.height())
+        ca, cb = ia.pixelColor(x, y), ib.pixelColor(x, y)
+        if max(abs(u - v) for u, v in zip(ca.getRgb(), cb.getRgb())) > tolerance:
+            return False
+    return True
+
+
+def main():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6 import QtWidgets
+    from display_image import pil_to_pixmap, pil_to_qimage
+
+    app = QtWidgets.QApplication([])  # noqa: F841
+
+    rows = []
+    for mode in MODES:
+        image = make_mode_image(mode)
+        old = best_of(lambda: old_pixmap(image), REPEAT)
+        to_qimage = best_of(lambda: pil_to_qimage(image), REPEAT)
+        new = best_of(lambda: pil_to_pixmap(image), REPEAT)
+        # 16-bit gray was clipped to 255 by the RGBA path, skip the check
+        match = "-" if mode == "I;16" else same_pixels(old_pixmap(image), pil_to_pixmap(image))
+        rows.append([
+            mode, pil_to_qimage(image).format().name.replace("Format_", ""),
+            f"{old * 1000:.1f}", f"{to_qimage * 1000:.1f}", f"{new * 1000:.1f}",
+            f"{old / new:.2f}x", match,
+        ])
+
+    print(f"{IMAGE_SIZE[0]}x{IMAGE_SIZE[1]}, offscreen platform, best of {REPEAT}\n")
+    print_table(
+        ["mode", "QImage format", "old pixmap ms", "new qimage ms", "new pixmap ms",
+         "speedup", "same pixels"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""
+Block reducer benchmark: mean vs median vs mode at 200 segments on 12 MP
+
+Times pixelate_grid with each reducer (exact, and with the default
+reducing_gap), next to a straightforward per-block loop (np.sort /
+np.unique per block) that the sorting-based reducers replace, and
+checks that both give the same grid. The loop's cost grows with the
+number of blocks, so 800 segments is timed too.
+
+    python -m benchmarks.bench_reducers
+"""
+
+import time
+
+import numpy as np
+
+from benchmarks.common import best_of, make_test_image, print_table
+from pixel_transform import (
+    DEFAULT_REDUCING_GAP, REDUCERS, _block_counts, _MODE_KEY_BITS, pixelate_grid
+)
+
+
+IMAGE_SIZE = (4000, 3000)  # 12 MP
+SEGMENTS = (200, 800)
+REPEAT = 3
+
+
+def per_block_loop(image, grid_size, reducer):
+    """Naive reference: one NumPy call per block"""
+    pixels = np.asarray(image).astype(np.int32)
+    x_edges = np.concatenate(([0], np.cumsum(_block_counts(grid_size[0], image.width))))
+    y_edges = np.concatenate(([0], np.cumsum(_block_counts(grid_size[1], image.height))))
+    bits = _MODE_KEY_BITS // 3
+    grid = np.empty((grid_size[1], grid_size[0], 3), dtype=np.uint8)
+    for j in range(grid_size[1]):
+        for i in range(grid_size[0]):
+            block = pixels[y_edges[j]:y_edges[j + 1], x_edges[i]:x_edges[i + 1]].reshape(-1, 3)
+            if reducer == "median":
+                grid[j, i] = np.sort(block, axis=0)[len(block) // 2]
+            else:
+                q = block >> (8 - bits)
+                keys = (q[:, 0] << 2 * bits) | (q[:, 1] << bits) | q[:, 2]
+                values, counts = np.unique(keys, return_counts=True)
+                grid[j, i] = np.rint(block[keys == values[counts.argmax()]].mean(axis=0))
+    return grid
+
+
+def main():
+    image = make_test_image(IMAGE_SIZE)
+    rows = []
+    for segments in SEGMENTS:
+        for reducer in REDUCERS:
+            exact = best_of(lambda: pixelate_grid(image, segments, reducer=reducer), REPEAT)
+            gap = best_of(
+                lambda: pixelate_grid(
+                    image, segments, reducer=reducer, reducing_gap=DEFAULT_REDUCING_GAP
+                ),
+                REPEAT,
+            )
+            loop, match = "-", "-"
+            if reducer != "mean":
+                grid = pixelate_grid(image, segments, reducer=reducer).grid
+                start = time.perf_counter()
+                reference = per_block_loop(image, grid.size, reducer)
+                loop = f"{(time.perf_counter() - start) * 1000:.0f}"
+                match = bool((np.asarray(grid) == reference).all())
+            rows.append([
+                segments, reducer, f"{exact * 1000:.0f}", f"{gap * 1000:.0f}", loop, match,
+            ])
+
+    print(f"{IMAGE_SIZE[0]}x{IMAGE_SIZE[1]} RGB, best of {REPEAT}\n")
+    print_table(
+        ["segments", "reducer", "exact ms", f"gap {DEFAULT_REDUCING_GAP:g} ms",
+         "per-block loop ms", "same grid"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,42 @@
+"""
+Region pixelation benchmark: cost vs region area on a 24 MP image
+
+Pixelates square regions of growing size in place (pixelate_regions)
+and compares with pixelating the whole image (apply_pixelate). Region
+time should follow the region's area.
+
+    python -m benchmarks.bench_regions
+"""
+
+from benchmarks.common import best_of, make_test_image, print_table
+from pixel_transform import apply_pixelate, pixelate_regions
+
+
+IMAGE_SIZE = (6000, 4000)  # 24 MP
+SEGMENTS = 200
+SIDES = (100, 300, 1000, 3000)
+
+
+def main():
+    image = make_test_image(IMAGE_SIZE)
+    pixels = IMAGE_SIZE[0] * IMAGE_SIZE[1]
+    rows = []
+
+    for side in SIDES:
+        box = (1234, 567, 1234 + side, 567 + side)
+        for reducer in ("mean", "median"):
+            seconds = best_of(lambda: pixelate_regions(image, SEGMENTS, [box], reducer=reducer))
+            rows.append([
+                f"region {side}x{side}", reducer, f"{side * side / pixels:.2%}",
+                f"{seconds * 1000:.1f}",
+            ])
+
+    seconds = best_of(lambda: apply_pixelate(image, SEGMENTS), repeat=3)
+    rows.append(["whole image", "mean", "100%", f"{seconds * 1000:.1f}"])
+
+    print(f"{IMAGE_SIZE[0]}x{IMAGE_SIZE[1]} RGB, {SEGMENTS} segments\n")
+    print_table(["operation", "reducer", "area", "ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""
+Streaming pixelation benchmark: peak memory and time, in-memory vs banded
+
+Writes a large uncompressed PPM scan, then pixelates it to PNG twice, each
+in a fresh interpreter so peak RSS is measured per run:
+
+- in-memory: Image.open + apply_pixelate + save
+- streaming: pixel_transform.pixelate_file (BandReader -> BandWriter)
+
+    python -m benchmarks.bench_streaming [WIDTH HEIGHT]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.common import print_table
+
+
+SEGMENTS = 120
+
+RUNNERS = {
+    "in-memory": """
+from PIL import Image
+from pixel_transform import apply_pixelate
+Image.MAX_IMAGE_PIXELS = None
+apply_pixelate(Image.open(SRC), SEGMENTS).save(DST)
+""",
+    "streaming": """
+from PIL import Image
+from pixel_transform import pixelate_file
+Image.MAX_IMAGE_PIXELS = None
+pixelate_file(SRC, DST, SEGMENTS)
+""",
+}
+
+PROBE = """
+import json, resource, sys, time
+SRC, DST, SEGMENTS = {src!r}, {dst!r}, {segments}
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"s": elapsed, "peak_mb": peak_kb / 1024}}))
+"""
+
+
+def make_scan(path, width, height, band=512):
+    """Write a width x height RGB PPM without holding it in memory"""
+    from benchmarks.common import make_test_image
+
+    tile = make_test_image((width, band)).tobytes()
+    with open(path, "wb") as f:
+        f.write(f"P6\n{width} {height}\n255\n".encode("ascii"))
+        for top in range(0, height, band):
+            rows = min(band, height - top)
+            f.write(tile[:rows * width * 3])
+
+
+def main():
+    width, height = (int(v) for v in sys.argv[1:3]) if len(sys.argv) >= 3 else (12000, 9000)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "scan.ppm")
+        # Separate interpreter: a forked child inherits the parent's peak RSS
+        subprocess.run(
+            [sys.executable, "-c",
+             f"from benchmarks.bench_streaming import make_scan; "
+             f"make_scan({src!r}, {width}, {height})"],
+            check=True, cwd=os.getcwd()
+        )
+        size_mb = os.path.getsize(src) / (1024 * 1024)
+
+        rows = []
+        outputs = {}
+        for label, body in RUNNERS.items():
+            dst = os.path.join(tmp, f"{label}.png")
+            code = PROBE.format(src=src, dst=dst, segments=SEGMENTS, body=body)
+            out = subprocess.run(
+                [sys.executable, "-c", code], capture_output=True, text=True,
+                check=True, cwd=os.getcwd()
+            )
+            report = json.loads(out.stdout.strip().splitlines()[-1])
+            rows.append([label, f"{report['s']:.2f}", f"{report['peak_mb']:.0f}"])
+            outputs[label] = dst
+
+        from PIL import Image
+        Image.MAX_IMAGE_PIXELS = None  # our own synthetic scan
+        identical = all(
+            Image.open(outputs["in-memory"]).tobytes() == Image.open(path).tobytes()
+            for path in outputs.values()
+        )
+
+    print(f"{width}x{height} RGB PPM ({size_mb:.0f} MB), {SEGMENTS} segments -> PNG\n")
+    print_table(["mode", "time s", "peak RSS MB"], rows)
+    print(f"\nIdentical output: {'yes' if identical else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
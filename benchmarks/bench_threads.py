@@ -0,0 +1,54 @@
+"""
+Multi-threaded pixelation benchmark: apply_pixelate(..., workers=N)
+
+Times 1..N threads on a large image and checks that every result is
+bit-identical to the single-threaded output.
+
+    python -m benchmarks.bench_threads [WIDTH HEIGHT]
+"""
+
+import os
+import sys
+
+from benchmarks.common import best_of, make_test_image, print_table
+from pixel_transform import apply_pixelate
+
+
+SEGMENTS = 96
+
+
+def worker_counts(limit):
+    """1, 2, 4, ... up to limit (always including limit)"""
+    counts = []
+    n = 1
+    while n < limit:
+        counts.append(n)
+        n *= 2
+    return counts + [limit]
+
+
+def main():
+    width, height = (int(v) for v in sys.argv[1:3]) if len(sys.argv) >= 3 else (8000, 6000)
+    cores = os.cpu_count() or 1
+
+    for mode in ("RGB", "RGBA"):
+        image = make_test_image((width, height), mode)
+        reference = apply_pixelate(image, SEGMENTS).tobytes()
+
+        rows = []
+        base = None
+        for workers in worker_counts(max(cores, 2)):
+            seconds = best_of(lambda: apply_pixelate(image, SEGMENTS, workers=workers), repeat=3)
+            base = base or seconds
+            identical = apply_pixelate(image, SEGMENTS, workers=workers).tobytes() == reference
+            rows.append([
+                workers, f"{seconds * 1000:.0f}", f"{base / seconds:.2f}x",
+                "yes" if identical else "NO"
+            ])
+
+        print(f"\n{width}x{height} {mode}, {SEGMENTS} segments ({cores} CPU cores)")
+        print_table(["workers", "ms", "speedup", "bit-identical"], rows)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
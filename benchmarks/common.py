@@ -0,0 +1,64 @@
+"""
+Shared helpers for the benchmark scripts
+"""
+
+import time
+from typing import Callable, List, Sequence, Tuple
+
+from PIL import Image
+
+
+def best_of(fn: Callable[[], object], repeat: int = 5) -> float:
+    """
+    Run fn several times and return the fastest wall time
+
+    Args:
+        fn (Callable): Function to time (called without arguments)
+        repeat (int): Number of runs
+
+    Returns:
+        float: Best time in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_test_image(size: Tuple[int, int], mode: str = "RGB", seed: int = 0) -> Image.Image:
+    """
+    Build a deterministic photo-like test image (smooth gradients + noise)
+
+    Args:
+        size (Tuple[int, int]): (width, height)
+        mode (str): PIL mode of the result
+        seed (int): Noise seed
+
+    Returns:
+        PIL.Image: Test image
+    """
+    import numpy as np
+
+    w, h = size
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:h, 0:w].astype(np.float32)
+    channels = [
+        128 + 100 * np.sin(x / (w / 7) + k) * np.cos(y / (h / 5) - k)
+        for k in range(4)
+    ]
+    data = np.stack(channels, axis=-1) + rng.normal(0, 12, (h, w, 4))
+    rgba = Image.fromarray(np.clip(data, 0, 255).astype(np.uint8), "RGBA")
+    return rgba if mode == "RGBA" else rgba.convert(mode)
+
+
+def print_table(headers: Sequence[str], rows: List[Sequence[object]]):
+    """Print rows as an aligned plain-text table"""
+    cells = [[str(c) for c in headers]] + [[str(c) for c in row] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+
+    for n, row in enumerate(cells):
+        print("  ".join(c.rjust(w) if i else c.ljust(w) for i, (c, w) in enumerate(zip(row, widths))))
+        if n == 0:
+            print("  ".join("-" * w for w in widths))
\ No newline at end of file
@@ -2,8 +2,137 @@
 Image Display Widget - Custom QLabel with interactive crop and zoom
 """
 
+import sys
+
 from PyQt6 import QtWidgets, QtCore, QtGui
 
+from display_render import MipmapPyramid, TiledRenderer
+
+
+_Format = QtGui.QImage.Format
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+# PIL mode -> (raw mode to pack, QImage format, bytes per pixel).
+# RGB32 / ARGB32_Premultiplied are the raster pixmap's native formats
+# (0xAARRGGBB words, i.e. BGRA bytes on little-endian), so
+# QPixmap.fromImage shares their buffer instead of converting it.
+_QIMAGE_FORMATS = {
+    "RGB": ("BGRX" if _LITTLE_ENDIAN else "XRGB", _Format.Format_RGB32, 4),
+    "RGBA": ("BGRa" if _LITTLE_ENDIAN else "aRGB", _Format.Format_ARGB32_Premultiplied, 4),
+    "L": ("L", _Format.Format_Grayscale8, 1),
+    "P": ("P", _Format.Format_Indexed8, 1),
+    "I;16": ("I;16" if _LITTLE_ENDIAN else "I;16B", _Format.Format_Grayscale16, 2),
+    "1": ("1", _Format.Format_Mono, None),
+}
+
+# Formats QPixmap.fromImage wraps without a copy on the raster backend
+_SHARED_FORMATS = (_Format.Format_RGB32, _Format.Format_ARGB32_Premultiplied)
+
+
+def _color_table(pil_image):
+    """
+    Build a QImage color table from the palette (and transparency) of a P image
+    
+    Args:
+        pil_image (PIL.Image): Image in mode P
+        
+    Returns:
+        list: 256 ARGB values
+    """
+    palette = pil_image.getpalette("RGBA") or []
+    colors = [
+        QtGui.qRgba(*palette[i:i + 4]) for i in range(0, len(palette), 4)
+    ]
+    colors += [QtGui.qRgba(0, 0, 0, 255)] * (256 - len(colors))
+    
+    transparency = pil_image.info.get("transparency")
+    if isinstance(transparency, int):
+        transparency = {transparency: 0}
+    elif isinstance(transparency, bytes):
+        transparency = dict(enumerate(transparency))
+    else:
+        transparency = {}
+    for index, alpha in transparency.items():
+        if index < 256:
+            color = colors[index]
+            colors[index] = QtGui.qRgba(
+                QtGui.qRed(color), QtGui.qGreen(color), QtGui.qBlue(color), alpha
+            )
+    return colors
+
+
+def pil_to_qimage(pil_image):
+    """
+    Wrap a PIL Image in a QImage of the matching format
+    
+    The pixels are packed once (tobytes) straight into the layout of the
+    chosen QImage format and the QImage uses that buffer without copying
+    it. The buffer is kept as an attribute of the returned QImage, so it
+    lives as long as the QImage does. Modes without a matching format are
+    converted to RGB or RGBA first.
+    
+    Args:
+        pil_image (PIL.Image): Image to convert
+        
+    Returns:
+        QImage: Image backed by the packed buffer
+    """
+    mode = pil_image.mode
+    if mode in ("I;16L", "I;16N"):
+        mode = "I;16"
+    if mode not in _QIMAGE_FORMATS:
+        has_alpha = "A" in pil_image.getbands() or "transparency" in pil_image.info
+        mode = "RGBA" if has_alpha else "RGB"
+        pil_image = pil_image.convert(mode)
+    
+    rawmode, qformat, bytes_per_pixel = _QIMAGE_FORMATS[mode]
+    width, height = pil_image.size
+    if bytes_per_pixel is None:
+        bytes_per_line = (width + 7) // 8  # Bit-packed, MSB first
+    else:
+        bytes_per_line = width * bytes_per_pixel
+    
+    data = pil_image.tobytes("raw", rawmode)
+    qimage = QtGui.QImage(data, width, height, bytes_per_line, qformat)
+    qimage._buffer = data
+    
+    if mode == "P":
+        qimage.setColorTable(_color_table(pil_image))
+    elif mode == "1":
+        qimage.setColorTable([QtGui.qRgb(0, 0, 0), QtGui.qRgb(255, 255, 255)])
+    return qimage
+
+
+def qimage_to_pixmap(qimage):
+    """
+    Convert a QImage made by pil_to_qimage to a QPixmap (GUI thread only)
+    
+    Args:
+        qimage (QImage): Image to convert
+        
+    Returns:
+        QPixmap: Converted image
+    """
+    pixmap = QtGui.QPixmap.fromImage(qimage)
+    buffer = getattr(qimage, "_buffer", None)
+    if buffer is not None and qimage.format() in _SHARED_FORMATS:
+        # The pixmap shares the packed buffer, keep it alive with the pixmap
+        pixmap._buffer = buffer
+    return pixmap
+
+
+def pil_to_pixmap(pil_image):
+    """
+    Convert a PIL Image to a QPixmap
+    
+    Args:
+        pil_image (PIL.Image): Image to convert
+        
+    Returns:
+        QPixmap: Converted image
+    """
+    return qimage_to_pixmap(pil_to_qimage(pil_image))
+
 
 class ImageDisplay(QtWidgets.QLabel):
     """
@@ -27,6 +156,8 @@ class ImageDisplay(QtWidgets.QLabel):
         
         # Initialize all state variables
         self._original_pixmap = None
+        self._pyramid = None  # Pre-scaled levels of _original_pixmap
+        self._renderer = None  # Draws visible tiles of _pyramid
         self._current_ratio = None
         self._zoom_factor = 1.0
         self._offset = QtCore.QPointF(0, 0)
@@ -48,10 +179,17 @@ class ImageDisplay(QtWidgets.QLabel):
         """
         Set a new image to display
         
+        Also sets up the mipmap pyramid and tiled renderer used by paintEvent.
+        
         Args:
             pixmap (QPixmap): The image to display
         """
         self._original_pixmap = pixmap
+        self._pyramid = None
+        self._renderer = None
+        if pixmap is not None and not pixmap.isNull():
+            self._pyramid = MipmapPyramid(pixmap)
+            self._renderer = TiledRenderer(self._pyramid)
         self._offset = QtCore.QPointF(0, 0)
         self.update()
 
@@ -195,8 +333,11 @@ class ImageDisplay(QtWidgets.QLabel):
         dest_rect = QtCore.QRectF(0, 0, tw, th)
         dest_rect.moveCenter(QtCore.QPointF(rect_center) + self._offset)
 
-        # Draw image
-        painter.drawPixmap(dest_rect.toRect(), self._original_pixmap)
+        # Draw only the visible tiles of the level closest to the on-screen size
+        if self._renderer is not None:
+            self._renderer.draw(painter, dest_rect, self.rect())
+        else:
+            painter.drawPixmap(dest_rect.toRect(), self._original_pixmap)
 
         # Draw crop overlay if enabled and ratio is selected
         if self._show_overlay and self._current_ratio:
@@ -253,14 +394,18 @@ class ImageDisplay(QtWidgets.QLabel):
         """
         Get current transformation parameters for cropping
         
+        Qt geometry is converted to plain tuples so the result can be passed
+        straight to the Qt-free processing modules (edit_image).
+        
         Returns:
-            dict: Dictionary containing ratio, zoom, offset, and view_size
+            dict: Dictionary containing ratio, zoom, offset (x, y),
+                  and view_size (width, height)
         """
         return {
             "ratio": self._current_ratio,
             "zoom": self._zoom_factor,
-            "offset": self._offset,
-            "view_size": self.size()
+            "offset": (self._offset.x(), self._offset.y()),
+            "view_size": (self.width(), self.height())
         }
     
     def update_from_pil(self, pil_image):
@@ -271,14 +416,7 @@ class ImageDisplay(QtWidgets.QLabel):
             pil_image (PIL.Image): Image to display
         """
         # Convert PIL to Qt-compatible format
-        data = pil_image.convert("RGBA").tobytes("raw", "RGBA")
-        qimage = QtGui.QImage(
-            data, 
-            pil_image.size[0], 
-            pil_image.size[1], 
-            QtGui.QImage.Format.Format_RGBA8888
-        )
-        pixmap = QtGui.QPixmap.fromImage(qimage)
+        pixmap = pil_to_pixmap(pil_image)
         
         # Reset display parameters since image is already processed
         self._offset = QtCore.QPointF(0, 0)
@@ -0,0 +1,208 @@
+"""
+Display Rendering - Pre-scaled pixmaps for fast painting
+
+Scaling a 50 MP pixmap to the widget on every repaint makes panning
+stutter. MipmapPyramid keeps copies at 1/2, 1/4, ... of the original size
+so paintEvent only ever scales a level that is at most 2x larger than
+the area it fills. TiledRenderer then draws only the tiles of that level
+that intersect the widget, from a cache of pre-scaled tiles.
+"""
+
+import math
+from collections import OrderedDict
+from typing import List, Optional
+
+from PyQt6 import QtCore, QtGui
+
+
+# Levels stop once the next one would be narrower/shorter than this
+MIN_LEVEL_SIZE = 64
+
+# Tile edge in pixels of the pyramid level being drawn
+TILE_SIZE = 256
+
+# Byte budget of the scaled-tile cache
+TILE_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class MipmapPyramid:
+    """
+    Pixmap plus successively halved copies of it
+    
+    Level sizes are fixed up front; each level is scaled the first time it
+    is needed, straight from the nearest larger level that already exists
+    (so fitting a 50 MP image to the window costs one scale, not a chain
+    of halvings).
+    
+    Attributes:
+        sizes (List[QSize]): sizes[0] is the original, each next level is
+                             half the size of the previous one
+    """
+    
+    def __init__(self, pixmap: QtGui.QPixmap, min_size: int = MIN_LEVEL_SIZE):
+        self.sizes: List[QtCore.QSize] = [pixmap.size()]
+        self._levels: List[Optional[QtGui.QPixmap]] = [pixmap]
+        
+        width, height = pixmap.width(), pixmap.height()
+        while min(width, height) // 2 >= min_size:
+            width, height = width // 2, height // 2
+            self.sizes.append(QtCore.QSize(width, height))
+            self._levels.append(None)
+    
+    def level_for(self, target_width: float) -> QtGui.QPixmap:
+        """
+        Pick the smallest level that is still at least target_width wide
+        
+        Args:
+            target_width (float): On-screen width the pixmap will be drawn at
+            
+        Returns:
+            QPixmap: Level to draw (the original when zoomed in past 100%)
+        """
+        return self.level(self.index_for(target_width))
+    
+    def index_for(self, target_width: float) -> int:
+        """Index of the level level_for() would return"""
+        index = 0
+        while index + 1 < len(self.sizes) and self.sizes[index + 1].width() >= target_width:
+            index += 1
+        return index
+    
+    def level(self, index: int) -> QtGui.QPixmap:
+        """Return level index, scaling it from a larger level on first use"""
+        if self._levels[index] is None:
+            source = next(
+                self._levels[i] for i in range(index - 1, -1, -1) if self._levels[i] is not None
+            )
+            self._levels[index] = source.scaled(
+                self.sizes[index],
+                QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
+                QtCore.Qt.TransformationMode.SmoothTransformation
+            )
+        return self._levels[index]
+    
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the scaled levels (excluding the original)"""
+        return sum(
+            level.width() * level.height() * max(1, level.depth() // 8)
+            for level in self._levels[1:] if level is not None
+        )
+
+
+def _pixmap_nbytes(pixmap: QtGui.QPixmap) -> int:
+    return pixmap.width() * pixmap.height() * max(1, pixmap.depth() // 8)
+
+
+class TiledRenderer:
+    """
+    Draw a MipmapPyramid tile by tile, skipping tiles outside the viewport
+    
+    The chosen level is split into TILE_SIZE tiles. Only tiles intersecting
+    the clip rect are drawn, each pre-scaled to its on-screen size and kept
+    in an LRU cache, so panning is a few blits and a zoom step rescales only
+    the visible tiles: the cost follows the widget size, not the image size.
+    """
+    
+    def __init__(
+        self, 
+        pyramid: MipmapPyramid, 
+        tile_size: int = TILE_SIZE, 
+        cache_bytes: int = TILE_CACHE_BYTES
+    ):
+        self.pyramid = pyramid
+        self.tile_size = tile_size
+        self.cache_bytes = cache_bytes
+        self._tiles = OrderedDict()  # (level, tx, ty, width, height) -> QPixmap
+        self._nbytes = 0
+    
+    def draw(self, painter: QtGui.QPainter, dest_rect: QtCore.QRectF, clip_rect: QtCore.QRect):
+        """
+        Draw the image scaled into dest_rect, limited to clip_rect
+        
+        Args:
+            painter (QPainter): Active painter
+            dest_rect (QRectF): Where the whole image would be drawn
+            clip_rect (QRect): Visible area (usually the widget rect)
+        """
+        if dest_rect.width() <= 0 or dest_rect.height() <= 0:
+            return
+        
+        index = self.pyramid.index_for(dest_rect.width())
+        size = self.pyramid.sizes[index]
+        scale_x = dest_rect.width() / size.width()
+        scale_y = dest_rect.height() / size.height()
+        
+        visible = dest_rect.intersected(QtCore.QRectF(clip_rect))
+        if visible.isEmpty():
+            return
+        
+        # Tile range covering the visible part, in level pixels
+        tile = self.tile_size
+        first_tx = max(0, int((visible.left() - dest_rect.left()) / scale_x) // tile)
+        first_ty = max(0, int((visible.top() - dest_rect.top()) / scale_y) // tile)
+        last_tx = min(
+            (size.width() - 1) // tile,
+            math.ceil((visible.right() - dest_rect.left()) / scale_x) // tile
+        )
+        last_ty = min(
+            (size.height() - 1) // tile,
+            math.ceil((visible.bottom() - dest_rect.top()) / scale_y) // tile
+        )
+        
+        origin_x = round(dest_rect.left())
+        origin_y = round(dest_rect.top())
+        for ty in range(first_ty, last_ty + 1):
+            for tx in range(first_tx, last_tx + 1):
+                pixmap = self._scaled_tile(index, tx, ty, scale_x, scale_y)
+                if pixmap.isNull():
+                    continue
+                painter.drawPixmap(
+                    origin_x + round(tx * tile * scale_x),
+                    origin_y + round(ty * tile * scale_y),
+                    pixmap
+                )
+    
+    def _scaled_tile(self, index, tx, ty, scale_x, scale_y) -> QtGui.QPixmap:
+        """Tile (tx, ty) of a level scaled to screen, from the LRU cache"""
+        size = self.pyramid.sizes[index]
+        tile = QtCore.QRect(tx * self.tile_size, ty * self.tile_size, self.tile_size, self.tile_size)
+        tile = tile.intersected(QtCore.QRect(QtCore.QPoint(0, 0), size))
+        
+        # Edges are rounded relative to the image origin, so tile sizes do
+        # not change while panning and neighbours never leave gaps
+        left = round(tile.left() * scale_x)
+        top = round(tile.top() * scale_y)
+        width = round((tile.right() + 1) * scale_x) - left
+        height = round((tile.bottom() + 1) * scale_y) - top
+        
+        key = (index, tx, ty, width, height)
+        pixmap = self._tiles.get(key)
+        if pixmap is not None:
+            self._tiles.move_to_end(key)
+            return pixmap
+        
+        # Scale with a 1 px margin so smoothing sees the neighbouring tiles,
+        # then cut the margin off again
+        source = tile.adjusted(-1, -1, 1, 1).intersected(QtCore.QRect(QtCore.QPoint(0, 0), size))
+        source_left = round(source.left() * scale_x)
+        source_top = round(source.top() * scale_y)
+        scaled = self.pyramid.level(index).copy(source).scaled(
+            round((source.right() + 1) * scale_x) - source_left,
+            round((source.bottom() + 1) * scale_y) - source_top,
+            QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
+            QtCore.Qt.TransformationMode.SmoothTransformation
+        )
+        pixmap = scaled.copy(left - source_left, top - source_top, width, height)
+        
+        self._tiles[key] = pixmap
+        self._nbytes += _pixmap_nbytes(pixmap)
+        while self._nbytes > self.cache_bytes and len(self._tiles) > 1:
+            _, evicted = self._tiles.popitem(last=False)
+            self._nbytes -= _pixmap_nbytes(evicted)
+        return pixmap
+    
+    def clear(self):
+        """Drop all cached tiles"""
+        self._tiles.clear()
+        self._nbytes = 0
\ No newline at end of file
@@ -0,0 +1,321 @@
+"""
+Edit Graph Module - Non-destructive editing with incremental recomputation
+
+An EditGraph is a chain of operations, by default
+source -> crop -> reduce -> palette -> upscale -> encode. Settings are
+plain mappings {node name: {parameter: value}} that are passed to every
+evaluation; nothing in the graph is mutated by changing them. Each node
+memoizes its outputs under a fingerprint of its own parameters and its
+upstream node's fingerprint, so after a change only the changed node and
+those below it are recomputed, and going back to earlier settings is a
+memo hit. Settings are immutable per call, so GUI worker threads and
+batch processes evaluate the same graph code without shared state.
+
+Nodes whose parameters disable them (e.g. reduce with segments=0) pass
+their input through; such outputs are not memoized twice.
+"""
+
+from typing import Callable, Dict, Hashable, Mapping, Optional, Sequence, Tuple
+
+from PIL import Image
+
+from export import encode_image
+from image_cache import ResultMemo, decoded_images
+from image_io import open_image
+from pixel_transform import PixelGrid, pixelate_crop_file, pixelate_grid
+
+
+# Settings of one evaluation: node name -> keyword parameters of its operation
+Settings = Mapping[str, Mapping[str, Hashable]]
+
+# Memo budgets of the GUI graph (the source node uses decoded_images)
+NODE_MEMO_BYTES = {
+    "crop": 256 * 1024 * 1024,
+    "reduce": 64 * 1024 * 1024,
+    "palette": 64 * 1024 * 1024,
+    "upscale": 128 * 1024 * 1024,
+    "encode": 64 * 1024 * 1024,
+}
+
+
+def load_decoded(path: str, version: Hashable = None) -> Image.Image:
+    """
+    Source operation: the decoded image shared through decoded_images
+
+    Args:
+        path (str): Image file
+        version: File version (see source_params); only part of the fingerprint
+    """
+    return decoded_images.get(path)
+
+
+def load_file(path: str, version: Hashable = None) -> Image.Image:
+    """Source operation: decode a file without caching it (batch)"""
+    with open_image(path) as img:
+        img.load()
+        return img.copy() if img.readonly else img
+
+
+def source_params(path: str) -> Dict[str, Hashable]:
+    """
+    Parameters of the source node for a file
+
+    The version (size, mtime) changes the fingerprint when the file is
+    edited, so everything derived from it is recomputed.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+    """
+    key = decoded_images.key_for(path)
+    return {"path": path, "version": key[1:]}
+
+
+def crop_image(image: Image.Image, box: Optional[Tuple[int, int, int, int]] = None) -> Image.Image:
+    """Crop operation: Image.crop (boxes reaching past the image are padded), None = no crop"""
+    return image if box is None else image.crop(box)
+
+
+def reduce_image(
+    image: Image.Image,
+    segments_count: int = 0,
+    reducing_gap: Optional[float] = None,
+    reducer: str = "mean",
+    linear: bool = False
+):
+    """Reduce operation: the pixel grid (see pixelate_grid), 0 segments = unchanged image"""
+    if segments_count == 0:
+        return image
+    return pixelate_grid(
+        image, segments_count, reducing_gap=reducing_gap, reducer=reducer, linear=linear
+    )
+
+
+def reduce_file(
+    path: str,
+    version: Hashable = None,
+    box: Optional[Tuple[int, int, int, int]] = None,
+    segments_count: int = 0,
+    reducing_gap: Optional[float] = None
+) -> PixelGrid:
+    """Fused source + crop + reduce operation: pixelate_crop_file (mean reducer only)"""
+    return pixelate_crop_file(path, box, segments_count, reducing_gap)
+
+
+def reduce_colors(
+    grid,
+    colors: Optional[int] = None,
+    palette: Optional[str] = None,
+    dither: Optional[str] = None
+):
+    """Palette operation: PixelGrid.quantized; images and full color pass through"""
+    if not isinstance(grid, PixelGrid) or (colors is None and palette is None):
+        return grid
+    return grid.quantized(colors, palette, dither)
+
+
+def upscale(grid, scale: Optional[int] = None) -> Image.Image:
+    """Upscale operation: full size (None) or the grid enlarged scale times; images pass through"""
+    if not isinstance(grid, PixelGrid):
+        return grid
+    return grid.to_image() if scale is None else grid.scaled(scale)
+
+
+def encode(
+    image: Image.Image,
+    format: str = "PNG",
+    options: Tuple[Tuple[str, Hashable], ...] = (),
+    progress=None
+) -> bytes:
+    """
+    Encode operation: the encoded file (see export.encode_image)
+
+    Args:
+        format (str): Pillow format name
+        options: Encoder options as sorted (name, value) pairs (see frozen_options)
+    """
+    return encode_image(image, format, dict(options), progress)
+
+
+def frozen_options(params: Mapping[str, Hashable]) -> Tuple[Tuple[str, Hashable], ...]:
+    """Encoder options (export.encoder_params) in the hashable form encode takes"""
+    return tuple(sorted(params.items()))
+
+
+class Node:
+    """
+    One operation of an EditGraph
+
+    Attributes:
+        name (str): Key of the node's parameters in the settings
+        fn (Callable): fn(upstream output, **params), or fn(**params) for
+                       the first node
+        upstream (str): Name of the input node (None = first node)
+        memo (ResultMemo): Memoized outputs by fingerprint (None = not kept)
+        progress (bool): fn takes the progress callback of the evaluation
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable,
+        upstream: Optional[str] = None,
+        memo_bytes: int = 0,
+        progress: bool = False
+    ):
+        self.name = name
+        self.fn = fn
+        self.upstream = upstream
+        self.memo = ResultMemo(memo_bytes) if memo_bytes > 0 else None
+        self.progress = progress
+
+    def __repr__(self):
+        return f"Node({self.name!r}, upstream={self.upstream!r})"
+
+
+class EditGraph:
+    """
+    Chain of Nodes evaluated on demand, with per-node memos
+
+    Example:
+        >>> graph = editing_graph()
+        >>> settings = {"source": source_params("photo.jpg"), "reduce": {"segments_count": 64}}
+        >>> grid = graph.output("palette", settings)      # decodes and pixelates
+        >>> settings = dict(settings, palette={"palette": "pico-8"})
+        >>> grid = graph.output("palette", settings)      # only quantizes the memoized grid
+    """
+
+    def __init__(self, nodes: Sequence[Node]):
+        self.nodes = {}
+        for node in nodes:
+            if node.upstream is not None and node.upstream not in self.nodes:
+                raise ValueError(f"Node '{node.name}' comes before its input '{node.upstream}'")
+            self.nodes[node.name] = node
+
+    def _node(self, name: str) -> Node:
+        node = self.nodes.get(name)
+        if node is None:
+            raise ValueError(f"Unknown node '{name}'. Use: {', '.join(self.nodes)}")
+        return node
+
+    def fingerprint(self, name: str, settings: Settings) -> Hashable:
+        """
+        Key of a node's output: its parameters and those of every node upstream
+
+        Raises:
+            ValueError: If the node is unknown
+            TypeError: If a parameter value is not hashable
+        """
+        node = self._node(name)
+        params = tuple(sorted(settings.get(name, {}).items()))
+        hash(params)
+        upstream = None if node.upstream is None else self.fingerprint(node.upstream, settings)
+        return (upstream, name, params)
+
+    def output(self, name: str, settings: Settings, progress=None):
+        """
+        Evaluate a node, recomputing only what is not memoized
+
+        Args:
+            name (str): Node to evaluate
+            settings (Settings): Parameters per node (missing = the operation's defaults)
+            progress (Callable): Passed to nodes that report progress (encode)
+
+        Returns:
+            The node's output
+
+        Raises:
+            ValueError: If the node is unknown
+            Exception: Whatever an operation raises
+        """
+        node = self._node(name)
+        key = self.fingerprint(name, settings)
+        if node.memo is not None:
+            cached = node.memo.get(key)
+            if cached is not None:
+                return cached
+
+        kwargs = dict(settings.get(name, {}))
+        if node.progress and progress is not None:
+            kwargs["progress"] = progress
+
+        if node.upstream is None:
+            upstream, result = None, node.fn(**kwargs)
+        else:
+            upstream = self.output(node.upstream, settings, progress)
+            result = node.fn(upstream, **kwargs)
+
+        # Pass-through outputs are already kept upstream
+        if node.memo is not None and result is not upstream:
+            node.memo.put(key, result)
+        return result
+
+    def remember(self, name: str, settings: Settings, value):
+        """Put a known output of a node back into its memo (e.g. an undo checkpoint)"""
+        node = self._node(name)
+        if node.memo is not None:
+            node.memo.put(self.fingerprint(name, settings), value)
+
+    def cached(self, name: str, settings: Settings):
+        """Memoized output of a node, or None (never computes)"""
+        node = self._node(name)
+        if node.memo is None:
+            return None
+        return node.memo.get(self.fingerprint(name, settings))
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by all node memos"""
+        return sum(node.memo.nbytes for node in self.nodes.values() if node.memo is not None)
+
+    def stats(self) -> Dict[str, dict]:
+        """Memo statistics per node (see ResultMemo.stats)"""
+        return {
+            name: node.memo.stats() for name, node in self.nodes.items() if node.memo is not None
+        }
+
+    def clear(self):
+        """Drop all memoized outputs"""
+        for node in self.nodes.values():
+            if node.memo is not None:
+                node.memo.clear()
+
+
+def editing_graph(memo_bytes: Optional[Mapping[str, int]] = None) -> EditGraph:
+    """
+    Graph of the GUI: source -> crop -> reduce -> palette -> upscale -> encode
+
+    Args:
+        memo_bytes (Mapping[str, int]): Memo budget per node (default: NODE_MEMO_BYTES)
+    """
+    budgets = NODE_MEMO_BYTES if memo_bytes is None else memo_bytes
+    return EditGraph([
+        Node("source", load_decoded),
+        Node("crop", crop_image, "source", budgets.get("crop", 0)),
+        Node("reduce", reduce_image, "crop", budgets.get("reduce", 0)),
+        Node("palette", reduce_colors, "reduce", budgets.get("palette", 0)),
+        Node("upscale", upscale, "palette", budgets.get("upscale", 0)),
+        Node("encode", encode, "upscale", budgets.get("encode", 0), progress=True),
+    ])
+
+
+def batch_graph(fused: bool = False) -> EditGraph:
+    """
+    Graph of batch.process_file (each file is evaluated once, nothing is memoized)
+
+    Args:
+        fused (bool): Replace source -> crop -> reduce with one "reduce"
+                      node (reduce_file) that decodes only what the grid needs
+    """
+    if fused:
+        head = [Node("reduce", reduce_file)]
+    else:
+        head = [
+            Node("source", load_file),
+            Node("crop", crop_image, "source"),
+            Node("reduce", reduce_image, "crop"),
+        ]
+    return EditGraph(head + [
+        Node("palette", reduce_colors, "reduce"),
+        Node("upscale", upscale, "palette"),
+        Node("encode", encode, "upscale", progress=True),
+    ])
\ No newline at end of file
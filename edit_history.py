@@ -0,0 +1,167 @@
+"""
+Edit History Module - Memory-compact undo/redo
+
+A step stores what a result was made from, not its pixels: the edit
+graph settings (edit_graph.Settings), the control values that produced
+them and, as a checkpoint, the small pixel grid. Undo and redo return a
+step; the application rematerializes it through the edit graph, which
+starts from the nearest memoized node (the checkpoint is put back into
+the palette node first) and recomputes the rest from the decoded image.
+
+Memory is capped by max_bytes: checkpoints of the steps farthest from
+the current one are dropped first (those steps are then replayed from
+the source), and steps beyond max_steps are dropped from the oldest end.
+"""
+
+from dataclasses import dataclass
+from typing import Hashable, List, Optional
+
+from edit_graph import Settings
+from pixel_transform import PixelGrid
+
+
+# Default memory cap of the history (steps plus checkpoints)
+DEFAULT_HISTORY_BYTES = 64 * 1024 * 1024
+
+# Default number of steps kept
+DEFAULT_HISTORY_STEPS = 100
+
+# Approximate memory of a step without its checkpoint (settings and controls)
+STEP_OVERHEAD_BYTES = 2048
+
+
+@dataclass
+class HistoryStep:
+    """
+    One undoable state
+
+    Attributes:
+        label (str): What led to the state, e.g. "Crop"
+        settings (Settings): Edit graph settings of the result
+        controls (Hashable): Control values to restore (defined by the GUI)
+        checkpoint (PixelGrid): The result's grid, if pixelated and still kept
+    """
+
+    label: str
+    settings: Settings
+    controls: Hashable = None
+    checkpoint: Optional[PixelGrid] = None
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the step"""
+        grid_bytes = 0 if self.checkpoint is None else self.checkpoint.nbytes
+        return STEP_OVERHEAD_BYTES + grid_bytes
+
+
+class EditHistory:
+    """
+    Linear undo/redo history with a memory cap
+
+    Pushing a step after an undo discards the steps that could have been
+    redone.
+
+    Attributes:
+        max_bytes (int): Memory cap
+        max_steps (int): Maximum number of steps
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_HISTORY_BYTES,
+        max_steps: int = DEFAULT_HISTORY_STEPS
+    ):
+        if max_bytes < 0:
+            raise ValueError(f"max_bytes must be >= 0, got {max_bytes}")
+        if max_steps < 1:
+            raise ValueError(f"max_steps must be >= 1, got {max_steps}")
+        self.max_bytes = max_bytes
+        self.max_steps = max_steps
+        self._steps: List[HistoryStep] = []
+        self._index = -1
+
+    @property
+    def current(self) -> Optional[HistoryStep]:
+        """The step shown now (None = empty history)"""
+        return self._steps[self._index] if self._steps else None
+
+    @property
+    def can_undo(self) -> bool:
+        return self._index > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return self._index < len(self._steps) - 1
+
+    @property
+    def next(self) -> Optional[HistoryStep]:
+        """The step redo() would restore (None = nothing to redo)"""
+        return self._steps[self._index + 1] if self.can_redo else None
+
+    def push(self, step: HistoryStep) -> bool:
+        """
+        Record a new current step
+
+        Returns:
+            bool: False if the step equals the current one (not recorded)
+        """
+        current = self.current
+        if current is not None and current.settings == step.settings \
+                and current.controls == step.controls:
+            return False
+
+        del self._steps[self._index + 1:]
+        self._steps.append(step)
+        if len(self._steps) > self.max_steps:
+            del self._steps[:len(self._steps) - self.max_steps]
+        self._index = len(self._steps) - 1
+        self._enforce_budget()
+        return True
+
+    def undo(self) -> Optional[HistoryStep]:
+        """Step back; returns the step to restore, or None"""
+        if not self.can_undo:
+            return None
+        self._index -= 1
+        return self.current
+
+    def redo(self) -> Optional[HistoryStep]:
+        """Step forward again; returns the step to restore, or None"""
+        if not self.can_redo:
+            return None
+        self._index += 1
+        return self.current
+
+    def _enforce_budget(self):
+        """Drop checkpoints, farthest from the current step first, until within max_bytes"""
+        excess = self.nbytes - self.max_bytes
+        if excess <= 0:
+            return
+        by_distance = sorted(
+            (i for i, step in enumerate(self._steps) if step.checkpoint is not None),
+            key=lambda i: abs(i - self._index),
+            reverse=True,
+        )
+        for i in by_distance:
+            if excess <= 0:
+                break
+            excess -= self._steps[i].checkpoint.nbytes
+            self._steps[i].checkpoint = None
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the history"""
+        return sum(step.nbytes for step in self._steps)
+
+    @property
+    def position(self) -> int:
+        """Number of the current step (1-based, 0 = empty)"""
+        return self._index + 1
+
+    def clear(self):
+        """Forget all steps"""
+        self._steps.clear()
+        self._index = -1
+
+    def __len__(self):
+        return len(self._steps)
\ No newline at end of file
@@ -2,36 +2,42 @@
 Image Cropping Module - Handles crop transformations
 """
 
-from PIL import Image
 from typing import Tuple
 
+from image_io import open_image
 
-def process_crop(
-    image_path: str, 
-    ratio: float, 
-    zoom: float, 
-    offset, 
-    view_size
-) -> Image.Image:
+
+# Padding (px) between the display widget edge and the fitted image
+VIEW_PADDING = 40
+
+# Crop box in original image pixels: (left, top, right, bottom)
+CropBox = Tuple[float, float, float, float]
+
+
+def compute_crop_box(
+    image_size: Tuple[int, int],
+    ratio: float,
+    zoom: float,
+    offset: Tuple[float, float],
+    view_size: Tuple[int, int],
+    padding: int = VIEW_PADDING
+) -> CropBox:
     """
-    Crop an image based on aspect ratio, zoom, and offset parameters
-    
-    This function translates GUI coordinates (view_size, zoom, offset) into
-    actual pixel coordinates for cropping the original image.
+    Translate display geometry into a crop box in original image pixels
     
     Args:
-        image_path (str): Path to the source image file
+        image_size (Tuple[int, int]): Original image (width, height)
         ratio (float): Target aspect ratio (width/height)
         zoom (float): Zoom factor (1.0 = 100%, 1.5 = 150%, etc.)
-        offset (QPointF): Pan offset from center in GUI coordinates
-        view_size (QSize): Size of the display widget
+        offset (Tuple[float, float]): Pan offset (x, y) from center in view pixels
+        view_size (Tuple[int, int]): Size (width, height) of the display widget
+        padding (int): Padding between widget edge and fitted image
         
     Returns:
-        PIL.Image: Cropped image
+        CropBox: (left, top, right, bottom), clamped to the image
         
     Raises:
-        FileNotFoundError: If image file doesn't exist
-        ValueError: If image cannot be opened or parameters are invalid
+        ValueError: If parameters are invalid or the box is empty
     """
     # Validate inputs
     if ratio <= 0:
@@ -39,72 +45,99 @@ def process_crop(
     if zoom <= 0:
         raise ValueError(f"Invalid zoom factor: {zoom}")
     
-    with Image.open(image_path) as img:
-        img_w, img_h = img.size
-        
-        # Validate image dimensions
-        if img_w <= 0 or img_h <= 0:
-            raise ValueError(f"Invalid image dimensions: {img_w}x{img_h}")
-        
-        # Calculate display scale factor
-        # This is how Qt fits the image into the widget (KeepAspectRatio)
-        padding = 40
-        scale_fit = min(
-            (view_size.width() - padding) / img_w, 
-            (view_size.height() - padding) / img_h
+    img_w, img_h = image_size
+    
+    # Validate image dimensions
+    if img_w <= 0 or img_h <= 0:
+        raise ValueError(f"Invalid image dimensions: {img_w}x{img_h}")
+    
+    # Available view area (crop frame is fitted into it)
+    vw = view_size[0] - padding
+    vh = view_size[1] - padding
+    
+    if vw <= 0 or vh <= 0:
+        raise ValueError(f"Invalid view size: {view_size[0]}x{view_size[1]}")
+    
+    # Calculate display scale factor
+    # This is how Qt fits the image into the widget (KeepAspectRatio)
+    scale_fit = min(vw / img_w, vh / img_h)
+    
+    # Total scale includes both fit-to-window and user zoom
+    total_scale = scale_fit * zoom
+    
+    if total_scale <= 0:
+        raise ValueError(f"Invalid total scale: {total_scale}")
+    
+    # Calculate crop frame size in GUI coordinates
+    if vw / vh > ratio:
+        cw = vh * ratio
+        ch = vh
+    else:
+        cw = vw
+        ch = vw / ratio
+        
+    # Convert crop dimensions to original image pixels
+    crop_w_orig = cw / total_scale
+    crop_h_orig = ch / total_scale
+    
+    # Calculate crop center in original image coordinates
+    # Offset is inverted because GUI moves image, not crop frame
+    offset_x_orig = offset[0] / total_scale
+    offset_y_orig = offset[1] / total_scale
+    
+    center_x = img_w / 2 - offset_x_orig
+    center_y = img_h / 2 - offset_y_orig
+    
+    # Calculate crop box coordinates (left, top, right, bottom)
+    left = center_x - crop_w_orig / 2
+    top = center_y - crop_h_orig / 2
+    right = center_x + crop_w_orig / 2
+    bottom = center_y + crop_h_orig / 2
+    
+    # Clamp to image boundaries to avoid errors
+    left = max(0, left)
+    top = max(0, top)
+    right = min(img_w, right)
+    bottom = min(img_h, bottom)
+    
+    # Validate crop box
+    if right <= left or bottom <= top:
+        raise ValueError(
+            f"Invalid crop box: ({left}, {top}, {right}, {bottom})"
         )
+    
+    return (left, top, right, bottom)
+
+
+def centered_crop_box(image_size: Tuple[int, int], ratio: float) -> Tuple[int, int, int, int]:
+    """
+    Largest crop box with the given aspect ratio, centered in the image
+    
+    Args:
+        image_size (Tuple[int, int]): Original image (width, height)
+        ratio (float): Target aspect ratio (width/height)
         
-        # Total scale includes both fit-to-window and user zoom
-        total_scale = scale_fit * zoom
-        
-        if total_scale <= 0:
-            raise ValueError(f"Invalid total scale: {total_scale}")
-        
-        # Calculate crop frame size in GUI coordinates
-        vw = view_size.width() - padding
-        vh = view_size.height() - padding
-        
-        if vw / vh > ratio:
-            cw = vh * ratio
-            ch = vh
-        else:
-            cw = vw
-            ch = vw / ratio
-            
-        # Convert crop dimensions to original image pixels
-        crop_w_orig = cw / total_scale
-        crop_h_orig = ch / total_scale
-        
-        # Calculate crop center in original image coordinates
-        # Offset is inverted because GUI moves image, not crop frame
-        offset_x_orig = offset.x() / total_scale
-        offset_y_orig = offset.y() / total_scale
-        
-        center_x = img_w / 2 - offset_x_orig
-        center_y = img_h / 2 - offset_y_orig
-        
-        # Calculate crop box coordinates (left, top, right, bottom)
-        left = center_x - crop_w_orig / 2
-        top = center_y - crop_h_orig / 2
-        right = center_x + crop_w_orig / 2
-        bottom = center_y + crop_h_orig / 2
-        
-        # Clamp to image boundaries to avoid errors
-        left = max(0, left)
-        top = max(0, top)
-        right = min(img_w, right)
-        bottom = min(img_h, bottom)
-        
-        # Validate crop box
-        if right <= left or bottom <= top:
-            raise ValueError(
-                f"Invalid crop box: ({left}, {top}, {right}, {bottom})"
-            )
-        
-        # Perform crop
-        cropped_img = img.crop((left, top, right, bottom))
+    Returns:
+        Tuple[int, int, int, int]: (left, top, right, bottom)
         
-        return cropped_img
+    Raises:
+        ValueError: If ratio or image dimensions are invalid
+    """
+    if ratio <= 0:
+        raise ValueError(f"Invalid aspect ratio: {ratio}")
+    
+    img_w, img_h = image_size
+    if img_w <= 0 or img_h <= 0:
+        raise ValueError(f"Invalid image dimensions: {img_w}x{img_h}")
+    
+    if img_w / img_h > ratio:
+        crop_w, crop_h = img_h * ratio, img_h
+    else:
+        crop_w, crop_h = img_w, img_w / ratio
+    
+    left = round((img_w - crop_w) / 2)
+    top = round((img_h - crop_h) / 2)
+    return (left, top, left + round(crop_w), top + round(crop_h))
 
 
 def validate_image_file(file_path: str) -> Tuple[bool, str]:
@@ -118,7 +151,7 @@ def validate_image_file(file_path: str) -> Tuple[bool, str]:
         Tuple[bool, str]: (is_valid, error_message)
     """
     try:
-        with Image.open(file_path) as img:
+        with open_image(file_path) as img:
             img.verify()
         return True, ""
     except FileNotFoundError:
@@ -0,0 +1,241 @@
+"""
+Export Module - Encode results with per-format encoder settings
+
+Presets bundle Pillow encoder options per format; explicit parameters
+override them. encode_image() encodes to memory (the "encode" step of
+edit_graph, whose result is memoized); write_file() and export_image()
+write through a temporary file, so a failed export never leaves a
+half-written result. Stages are reported to an optional progress
+callback. The GUI runs exports on a worker thread, batch inside its
+worker processes.
+"""
+
+import io
+import os
+from typing import Callable, Dict, Optional
+
+from PIL import Image
+
+
+# File extensions -> Pillow format names
+EXPORT_FORMATS = {
+    "jpg": "JPEG",
+    "jpeg": "JPEG",
+    "png": "PNG",
+    "webp": "WEBP",
+    "gif": "GIF",
+}
+
+# Encoder options per preset and format. "default" is Pillow's own
+# behaviour; see benchmarks/bench_export.py for time vs size.
+PRESETS = {
+    "default": {"JPEG": {}, "PNG": {}, "WEBP": {}, "GIF": {}},
+    "fast": {
+        "JPEG": {},  # Pillow's defaults are already its fastest JPEG setting
+        "PNG": {"compress_level": 1},
+        "WEBP": {"quality": 85, "method": 0},
+        "GIF": {},
+    },
+    "smallest": {
+        "JPEG": {"quality": 75, "optimize": True, "progressive": True},
+        "PNG": {"optimize": True},
+        "WEBP": {"quality": 75, "method": 6},
+        "GIF": {"optimize": True},
+    },
+}
+
+DEFAULT_PRESET = "default"
+
+# Encoder options that may be set per format (others are dropped)
+ENCODER_OPTIONS = {
+    "JPEG": ("quality", "optimize", "progressive", "subsampling"),
+    "PNG": ("compress_level", "optimize"),
+    "WEBP": ("quality", "method", "lossless"),
+    "GIF": ("optimize",),
+}
+
+# Pillow's own values for the options a preset may leave unset
+DEFAULT_OPTIONS = {
+    "JPEG": {"quality": 75},
+    "PNG": {"compress_level": 6},
+    "WEBP": {"quality": 80, "lossless": False},
+    "GIF": {},
+}
+
+# Modes each format stores as is (others are converted first; GIF
+# quantizes anything else itself, palette images stay as they are)
+_FORMAT_MODES = {
+    "JPEG": ("RGB", "L", "CMYK"),
+    "PNG": ("RGB", "RGBA", "L", "LA", "P", "1", "I", "I;16"),
+    "WEBP": ("RGB", "RGBA"),
+}
+
+# Share of the progress bar taken by preparing the pixels (rest = encoding)
+_PREPARE_SHARE = 0.1
+
+ProgressCallback = Callable[[float, str], None]
+
+
+def format_for_path(path: str) -> str:
+    """
+    Return the Pillow format name for a file name
+
+    Formats other than EXPORT_FORMATS (e.g. BMP, TIFF kept by batch) are
+    looked up in Pillow's registry; they are saved with Pillow's defaults.
+
+    Raises:
+        ValueError: If Pillow cannot write the extension
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext.lstrip(".") in EXPORT_FORMATS:
+        return EXPORT_FORMATS[ext.lstrip(".")]
+
+    # Loads all Pillow plugins, so only for the less common formats
+    fmt = Image.registered_extensions().get(ext)
+    if fmt is None or fmt not in Image.SAVE:
+        raise ValueError(f"Unsupported export format: '{ext}'")
+    return fmt
+
+
+def encoder_params(fmt: str, preset: str = DEFAULT_PRESET, **overrides) -> Dict[str, object]:
+    """
+    Build the Pillow save() options for a format
+
+    Args:
+        fmt (str): Pillow format name ("JPEG", "PNG", "WEBP", ...)
+        preset (str): Name in PRESETS
+        **overrides: Options replacing the preset's, e.g. quality=90,
+                     compress_level=6, lossless=True. None values and
+                     options the format does not take (ENCODER_OPTIONS)
+                     are ignored, so one set of settings serves all formats.
+
+    Returns:
+        Dict[str, object]: Options for PIL.Image.save
+
+    Raises:
+        ValueError: If the preset is unknown
+    """
+    if preset not in PRESETS:
+        raise ValueError(f"Unknown preset: '{preset}' (use {', '.join(PRESETS)})")
+
+    params = dict(PRESETS[preset].get(fmt, {}))
+    allowed = ENCODER_OPTIONS.get(fmt, ())
+    params.update({
+        key: value for key, value in overrides.items()
+        if value is not None and key in allowed
+    })
+    return params
+
+
+def prepare_for_format(image: Image.Image, fmt: str) -> Image.Image:
+    """
+    Convert an image to a mode the format can store
+
+    Args:
+        image (PIL.Image): Image to export
+        fmt (str): Pillow format name
+
+    Returns:
+        PIL.Image: image itself, or a converted copy
+    """
+    if image.mode in _FORMAT_MODES.get(fmt, (image.mode,)):
+        return image
+    if fmt == "JPEG":
+        # No alpha channel or palette support
+        return image.convert("L" if image.mode in ("1", "LA", "I;16") else "RGB")
+    has_alpha = "A" in image.getbands() or "transparency" in image.info
+    return image.convert("RGBA" if has_alpha else "RGB")
+
+
+def encode_image(
+    image,
+    fmt: str,
+    params: Optional[Dict[str, object]] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> bytes:
+    """
+    Encode an image to memory
+
+    Args:
+        image: PIL Image or PixelGrid (upscaled to full size here)
+        fmt (str): Pillow format name
+        params (Dict[str, object]): Encoder options (see encoder_params;
+                                    default: the default preset)
+        progress (Callable): Called as progress(fraction, stage) when a
+                             stage starts (up to, not including, 1.0)
+
+    Returns:
+        bytes: The encoded file
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    if params is None:
+        params = encoder_params(fmt)
+
+    if progress is not None:
+        progress(0.0, "Preparing")
+    if not isinstance(image, Image.Image):
+        image = image.to_image()
+    image = prepare_for_format(image, fmt)
+
+    if progress is not None:
+        progress(_PREPARE_SHARE, "Encoding")
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, **params)
+    return buffer.getvalue()
+
+
+def write_file(data: bytes, path: str) -> int:
+    """
+    Write an encoded file through a temporary file
+
+    Returns:
+        int: Size of the written file in bytes
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    temp_path = f"{path}.part"
+    try:
+        with open(temp_path, "wb") as fp:
+            fp.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return len(data)
+
+
+def export_image(
+    image,
+    path: str,
+    fmt: Optional[str] = None,
+    params: Optional[Dict[str, object]] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> int:
+    """
+    Encode and write an image
+
+    Args:
+        image: PIL Image or PixelGrid (upscaled to full size here)
+        path (str): Destination file
+        fmt (str): Pillow format name (default: from the file extension)
+        params (Dict[str, object]): Encoder options (see encoder_params;
+                                    default: the default preset)
+        progress (Callable): Called as progress(fraction, stage) when a
+                             stage starts and once more with 1.0 at the end
+
+    Returns:
+        int: Size of the written file in bytes
+
+    Raises:
+        ValueError: If the format is not supported
+        OSError: If the file cannot be written
+    """
+    data = encode_image(image, fmt or format_for_path(path), params, progress)
+    size = write_file(data, path)
+    if progress is not None:
+        progress(1.0, "Done")
+    return size
\ No newline at end of file
@@ -2,7 +2,7 @@
 GUI Layout - Main window interface for Image2Pixel
 """
 
-from PyQt6 import QtWidgets, QtCore
+from PyQt6 import QtWidgets, QtCore, QtGui
 from display_image import ImageDisplay
 
 
@@ -22,6 +22,33 @@ class SimpleAppGui(QtWidgets.QMainWindow):
     PIXEL_MIN = 0
     PIXEL_MAX = 200
     
+    # Block color choices -> pixel_transform reducers
+    REDUCER_CHOICES = {
+        "Average": "mean",
+        "Median": "median",
+        "Dominant Color": "mode",
+    }
+    
+    # Palette choices -> (colors, palette) for pixel_transform.reduce_palette
+    PALETTE_CHOICES = {
+        "Full Color": (None, None),
+        "64 Colors": (64, None),
+        "16 Colors": (16, None),
+        "4 Colors": (4, None),
+        "PICO-8": (None, "pico-8"),
+        "Game Boy": (None, "gameboy"),
+    }
+    
+    # Dither choices -> pixel_transform dither names
+    DITHER_CHOICES = {
+        "No Dither": None,
+        "Ordered Dither": "ordered",
+        "Error Diffusion": "diffusion",
+    }
+    
+    # Export presets (names in export.PRESETS)
+    EXPORT_PRESETS = ["Default", "Fast", "Smallest"]
+    
     def __init__(self):
         super().__init__()
         self._setup_window()
@@ -44,6 +71,14 @@ class SimpleAppGui(QtWidgets.QMainWindow):
         self.btn_reset = QtWidgets.QPushButton("🔄 Reset All")
         self.btn_reset.setStyleSheet("color: #c0392b; font-weight: bold;")
         
+        # History (Ctrl+Z / Ctrl+Shift+Z or Ctrl+Y, per platform)
+        self.btn_undo = QtWidgets.QPushButton("↶ Undo")
+        self.btn_undo.setShortcut(QtGui.QKeySequence(QtGui.QKeySequence.StandardKey.Undo))
+        self.btn_undo.setEnabled(False)
+        self.btn_redo = QtWidgets.QPushButton("↷ Redo")
+        self.btn_redo.setShortcut(QtGui.QKeySequence(QtGui.QKeySequence.StandardKey.Redo))
+        self.btn_redo.setEnabled(False)
+        
         # Crop controls
         self._create_crop_widgets()
         
@@ -65,6 +100,13 @@ class SimpleAppGui(QtWidgets.QMainWindow):
             font-family: 'Consolas', 'Monaco', monospace;
             border-bottom-right-radius: 5px;
         """)
+        
+        # Busy indicator (indeterminate) shown while background jobs run
+        self.busy_bar = QtWidgets.QProgressBar()
+        self.busy_bar.setRange(0, 0)
+        self.busy_bar.setTextVisible(False)
+        self.busy_bar.setMaximumWidth(120)
+        self.busy_bar.setVisible(False)
 
     def _create_crop_widgets(self):
         """Create crop-related widgets"""
@@ -118,22 +160,101 @@ class SimpleAppGui(QtWidgets.QMainWindow):
             "Higher values = more pixelated effect"
         )
         
+        # How each block becomes one color
+        self.combo_reducer = QtWidgets.QComboBox()
+        self.combo_reducer.addItems(list(self.REDUCER_CHOICES))
+        self.combo_reducer.setToolTip(
+            "Average blends each block; Median and Dominant Color keep\n"
+            "crisp, flat colors on pixel art and high-contrast images."
+        )
+        
+        # Averaging in linear light (Average only)
+        self.check_linear = QtWidgets.QCheckBox("Linear Light")
+        self.check_linear.setToolTip(
+            "Average block colors in linear light: fine high-contrast\n"
+            "detail keeps its brightness instead of turning dark."
+        )
+        
+        # Palette reduction of the pixel grid
+        self.combo_palette = QtWidgets.QComboBox()
+        self.combo_palette.addItems(list(self.PALETTE_CHOICES))
+        self.combo_palette.setToolTip(
+            "Limit the pixelated image to a few colors or a retro palette.\n"
+            "Saves as small indexed PNG/GIF."
+        )
+        
+        self.combo_dither = QtWidgets.QComboBox()
+        self.combo_dither.addItems(list(self.DITHER_CHOICES))
+        self.combo_dither.setEnabled(False)
+        self.combo_dither.setToolTip(
+            "Smooth gradients of reduced palettes.\n"
+            "Ordered = regular pattern, Error Diffusion = organic noise."
+        )
+        
+        # Live preview while dragging
+        self.check_live_preview = QtWidgets.QCheckBox("Live Preview")
+        self.check_live_preview.setChecked(True)
+        self.check_live_preview.setToolTip(
+            "Preview pixelation while dragging the slider.\n"
+            "Full resolution is computed on Apply or Save."
+        )
+        
         # Apply button
         self.btn_pixel_apply = QtWidgets.QPushButton("👾 Apply Pixelation")
         
         # Add to layout
         pixel_layout.addWidget(self.label_pixel)
         pixel_layout.addWidget(self.slider_pixel)
+        pixel_layout.addWidget(QtWidgets.QLabel("Block Color:"))
+        pixel_layout.addWidget(self.combo_reducer)
+        pixel_layout.addWidget(self.check_linear)
+        pixel_layout.addWidget(QtWidgets.QLabel("Palette:"))
+        pixel_layout.addWidget(self.combo_palette)
+        pixel_layout.addWidget(self.combo_dither)
+        pixel_layout.addWidget(self.check_live_preview)
         pixel_layout.addWidget(self.btn_pixel_apply)
         
         self.group_pixel.setLayout(pixel_layout)
 
     def _create_save_widgets(self):
         """Create save/export widgets"""
+        self.group_save = QtWidgets.QGroupBox("Export")
+        save_layout = QtWidgets.QFormLayout()
+        
         self.combo_ext = QtWidgets.QComboBox()
-        self.combo_ext.addItems(["JPG", "PNG", "WebP"])
+        self.combo_ext.addItems(["JPG", "PNG", "WebP", "GIF"])
         self.combo_ext.setCurrentIndex(1)  # Default to PNG
         
+        # Encoder settings: a preset fills in the per-format options below
+        self.combo_preset = QtWidgets.QComboBox()
+        self.combo_preset.addItems(self.EXPORT_PRESETS)
+        self.combo_preset.setToolTip(
+            "Fast: quickest encoding, larger files.\n"
+            "Smallest: slower encoding, smallest files."
+        )
+        
+        self.spin_quality = QtWidgets.QSpinBox()
+        self.spin_quality.setRange(1, 100)
+        self.spin_quality.setToolTip("JPG / WebP quality")
+        
+        self.spin_compress_level = QtWidgets.QSpinBox()
+        self.spin_compress_level.setRange(0, 9)
+        self.spin_compress_level.setToolTip("PNG compression: 0 = fastest, 9 = smallest")
+        
+        self.check_lossless = QtWidgets.QCheckBox("Lossless")
+        self.check_lossless.setToolTip(
+            "WebP lossless: usually much smaller for pixelated images,\n"
+            "much larger for photos"
+        )
+        
+        save_layout.addRow("Format:", self.combo_ext)
+        save_layout.addRow("Preset:", self.combo_preset)
+        save_layout.addRow("Quality:", self.spin_quality)
+        save_layout.addRow("Compression:", self.spin_compress_level)
+        save_layout.addRow(self.check_lossless)
+        
+        self.group_save.setLayout(save_layout)
+        
         self.btn_save = QtWidgets.QPushButton("💾 Save Result")
         self.btn_save.setStyleSheet(
             "background: #27ae60; color: white; font-weight: bold; padding: 8px;"
@@ -146,19 +267,26 @@ class SimpleAppGui(QtWidgets.QMainWindow):
         
         left_panel.addWidget(self.btn_load)
         left_panel.addWidget(self.btn_reset)
+        history_layout = QtWidgets.QHBoxLayout()
+        history_layout.addWidget(self.btn_undo)
+        history_layout.addWidget(self.btn_redo)
+        left_panel.addLayout(history_layout)
         left_panel.addSpacing(10)
         left_panel.addWidget(self.group_crop)
         left_panel.addSpacing(10)
         left_panel.addWidget(self.group_pixel)
         left_panel.addStretch()
-        left_panel.addWidget(QtWidgets.QLabel("Save Format:"))
-        left_panel.addWidget(self.combo_ext)
+        left_panel.addWidget(self.group_save)
         left_panel.addWidget(self.btn_save)
 
         # Right panel - image display
         right_layout = QtWidgets.QVBoxLayout()
         right_layout.addWidget(self.image_display, 1)
-        right_layout.addWidget(self.info_label)
+        
+        status_layout = QtWidgets.QHBoxLayout()
+        status_layout.addWidget(self.info_label, 1)
+        status_layout.addWidget(self.busy_bar)
+        right_layout.addLayout(status_layout)
 
         # Combine panels (1:4 ratio)
         self.main_layout.addLayout(left_panel, 1)
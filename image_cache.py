@@ -0,0 +1,259 @@
+"""
+Image Cache Module - Shared cache of decoded images
+
+Decoding a large photo costs far more than cropping or pixelating it, so the
+application decodes each file once and reuses the pixels for loading, crop
+and reset. Entries are keyed by (path, file size, mtime), so an edited file
+is decoded again.
+
+ResultMemo keeps computed results (PixelGrid, images, encoded files) so
+going back to earlier settings is free; edit_graph gives every operation
+of the editing pipeline one.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+from PIL import Image
+
+from image_io import open_image
+
+
+# Default byte budget of the shared cache
+DEFAULT_CACHE_BYTES = 512 * 1024 * 1024
+
+# Default byte budget of a ResultMemo
+DEFAULT_MEMO_BYTES = 64 * 1024 * 1024
+
+# ResultMemo evicts the largest of this many least recently used entries
+MEMO_EVICTION_WINDOW = 4
+
+CacheKey = Tuple[str, int, int]
+
+
+def image_nbytes(image: Image.Image) -> int:
+    """Approximate memory held by a decoded image (Pillow stores 8-bit bands in 4-byte pixels)"""
+    if image.mode in ("1", "L", "P"):
+        pixel_bytes = 1
+    elif image.mode.startswith("I;16"):
+        pixel_bytes = 2
+    else:
+        pixel_bytes = 4
+    return image.width * image.height * pixel_bytes
+
+
+def result_nbytes(value) -> int:
+    """Approximate memory held by a memoized value (PIL Image, bytes, or anything with nbytes)"""
+    if isinstance(value, Image.Image):
+        return image_nbytes(value)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return value.nbytes
+
+
+class DecodedImageCache:
+    """
+    LRU cache of decoded images with a byte budget
+    
+    Returned images are shared between callers and must be treated as
+    read-only (crop, copy or convert them instead of drawing on them).
+    Images larger than the whole budget are returned but not kept.
+    
+    Attributes:
+        max_bytes (int): Byte budget
+        hits (int): Lookups answered from the cache
+        misses (int): Lookups that decoded the file
+    """
+    
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        if max_bytes < 0:
+            raise ValueError(f"max_bytes must be >= 0, got {max_bytes}")
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key_for(image_path: str) -> CacheKey:
+        """
+        Build the cache key of a file
+        
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+        """
+        stat = os.stat(image_path)
+        return (os.path.abspath(image_path), stat.st_size, stat.st_mtime_ns)
+    
+    def get(self, image_path: str) -> Image.Image:
+        """
+        Return the decoded image for a file, decoding it on a miss
+        
+        Args:
+            image_path (str): Path to the image file
+            
+        Returns:
+            PIL.Image: Fully decoded image (shared, read-only)
+            
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            PIL.UnidentifiedImageError: If the file is not a supported image
+            OSError: If the image data is truncated or corrupt
+        """
+        key = self.key_for(image_path)
+        with self._lock:
+            image = self._entries.get(key)
+            if image is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return image
+            self.misses += 1
+        
+        # Decode outside the lock so other files can be served meanwhile
+        with open_image(image_path) as img:
+            img.load()
+            # Memory-mapped results point into the file, detach them
+            image = img.copy() if img.readonly else img
+        
+        self._store(key, image)
+        return image
+    
+    def _store(self, key: CacheKey, image: Image.Image):
+        size = image_nbytes(image)
+        if size > self.max_bytes:
+            return
+        
+        with self._lock:
+            if key in self._entries:
+                return
+            # Drop older versions of the same file
+            for stale in [k for k in self._entries if k[0] == key[0]]:
+                self._nbytes -= image_nbytes(self._entries.pop(stale))
+            
+            while self._entries and self._nbytes + size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= image_nbytes(evicted)
+            
+            self._entries[key] = image
+            self._nbytes += size
+    
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by cached images"""
+        return self._nbytes
+    
+    def stats(self) -> dict:
+        """Return hit/miss counters and usage"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._nbytes,
+                "max_bytes": self.max_bytes,
+            }
+    
+    def clear(self):
+        """Drop all cached images (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+    
+    def __contains__(self, image_path: str) -> bool:
+        """True if the current version of the file is cached"""
+        try:
+            key = self.key_for(image_path)
+        except OSError:
+            return False
+        with self._lock:
+            return key in self._entries
+    
+    def __len__(self):
+        return len(self._entries)
+
+
+class ResultMemo:
+    """
+    Memo of computed results (e.g. PixelGrid) with a byte budget
+    
+    When the budget is exceeded, the largest of the MEMO_EVICTION_WINDOW
+    least recently used entries is evicted first, so one big result does
+    not push out many small ones. Values are sized with result_nbytes.
+    
+    Attributes:
+        max_bytes (int): Byte budget
+        hits (int): Lookups answered from the memo
+        misses (int): Lookups that found nothing
+    """
+    
+    def __init__(self, max_bytes: int = DEFAULT_MEMO_BYTES):
+        if max_bytes < 0:
+            raise ValueError(f"max_bytes must be >= 0, got {max_bytes}")
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[object]:
+        """Return the memoized value for key, or None"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key: Hashable, value):
+        """Store a value (values larger than the whole budget are not kept)"""
+        size = result_nbytes(value)
+        if size > self.max_bytes:
+            return
+        
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._nbytes -= result_nbytes(old)
+            
+            while self._entries and self._nbytes + size > self.max_bytes:
+                oldest = list(self._entries)[:MEMO_EVICTION_WINDOW]
+                victim = max(oldest, key=lambda k: result_nbytes(self._entries[k]))
+                self._nbytes -= result_nbytes(self._entries.pop(victim))
+            
+            self._entries[key] = value
+            self._nbytes += size
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory held by memoized values"""
+        return self._nbytes
+    
+    def stats(self) -> dict:
+        """Return hit/miss counters and usage"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._nbytes,
+                "max_bytes": self.max_bytes,
+            }
+    
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+    
+    def __len__(self):
+        return len(self._entries)
+
+
+# Decoded sources shared by the GUI and its edit graph (edit_graph.load_decoded)
+decoded_images = DecodedImageCache()
\ No newline at end of file
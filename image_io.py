@@ -0,0 +1,428 @@
+"""
+Image I/O Module - Qt-free image loading helpers
+
+Only the Pillow plugins for the formats the application accepts are
+imported, so worker processes do not pay for Pillow's full plugin scan.
+BandReader/BandWriter move very large images through memory in row bands.
+"""
+
+import importlib
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from PIL import Image
+
+
+# Formats accepted by the application, mapped to their Pillow plugin modules
+# (TIFF and PPM are the usual containers for very large scans)
+SUPPORTED_FORMATS = {
+    "JPEG": "JpegImagePlugin",
+    "PNG": "PngImagePlugin",
+    "WEBP": "WebPImagePlugin",
+    "BMP": "BmpImagePlugin",
+    "TIFF": "TiffImagePlugin",
+    "PPM": "PpmImagePlugin",
+}
+
+# EXIF tag holding the orientation (1 = stored upright)
+EXIF_ORIENTATION = 0x0112
+
+_plugins_loaded = False
+
+
+def _load_plugins():
+    """Register the Pillow plugins for SUPPORTED_FORMATS (once)"""
+    global _plugins_loaded
+    if _plugins_loaded:
+        return
+
+    for module in SUPPORTED_FORMATS.values():
+        try:
+            importlib.import_module(f"PIL.{module}")
+        except ImportError:
+            # e.g. Pillow built without WebP support
+            pass
+    _plugins_loaded = True
+
+
+def open_image(image_path: str) -> Image.Image:
+    """
+    Open an image file lazily (header only), restricted to supported formats
+
+    Args:
+        image_path (str): Path to the image file
+
+    Returns:
+        PIL.Image: Opened (not yet decoded) image
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        PIL.UnidentifiedImageError: If the file is not a supported image
+    """
+    _load_plugins()
+    formats = [fmt for fmt in SUPPORTED_FORMATS if fmt in Image.OPEN]
+    return Image.open(image_path, formats=formats)
+
+
+def open_draft(image_path: str, min_size: Tuple[int, int]) -> Tuple[Image.Image, Tuple[float, float]]:
+    """
+    Open an image, letting JPEG decode at 1/2, 1/4 or 1/8 scale
+    
+    JPEG files are scaled in the DCT domain (Image.draft) to the smallest
+    size that is still at least min_size; other formats open at full size.
+    
+    Args:
+        image_path (str): Path to the image file
+        min_size (Tuple[int, int]): Minimum decoded (width, height)
+        
+    Returns:
+        Tuple[PIL.Image, Tuple[float, float]]: (opened image, (x, y) factor
+        from decoded to original coordinates)
+    """
+    img = open_image(image_path)
+    full_w, full_h = img.size
+    if img.format == "JPEG":
+        img.draft(img.mode, (max(1, min_size[0]), max(1, min_size[1])))
+    return img, (full_w / img.width, full_h / img.height)
+
+
+@dataclass
+class ImageHeader:
+    """Image properties known without decoding the pixels"""
+
+    size: Tuple[int, int]
+    mode: str
+    format: str
+    orientation: int = 1  # EXIF orientation (not applied by the application)
+
+
+def read_header(image_path: str) -> ImageHeader:
+    """
+    Read size, mode, format and EXIF orientation of an image file
+
+    Only the header is parsed; the pixels are not decoded.
+
+    Args:
+        image_path (str): Path to the image file
+
+    Returns:
+        ImageHeader: Header properties
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        PIL.UnidentifiedImageError: If the file is not a supported image
+    """
+    with open_image(image_path) as img:
+        orientation = 1
+        # PNG looks for a late eXIf chunk by decoding the whole image
+        if img.format != "PNG" or "exif" in img.info:
+            try:
+                orientation = int(img.getexif().get(EXIF_ORIENTATION, 1))
+            except (ValueError, TypeError, OSError):
+                pass  # Corrupt EXIF: treat as upright
+        return ImageHeader(img.size, img.mode, img.format, orientation)
+
+
+def decode_preview(image_path: str, max_size: Tuple[int, int]) -> Optional[Image.Image]:
+    """
+    Quickly decode a coarse preview that fits max_size
+    
+    Only formats with reduced-scale decoding (JPEG, via Image.draft) give a
+    preview; for the others it would cost a full decode, so None is returned.
+    
+    Args:
+        image_path (str): Path to the image file
+        max_size (Tuple[int, int]): Bounding (width, height) of the preview
+        
+    Returns:
+        PIL.Image or None: Preview with the aspect ratio of the full image
+    """
+    with open_image(image_path) as img:
+        if img.format != "JPEG":
+            return None
+        full_w, full_h = img.size
+        scale = min(max_size[0] / full_w, max_size[1] / full_h, 1.0)
+        size = (max(1, round(full_w * scale)), max(1, round(full_h * scale)))
+        # Coarse on purpose: half the preview size still allows the 1/8 scale
+        img.draft("RGB" if img.mode == "CMYK" else img.mode, (size[0] // 2 + 1, size[1] // 2 + 1))
+        # Draft sizes are rounded up to 1/8 steps, restore the exact aspect
+        return img.resize(size, Image.Resampling.BILINEAR)
+
+
+# Bytes per pixel of the raw layouts BandReader can slice directly
+_RAW_BYTES_PER_PIXEL = {
+    "L": 1, "P": 1, "LA": 2, "RGB": 3, "BGR": 3, "RGBX": 4, "BGRX": 4,
+    "RGBA": 4, "BGRA": 4, "RGBa": 4, "CMYK": 4, "I": 4, "F": 4,
+}
+
+# Streaming PNG color types per image mode (8 bits per channel)
+_PNG_COLOR_TYPES = {"L": (0, 1), "LA": (4, 2), "RGB": (2, 3), "RGBA": (6, 4)}
+
+# Compressed bytes collected before an IDAT chunk is written
+_PNG_IDAT_SIZE = 1 << 20
+
+
+def _replace_tile(tile, extents, offset, args):
+    """Copy a Pillow tile descriptor with new extents, offset and args"""
+    if hasattr(tile, "_replace"):
+        return tile._replace(extents=extents, offset=offset, args=args)
+    return (tile[0], extents, offset, args)
+
+
+class BandReader:
+    """
+    Read an image file as horizontal bands of rows
+    
+    Uncompressed single-tile files (PPM, BMP, raw TIFF) are sliced so each
+    band decodes only its own rows, and multi-strip files decode only the
+    strips a band overlaps. Other formats are decoded once on the first read
+    and then cropped.
+    
+    Pillow's decompression-bomb guard (PIL.Image.MAX_IMAGE_PIXELS) still
+    applies; raise it explicitly for trusted gigapixel inputs.
+    """
+    
+    def __init__(self, image_path: str):
+        self.path = image_path
+        with open_image(image_path) as img:
+            self.size = img.size
+            self.mode = img.mode
+            self.format = img.format
+            tiles = list(img.tile)
+        
+        self._raw_tile = None
+        self._strips = None
+        self._decoded = None
+        
+        width, height = self.size
+        if len(tiles) == 1 and tiles[0][0] == "raw" and tiles[0][1] == (0, 0, width, height):
+            args = tiles[0][3]
+            rawmode, stride, orientation = (
+                (args, 0, 1) if isinstance(args, str) else (tuple(args) + (0, 1))[:3]
+            )
+            if rawmode in _RAW_BYTES_PER_PIXEL:
+                stride = stride or width * _RAW_BYTES_PER_PIXEL[rawmode]
+                self._raw_tile = (tiles[0], rawmode, stride, orientation)
+        elif len(tiles) > 1 and all(t[1][0] == 0 and t[1][2] == width for t in tiles):
+            self._strips = sorted(tiles, key=lambda t: t[1][1])
+    
+    @property
+    def streaming(self) -> bool:
+        """True if bands are decoded independently (no full-image decode)"""
+        return self._raw_tile is not None or self._strips is not None
+    
+    def read_rows(self, top: int, bottom: int) -> Image.Image:
+        """
+        Decode rows [top, bottom) as a separate image
+        
+        Args:
+            top (int): First row (inclusive)
+            bottom (int): Last row (exclusive)
+            
+        Returns:
+            PIL.Image: Band of size (width, bottom - top)
+        """
+        width, height = self.size
+        if not 0 <= top < bottom <= height:
+            raise ValueError(f"Invalid row range: {top}..{bottom} of {height}")
+        
+        if self._raw_tile is not None:
+            tile, rawmode, stride, orientation = self._raw_tile
+            # Bottom-up files (BMP) store the last row first
+            first_row = top if orientation > 0 else height - bottom
+            return self._load_region(
+                (width, bottom - top),
+                [_replace_tile(
+                    tile, (0, 0, width, bottom - top),
+                    tile[2] + first_row * stride, (rawmode, stride, orientation)
+                )]
+            )
+        
+        if self._strips is not None:
+            used = [t for t in self._strips if t[1][1] < bottom and t[1][3] > top]
+            region_top = used[0][1][1]
+            region_bottom = used[-1][1][3]
+            region = self._load_region(
+                (width, region_bottom - region_top),
+                [_replace_tile(
+                    t, (0, t[1][1] - region_top, width, t[1][3] - region_top), t[2], t[3]
+                ) for t in used]
+            )
+            return region.crop((0, top - region_top, width, bottom - region_top))
+        
+        if self._decoded is None:
+            img = open_image(self.path)
+            img.load()
+            self._decoded = img.copy() if img.readonly else img
+        return self._decoded.crop((0, top, width, bottom))
+    
+    def _load_region(self, size, tiles) -> Image.Image:
+        """Decode only the given tiles into an image of the given size"""
+        img = open_image(self.path)
+        img._size = size
+        img.tile = tiles
+        img.load()
+        # Memory-mapped results point into the file, detach them
+        return img.copy() if img.readonly else img
+    
+    def close(self):
+        """Release the fully decoded fallback image, if any"""
+        self._decoded = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class BandWriter:
+    """
+    Write an image top to bottom, one band of rows at a time
+    
+    PNG (L, LA, RGB, RGBA) and PPM/PGM (L, RGB) rows go straight to the
+    file, so memory stays bounded by the band size. Other formats/modes are
+    assembled in memory and saved with Pillow on close. The file is written
+    as <path>.part and renamed on close, so a failed run never leaves a
+    half-written image (like export.write_file).
+    """
+    
+    def __init__(self, image_path: str, size, mode: str):
+        self.path = image_path
+        self.size = size
+        self.mode = mode
+        self._temp_path = f"{image_path}.part"
+        self._rows_written = 0
+        self._file = None
+        self._image = None
+        
+        ext = image_path.lower().rsplit(".", 1)[-1]
+        width, height = size
+        if ext == "png" and mode in _PNG_COLOR_TYPES:
+            color_type, channels = _PNG_COLOR_TYPES[mode]
+            self._kind = "png"
+            self._row_bytes = width * channels
+            self._file = open(self._temp_path, "wb")
+            self._file.write(b"\x89PNG\r\n\x1a\n")
+            self._write_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0))
+            self._zlib = zlib.compressobj()
+            self._pending = []
+            self._pending_size = 0
+            self._prev_row = None
+        elif ext in ("ppm", "pgm", "pnm") and mode in ("L", "RGB"):
+            self._kind = "ppm"
+            self._file = open(self._temp_path, "wb")
+            magic = b"P5" if mode == "L" else b"P6"
+            self._file.write(magic + f"\n{width} {height}\n255\n".encode("ascii"))
+        else:
+            self._kind = "pillow"
+            self._image = Image.new(mode, size)
+    
+    @property
+    def streaming(self) -> bool:
+        """True if rows are written to disk as they arrive"""
+        return self._image is None
+    
+    def write(self, band: Image.Image):
+        """
+        Append a band of rows below the previously written ones
+        
+        Args:
+            band (PIL.Image): Rows to write (same width and mode as the output)
+        """
+        if band.mode != self.mode or band.width != self.size[0]:
+            raise ValueError(
+                f"Band {band.mode} {band.size} does not match output "
+                f"{self.mode} {self.size}"
+            )
+        if self._rows_written + band.height > self.size[1]:
+            raise ValueError("Band exceeds output height")
+        
+        if self._kind == "png":
+            self._write_png_rows(band.tobytes())
+        elif self._kind == "ppm":
+            self._file.write(band.tobytes())
+        else:
+            self._image.paste(band, (0, self._rows_written))
+        self._rows_written += band.height
+    
+    def _write_png_rows(self, data: bytes):
+        """Filter and compress rows; identical consecutive rows use the Up filter"""
+        row_bytes = self._row_bytes
+        zero_row = b"\x02" + bytes(row_bytes)
+        parts = []
+        for start in range(0, len(data), row_bytes):
+            row = data[start:start + row_bytes]
+            parts.append(zero_row if row == self._prev_row else b"\x00" + row)
+            self._prev_row = row
+        
+        compressed = self._zlib.compress(b"".join(parts))
+        if compressed:
+            self._pending.append(compressed)
+            self._pending_size += len(compressed)
+        if self._pending_size >= _PNG_IDAT_SIZE:
+            self._flush_idat()
+    
+    def _flush_idat(self):
+        if self._pending:
+            self._write_chunk(b"IDAT", b"".join(self._pending))
+            self._pending = []
+            self._pending_size = 0
+    
+    def _write_chunk(self, kind: bytes, data: bytes):
+        self._file.write(struct.pack(">I", len(data)) + kind + data)
+        self._file.write(struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+    
+    def close(self):
+        """
+        Finish the file and move it into place
+        
+        Raises:
+            ValueError: If rows are missing or Pillow cannot write the extension
+        """
+        try:
+            if self._rows_written != self.size[1]:
+                raise ValueError(
+                    f"Only {self._rows_written} of {self.size[1]} rows were written"
+                )
+            if self._kind == "png":
+                self._pending.append(self._zlib.flush())
+                self._flush_idat()
+                self._write_chunk(b"IEND", b"")
+            elif self._kind == "pillow":
+                # The .part suffix hides the format from Pillow
+                ext = os.path.splitext(self.path)[1].lower()
+                fmt = Image.registered_extensions().get(ext)
+                if fmt is None:
+                    raise ValueError(f"Unsupported output format: '{ext}'")
+                self._image.save(self._temp_path, format=fmt)
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            os.replace(self._temp_path, self.path)
+        except BaseException:
+            self._discard()
+            raise
+        finally:
+            self._image = None
+    
+    def _discard(self):
+        """Close and delete the partial file"""
+        self._image = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._discard()
\ No newline at end of file
@@ -2,10 +2,1624 @@
 Pixelation Effect Module - Applies pixel art style transformations
 """
 
+import math
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
 from PIL import Image
 
+from image_io import BandReader, BandWriter, open_draft, open_image
+
+
+# Modes whose BOX resample can be split into independent row bands
+# ("1" and "P" are always resampled with NEAREST by Pillow)
+_BAND_MODES = {"L", "LA", "RGB", "RGBA", "RGBX", "CMYK", "YCbCr", "I", "F"}
+
+# Pillow resamples images with alpha in premultiplied form
+_PREMULTIPLIED_MODES = {"RGBA": "RGBa", "LA": "La"}
+
+# Target output rows per band in streaming mode
+DEFAULT_BAND_HEIGHT = 256
+
+# Bands per thread in multi-threaded mode (load balancing)
+_BANDS_PER_WORKER = 4
+
+# Modes _numpy_grid averages directly (8 bits per channel)
+_NUMPY_MODES = {"L", "LA", "RGB", "RGBA", "RGBX", "CMYK"}
+
+# How each grid pixel is computed from its block of source pixels
+REDUCERS = ("mean", "median", "mode")
+
+# Modes the median and mode reducers work in (others are converted)
+_RANK_MODES = {"L", "RGB", "RGBA"}
+
+# Bits of the quantized color key counted by the mode reducer, split
+# evenly over the channels (RGB: 16 levels per channel)
+_MODE_KEY_BITS = 12
+
+# Source pixels sorted at once by the median and mode reducers (bounds memory)
+_RANK_CHUNK_PIXELS = 1 << 22
+
+# Modes averaged in linear light directly (others are converted)
+_LINEAR_MODES = {"L", "RGB", "RGBA", "I;16"}
+
+# Linear-light values are 16-bit integers (0 = black, _LINEAR_MAX = white)
+_LINEAR_MAX = 65535
+
+# Alpha is reduced at this many times its scale in linear light, so the
+# rounded means keep their precision as weights
+_LINEAR_ALPHA_SCALE = 256
+
+# Source pixels kept per grid pixel when decoding/reducing early (see
+# reducing_gap); at 3 the grid is practically indistinguishable from exact
+DEFAULT_REDUCING_GAP = 3.0
+
+# Modes Image.reduce() averages correctly (alpha modes are not premultiplied)
+_REDUCE_MODES = _BAND_MODES - set(_PREMULTIPLIED_MODES)
+
+# One grid row and the output rows it expands to: (grid_row, top, bottom)
+GridRun = Tuple[int, int, int]
+
+RGB = Tuple[int, int, int]
+
+# Fixed palettes for reduce_palette()
+PALETTES = {
+    "pico-8": (
+        (0, 0, 0), (29, 43, 83), (126, 37, 83), (0, 135, 81),
+        (171, 82, 54), (95, 87, 79), (194, 195, 199), (255, 241, 232),
+        (255, 0, 77), (255, 163, 0), (255, 236, 39), (0, 228, 54),
+        (41, 173, 255), (131, 118, 156), (255, 119, 168), (255, 204, 170),
+    ),
+    "gameboy": ((15, 56, 15), (48, 98, 48), (139, 172, 15), (155, 188, 15)),
+}
+
+# Bits per channel indexing the nearest-color lookup table (64^3 entries)
+_LUT_BITS = 6
+
+# LUT entry of cells whose colors are not all nearest to the same palette
+# color (palettes have at most 255 colors, so it is never a real index)
+_LUT_AMBIGUOUS = 255
+
+# Grid pixels with less alpha become transparent in palette output
+_ALPHA_THRESHOLD = 128
+
+# Pixels per distance matrix when mapping to a palette without the LUT
+_NEAREST_CHUNK = 16384
+
+# Dithering for palette reduction (None = "none")
+DITHERS = ("none", "ordered", "diffusion")
+
+# Side of the Bayer threshold matrix used by ordered dithering
+_BAYER_SIZE = 8
+
+
+def _grid_size(size: Tuple[int, int], segments_count: int) -> Tuple[int, int]:
+    """
+    Calculate the pixel grid size for an image
+    
+    Width becomes segments_count, height scales proportionally.
+    
+    Args:
+        size (Tuple[int, int]): Image (width, height)
+        segments_count (int): Number of pixel segments along width
+        
+    Returns:
+        Tuple[int, int]: Grid (width, height)
+        
+    Raises:
+        ValueError: If the image dimensions are invalid
+    """
+    w, h = size
+    
+    if w <= 0 or h <= 0:
+        raise ValueError(f"Invalid image dimensions: {w}x{h}")
+    
+    aspect_ratio = h / w
+    small_w = segments_count
+    small_h = max(1, int(small_w * aspect_ratio))  # Ensure at least 1 pixel height
+    return small_w, small_h
+
+
+def _check_reducing_gap(reducing_gap: Optional[float]):
+    if reducing_gap is not None and reducing_gap < 1:
+        raise ValueError(f"reducing_gap must be >= 1, got {reducing_gap}")
+
+
+def min_source_size(
+    size: Tuple[int, int], 
+    segments_count: int, 
+    reducing_gap: float = DEFAULT_REDUCING_GAP
+) -> Tuple[int, int]:
+    """
+    Smallest source size that still pixelates within reducing_gap tolerance
+    
+    Args:
+        size (Tuple[int, int]): Full-resolution (width, height)
+        segments_count (int): Number of pixel segments along width
+        reducing_gap (float): Source pixels kept per grid pixel (>= 1)
+        
+    Returns:
+        Tuple[int, int]: Minimum (width, height), never above size
+    """
+    _check_reducing_gap(reducing_gap)
+    grid_w, grid_h = _grid_size(size, segments_count)
+    return (
+        min(size[0], math.ceil(grid_w * reducing_gap)),
+        min(size[1], math.ceil(grid_h * reducing_gap)),
+    )
+
+
+def _nearest_index_map(src_len: int, dst_len: int) -> array:
+    """
+    Source index picked for each destination position by a NEAREST resize
+    
+    The map is read back from Pillow itself (resizing a column of indices),
+    so it matches Pillow's rounding exactly.
+    
+    Args:
+        src_len (int): Source length along the axis
+        dst_len (int): Destination length along the axis
+        
+    Returns:
+        array: dst_len source indices
+    """
+    column = Image.frombytes("I", (1, src_len), array("i", range(src_len)).tobytes())
+    return array("i", column.resize((1, dst_len), Image.Resampling.NEAREST).tobytes())
+
+
+def _grid_runs(small_h: int, height: int) -> List[GridRun]:
+    """
+    Output rows covered by each grid row after the NEAREST upscale
+    
+    Args:
+        small_h (int): Grid height
+        height (int): Output height
+        
+    Returns:
+        List[GridRun]: (grid_row, top, bottom) runs, top to bottom
+    """
+    row_map = _nearest_index_map(small_h, height)
+    runs = []
+    top = 0
+    for y in range(1, height + 1):
+        if y == height or row_map[y] != row_map[top]:
+            runs.append((row_map[top], top, y))
+            top = y
+    return runs
+
+
+def _group_runs(runs: List[GridRun], band_height: int) -> List[List[GridRun]]:
+    """Split runs into bands of about band_height rows, on segment boundaries"""
+    bands = [[]]
+    for run in runs:
+        if bands[-1] and run[2] - bands[-1][0][1] > band_height:
+            bands.append([])
+        bands[-1].append(run)
+    return bands
+
+
+def _vertical_first(size: Tuple[int, int], grid_size: Tuple[int, int]) -> bool:
+    """
+    Whether image.resize(grid_size) runs its vertical pass first
+    
+    Mirrors Image.resize: images over 100 times taller than wide are
+    reduced vertically, then horizontally, which rounds differently from
+    the C resampler's horizontal-first order.
+    """
+    return size[1] > size[0] * 100 and grid_size[1] < size[1]
+
+
+class _StripReducer:
+    """
+    BOX-reduce an image supplied as row bands to its pixel grid
+    
+    Pillow's BOX resize runs a horizontal pass and then a vertical pass.
+    The horizontal pass is done per band into a (grid width x height) strip,
+    then a single vertical pass reduces the strip, which reproduces
+    image.resize(grid_size, BOX) bit for bit. Bands covering disjoint rows
+    may be added from different threads.
+    
+    For images Pillow reduces vertically first (see _vertical_first), the
+    bands are collected whole and reduced in one resize instead: such an
+    image is at most a hundredth as wide as it is tall.
+    """
+    
+    def __init__(self, size: Tuple[int, int], mode: str, grid_size: Tuple[int, int]):
+        self.mode = mode
+        self.grid_size = grid_size
+        self.whole = _vertical_first(size, grid_size)
+        if self.whole:
+            self.work_mode = mode
+            self.strip = Image.new(mode, size)
+            return
+        # An identity resize is a plain copy in Pillow (no premultiplied round trip)
+        self.work_mode = mode if grid_size == size else _PREMULTIPLIED_MODES.get(mode, mode)
+        self.strip = Image.new(self.work_mode, (grid_size[0], size[1]))
+    
+    def add(self, top: int, band: Image.Image):
+        """Horizontal pass for one band of rows starting at top"""
+        if self.whole:
+            self.strip.paste(band, (0, top))
+            return
+        if band.mode != self.work_mode:
+            band = band.convert(self.work_mode)
+        self.strip.paste(
+            band.resize((self.grid_size[0], band.height), Image.Resampling.BOX), 
+            (0, top)
+        )
+    
+    def add_rows(self, image: Image.Image, top: int, bottom: int):
+        """Horizontal pass for rows [top, bottom) of a full-size image"""
+        # Pillow would premultiply the whole image for an alpha mode resize
+        if self.whole or image.mode != self.work_mode or image.mode in _PREMULTIPLIED_MODES:
+            self.add(top, image.crop((0, top, image.width, bottom)))
+            return
+        # Reading the rows in place avoids a crop copy; the vertical part
+        # of a 1:1 box resize is an exact identity
+        self.strip.paste(
+            image.resize(
+                (self.grid_size[0], bottom - top), Image.Resampling.BOX,
+                box=(0, top, image.width, bottom)
+            ),
+            (0, top)
+        )
+    
+    def finish(self) -> Image.Image:
+        """Vertical pass over the strip, returns the pixel grid"""
+        # The collected image when whole: the same resize as the serial path
+        grid = self.strip.resize(self.grid_size, Image.Resampling.BOX)
+        return grid.convert(self.mode) if self.work_mode != self.mode else grid
+
+
+def _paste_runs(target: Image.Image, grid: Image.Image, runs: List[GridRun], top: int = 0):
+    """
+    NEAREST-expand grid rows into target (run rows are shifted up by top)
+    
+    Args:
+        target (PIL.Image): Full-width image receiving the expanded rows
+        grid (PIL.Image): The pixel grid
+        runs (List[GridRun]): Runs to expand
+        top (int): Output row that maps to target row 0
+    """
+    width = target.width
+    for grid_row, run_top, run_bottom in runs:
+        row = grid.crop((0, grid_row, grid.width, grid_row + 1))
+        target.paste(
+            row.resize((width, run_bottom - run_top), Image.Resampling.NEAREST),
+            (0, run_top - top)
+        )
+
+
+def _expand_band(grid: Image.Image, width: int, runs: List[GridRun]) -> Image.Image:
+    """
+    NEAREST-expand the grid rows of one band to full resolution
+    
+    Args:
+        grid (PIL.Image): The pixel grid
+        width (int): Output width
+        runs (List[GridRun]): Consecutive runs making up the band
+        
+    Returns:
+        PIL.Image: Output rows runs[0].top .. runs[-1].bottom
+    """
+    top = runs[0][1]
+    band = Image.new(grid.mode, (width, runs[-1][2] - top))
+    _paste_runs(band, grid, runs, top)
+    return band
+
+
+def _thread_bands(grid_h: int, height: int, workers: int) -> List[List[GridRun]]:
+    """Segment-aligned bands for the thread pool (a few per worker for load balancing)"""
+    band_height = max(1, -(-height // (workers * _BANDS_PER_WORKER)))
+    return _group_runs(_grid_runs(grid_h, height), band_height)
+
+
+def _reduce_threaded(image: Image.Image, grid_size: Tuple[int, int], workers: int) -> Image.Image:
+    """
+    Tile-parallel BOX reduction (bit-identical to image.resize(grid_size, BOX))
+    
+    Bands aligned to segment boundaries are reduced on a thread pool;
+    Pillow releases the GIL inside resize, crop and paste. Images Pillow
+    reduces vertically first (see _vertical_first) take the serial resize.
+    
+    Args:
+        image (PIL.Image): Source image (mode in _BAND_MODES)
+        grid_size (Tuple[int, int]): Grid (width, height)
+        workers (int): Number of threads
+        
+    Returns:
+        PIL.Image: The pixel grid
+    """
+    if _vertical_first(image.size, grid_size):
+        return image.resize(grid_size, Image.Resampling.BOX)
+    
+    # Decode lazily opened files once, before threads read from them
+    image.load()
+    
+    bands = _thread_bands(grid_size[1], image.height, workers)
+    reducer = _StripReducer(image.size, image.mode, grid_size)
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda runs: reducer.add_rows(image, runs[0][1], runs[-1][2]), bands))
+    
+    return reducer.finish()
+
+
+def _expand_threaded(grid: Image.Image, size: Tuple[int, int], workers: int) -> Image.Image:
+    """
+    Tile-parallel NEAREST upscale (bit-identical to grid.resize(size, NEAREST))
+    
+    Args:
+        grid (PIL.Image): The pixel grid
+        size (Tuple[int, int]): Output (width, height)
+        workers (int): Number of threads
+        
+    Returns:
+        PIL.Image: Pixelated image at full resolution
+    """
+    bands = _thread_bands(grid.height, size[1], workers)
+    pixelated = Image.new(grid.mode, size)
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda runs: _paste_runs(pixelated, grid, runs), bands))
+    
+    return pixelated
+
+
+def _block_counts(grid_len: int, length: int):
+    """
+    Pixels per grid cell along one axis, as the NEAREST upscale paints them
+    
+    Using the upscale's own mapping makes every block an exact integer
+    range of pixels, so each output block is the mean of its own pixels.
+    """
+    import numpy as np
+    
+    index_map = np.frombuffer(_nearest_index_map(grid_len, length), dtype=np.int32)
+    return np.bincount(index_map, minlength=grid_len)
+
+
+def _numpy_grid(image: Image.Image, grid_size: Tuple[int, int], counts=None) -> Image.Image:
+    """
+    Block-average an image to its pixel grid with NumPy
+    
+    Rows are summed block by block (contiguous, vectorized), the much
+    smaller row-sums are then reduced along x with np.add.reduceat.
+    Blocks that don't divide evenly get exact integer sizes (see
+    _block_counts). Alpha modes are averaged premultiplied, like Pillow.
+    
+    Args:
+        image (PIL.Image): Source image (mode in _NUMPY_MODES)
+        grid_size (Tuple[int, int]): Grid (width, height), not larger than the image
+        counts: (x_counts, y_counts) block sizes to use instead of
+                _block_counts (e.g. a slice of a larger image's blocks)
+        
+    Returns:
+        PIL.Image: The pixel grid
+    """
+    import numpy as np
+    
+    small_w, small_h = grid_size
+    width, height = image.size
+    mode = image.mode
+    work_mode = _PREMULTIPLIED_MODES.get(mode, mode)
+    if work_mode != mode:
+        image = image.convert(work_mode)
+    
+    if counts is None:
+        counts = (_block_counts(small_w, width), _block_counts(small_h, height))
+    x_counts, y_counts = counts
+    
+    pixels = np.asarray(image)
+    channels = 1 if pixels.ndim == 2 else pixels.shape[2]
+    rows = pixels.reshape(height, width * channels)
+    
+    # uint16 row sums are exact while a block is at most 257 rows tall
+    row_dtype = np.uint16 if int(y_counts.max()) * 255 <= 0xFFFF else np.uint32
+    row_sums = np.empty((small_h, width * channels), dtype=row_dtype)
+    top = 0
+    for j, count in enumerate(y_counts):
+        np.sum(rows[top:top + count], axis=0, dtype=row_dtype, out=row_sums[j])
+        top += count
+    
+    x_starts = np.concatenate(([0], np.cumsum(x_counts)[:-1]))
+    sums = np.add.reduceat(
+        row_sums.reshape(small_h, width, channels), x_starts, axis=1, dtype=np.uint64
+    )
+    
+    counts = (y_counts[:, None] * x_counts[None, :])[:, :, None].astype(np.uint64)
+    means = ((sums + counts // 2) // counts).astype(np.uint8)
+    
+    grid = Image.fromarray(means[:, :, 0] if channels == 1 else means, work_mode)
+    return grid.convert(mode) if work_mode != mode else grid
+
+
+def _block_chunks(size: Tuple[int, int], grid_size: Tuple[int, int], counts=None):
+    """
+    Block sizes of an image, in chunks of whole grid rows
+    
+    Blocks are the exact integer ranges the NEAREST upscale paints (see
+    _block_counts, or the given (x_counts, y_counts)). Each chunk covers
+    at most about _RANK_CHUNK_PIXELS source pixels.
+    
+    Yields:
+        Tuple: (first grid row, end grid row, top, bottom, y_counts,
+        x_counts) with the block heights of the chunk's grid rows and the
+        block widths
+    """
+    import numpy as np
+    
+    width, height = size
+    small_w, small_h = grid_size
+    if counts is None:
+        counts = (_block_counts(small_w, width), _block_counts(small_h, height))
+    x_counts, y_counts = counts
+    y_starts = np.concatenate(([0], np.cumsum(y_counts)))
+    
+    rows_per_chunk = max(1, _RANK_CHUNK_PIXELS // max(1, width * int(y_counts.max())))
+    for first in range(0, small_h, rows_per_chunk):
+        end = min(small_h, first + rows_per_chunk)
+        top, bottom = int(y_starts[first]), int(y_starts[end])
+        yield first, end, top, bottom, y_counts[first:end], x_counts
+
+
+def _size_classes(counts):
+    """
+    Group the cells of one grid axis by block length
+    
+    Block lengths differ by at most one, so there are one or two groups.
+    
+    Yields:
+        Tuple: (length, cell indices, first source pixel of each cell)
+    """
+    import numpy as np
+    
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    for length in np.unique(counts):
+        cells = np.flatnonzero(counts == length)
+        yield int(length), cells, starts[cells]
+
+
+def _block_index(
+    width: int, channels: int, row_starts, height: int, col_starts, block_width: int
+):
+    """
+    Flat byte offsets of equally sized blocks in interleaved pixels, block-major
+    
+    Args:
+        width (int): Image width
+        channels (int): Bytes per pixel
+        row_starts, col_starts: First source row / column of each block
+        height, block_width (int): Block size
+        
+    Returns:
+        numpy.ndarray: (rows, cols, height * block_width) offsets of the
+        first channel (add c for channel c)
+    """
+    import numpy as np
+    
+    rows = (row_starts[:, None] + np.arange(height)) * (width * channels)
+    cols = (col_starts[:, None] + np.arange(block_width)) * channels
+    index = rows[:, None, :, None] + cols[None, :, None, :]
+    return index.reshape(len(row_starts), len(col_starts), height * block_width)
+
+
+def _median_blocks(blocks):
+    """
+    Per-channel median of every block
+    
+    Args:
+        blocks (numpy.ndarray): uint8 (channels, rows, cols, block pixels)
+        
+    Returns:
+        numpy.ndarray: uint8 (rows, cols, channels) medians
+    """
+    import numpy as np
+    
+    # Stable sort of 8-bit values is a radix sort: linear in the pixels
+    ordered = np.sort(blocks, axis=-1, kind="stable")
+    return np.moveaxis(ordered[..., blocks.shape[-1] // 2], 0, -1)
+
+
+def _mode_blocks(blocks):
+    """
+    Dominant color of every block
+    
+    Colors are quantized to a _MODE_KEY_BITS key, so near-identical
+    shades count as one color. After sorting each block's keys (radix
+    sort), equal colors form runs; the longest run of a block is its
+    dominant color. The pixels of that color are then averaged, so no
+    quantization shows in the result.
+    
+    Args:
+        blocks (numpy.ndarray): uint8 (channels, rows, cols, block pixels)
+        
+    Returns:
+        numpy.ndarray: uint8 (rows, cols, channels) colors
+    """
+    import numpy as np
+    
+    channels, rows, cols, block_pixels = blocks.shape
+    bits = min(8, _MODE_KEY_BITS // channels)
+    keys = np.zeros(blocks.shape[1:], dtype=np.uint16)
+    for channel in range(channels):
+        keys = (keys << bits) | (blocks[channel] >> (8 - bits))
+    
+    ordered = np.sort(keys, axis=-1, kind="stable").ravel()
+    # Runs of equal keys, every block starting a new run
+    run_start = np.empty(len(ordered), dtype=bool)
+    run_start[0] = True
+    np.not_equal(ordered[1:], ordered[:-1], out=run_start[1:])
+    run_start[::block_pixels] = True
+    run_starts = np.flatnonzero(run_start)
+    run_lengths = np.diff(np.append(run_starts, len(ordered)))
+    run_blocks = run_starts // block_pixels
+    
+    block_runs = np.flatnonzero(run_starts % block_pixels == 0)
+    longest = np.maximum.reduceat(run_lengths, block_runs)
+    winners = np.flatnonzero(run_lengths == longest[run_blocks])
+    # Ties go to the lowest color key
+    winners = winners[np.concatenate(([True], np.diff(run_blocks[winners]) != 0))]
+    dominant = ordered[run_starts[winners]].reshape(rows, cols, 1)
+    
+    in_dominant = keys == dominant
+    sums = (blocks * in_dominant).sum(axis=-1, dtype=np.uint32)
+    means = np.rint(sums / longest.reshape(rows, cols))
+    return np.moveaxis(means.astype(np.uint8), 0, -1)
+
+
+def _rank_grid(
+    image: Image.Image, grid_size: Tuple[int, int], reducer: str, counts=None
+) -> Image.Image:
+    """
+    Reduce an image to its pixel grid with the median or mode reducer
+    
+    Works over exact integer blocks (like _numpy_grid). Per chunk of
+    grid rows, blocks of equal size are gathered (np.take with a block
+    index) into one block-major array, so every block is reduced by the
+    same whole-array sort instead of a per-block loop. A grid larger than the image has single-pixel
+    blocks, which a NEAREST resize picks directly.
+    
+    Args:
+        image (PIL.Image): Source image (converted to L, RGB or RGBA)
+        grid_size (Tuple[int, int]): Grid (width, height)
+        reducer (str): "median" or "mode"
+        counts: Block sizes (x_counts, y_counts) (see _numpy_grid)
+        
+    Returns:
+        PIL.Image: The pixel grid
+    """
+    import numpy as np
+    
+    if image.mode not in _RANK_MODES:
+        has_alpha = "A" in image.getbands() or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    
+    small_w, small_h = grid_size
+    if small_w > image.width or small_h > image.height:
+        return image.resize(grid_size, Image.Resampling.NEAREST)
+    
+    pixels = np.asarray(image)
+    if pixels.ndim == 2:
+        pixels = pixels[:, :, None]
+    channels = pixels.shape[2]
+    reduce_blocks = _median_blocks if reducer == "median" else _mode_blocks
+    
+    grid = np.empty((small_h, small_w, channels), dtype=np.uint8)
+    for first, end, top, bottom, y_counts, x_counts in _block_chunks(image.size, grid_size, counts):
+        # Whole rows, so the chunk is a contiguous view of interleaved bytes
+        band = pixels[top:bottom].reshape(-1)
+        for height, rows, row_starts in _size_classes(y_counts):
+            for width, cols, col_starts in _size_classes(x_counts):
+                index = _block_index(image.width, channels, row_starts, height, col_starts, width)
+                blocks = np.empty((channels,) + index.shape, dtype=np.uint8)
+                for channel in range(channels):
+                    np.take(band[channel:], index, out=blocks[channel])
+                grid[np.ix_(first + rows, cols)] = reduce_blocks(blocks)
+    
+    return Image.fromarray(grid[:, :, 0] if image.mode == "L" else grid, image.mode)
+
+
+@lru_cache(maxsize=2)
+def _linear_lut(bits: int):
+    """
+    sRGB code -> 16-bit linear light, for every code of an 8- or 16-bit channel
+    
+    Returns:
+        numpy.ndarray: uint16 table with 2^bits entries (read-only)
+    """
+    import numpy as np
+    
+    srgb = np.arange(1 << bits) / ((1 << bits) - 1)
+    linear = np.where(srgb <= 0.04045, srgb / 12.92, ((srgb + 0.055) / 1.055) ** 2.4)
+    lut = np.rint(linear * _LINEAR_MAX).astype(np.uint16)
+    lut.setflags(write=False)
+    return lut
+
+
+@lru_cache(maxsize=2)
+def _srgb_lut(bits: int):
+    """
+    16-bit linear light -> sRGB code of an 8- or 16-bit channel (inverse of _linear_lut)
+    
+    Returns:
+        numpy.ndarray: uint8 / uint16 table with 65536 entries (read-only)
+    """
+    import numpy as np
+    
+    linear = np.arange(_LINEAR_MAX + 1) / _LINEAR_MAX
+    srgb = np.where(linear <= 0.0031308, linear * 12.92, 1.055 * linear ** (1 / 2.4) - 0.055)
+    lut = np.rint(srgb * ((1 << bits) - 1)).astype(np.uint8 if bits == 8 else np.uint16)
+    lut.setflags(write=False)
+    return lut
+
+
+@lru_cache(maxsize=1)
+def _linear_pair_lut():
+    """
+    _linear_lut(8) for two adjacent bytes at once
+    
+    Indexed by the bytes of a pixel pair read as one uint16, each entry
+    holds both 16-bit linear values (as one uint32, same memory order),
+    so decoding needs half as many lookups.
+    
+    Returns:
+        numpy.ndarray: uint32 table with 65536 entries (read-only)
+    """
+    import numpy as np
+    
+    codes = np.arange(1 << 16, dtype=np.uint16)
+    table = _linear_lut(8)[codes.view(np.uint8)].view(np.uint32)
+    table.setflags(write=False)
+    return table
+
+
+def _decode_linear(values):
+    """
+    Decode a contiguous uint8 / uint16 array to 16-bit linear light
+    
+    Returns:
+        numpy.ndarray: uint16 array of the same shape
+    """
+    import numpy as np
+    
+    if values.dtype != np.uint8:
+        return _linear_lut(16)[values]
+    
+    flat = values.reshape(-1)
+    linear = np.empty(flat.shape, dtype=np.uint16)
+    even = len(flat) & ~1
+    linear[:even] = _linear_pair_lut()[flat[:even].view(np.uint16)].view(np.uint16)
+    linear[even:] = _linear_lut(8)[flat[even:]]
+    return linear.reshape(values.shape)
+
+
+def _block_sums(values, y_counts, x_counts, dtype):
+    """
+    Sum of every block of a (rows, width, channels) array
+    
+    Rows are summed block by block (contiguous, vectorized), the much
+    smaller row sums are then reduced along x with np.add.reduceat, as in
+    _numpy_grid.
+    
+    Args:
+        dtype: Accumulator for the row sums (must hold a block column's sum)
+    
+    Returns:
+        numpy.ndarray: uint64 (grid rows, grid width, channels) sums
+    """
+    import numpy as np
+    
+    rows, width, channels = values.shape
+    flat_rows = values.reshape(rows, width * channels)
+    row_sums = np.empty((len(y_counts), width * channels), dtype=dtype)
+    top = 0
+    for j, count in enumerate(y_counts):
+        np.sum(flat_rows[top:top + count], axis=0, dtype=dtype, out=row_sums[j])
+        top += count
+    
+    x_starts = np.concatenate(([0], np.cumsum(x_counts)[:-1]))
+    return np.add.reduceat(
+        row_sums.reshape(len(y_counts), width, channels), x_starts, axis=1, dtype=np.uint64
+    )
+
+
+def _multiply(a: Image.Image, b: Image.Image) -> Image.Image:
+    """Pixel product of two I images (ImageMath.lambda_eval, or eval before Pillow 10.3)"""
+    from PIL import ImageMath
+    
+    if hasattr(ImageMath, "lambda_eval"):
+        return ImageMath.lambda_eval(lambda args: args["a"] * args["b"], a=a, b=b)
+    return ImageMath.eval("a * b", a=a, b=b)
+
+
+def _linear_reduced(image: Image.Image, factor: int):
+    """
+    Decode an L, RGB or RGBA image to linear light and reduce() it, in Pillow
+    
+    Every band is decoded through _linear_lut into 32-bit I and averaged
+    over factor x factor blocks with Image.reduce, so the full-size pixels
+    never reach NumPy. RGBA colors are multiplied by alpha (_multiply)
+    before the reduction, and alpha is reduced at _LINEAR_ALPHA_SCALE
+    times its scale.
+    
+    Returns:
+        numpy.ndarray: (h, w, bands) means; uint16 linear colors, or for
+        RGBA uint32 premultiplied colors and scaled alpha
+    """
+    import numpy as np
+    
+    lut = _linear_lut(8).tolist()
+    bands = image.split()
+    if image.mode != "RGBA":
+        planes = [band.point(lut, "I").reduce(factor) for band in bands]
+        return np.stack([np.asarray(plane) for plane in planes], axis=2).astype(np.uint16)
+    
+    *colors, alpha = bands
+    weights = alpha.convert("I")
+    planes = [_multiply(band.point(lut, "I"), weights).reduce(factor) for band in colors]
+    scaled = [value * _LINEAR_ALPHA_SCALE for value in range(256)]
+    planes.append(alpha.point(scaled, "I").reduce(factor))
+    return np.stack([np.asarray(plane) for plane in planes], axis=2).astype(np.uint32)
+
+
+def _linear_grid(
+    image: Image.Image, grid_size: Tuple[int, int], counts=None, reduce_factor: int = 1
+) -> Image.Image:
+    """
+    Block-average an image to its pixel grid in linear light
+    
+    Pixels are decoded through a precomputed sRGB -> linear LUT (256
+    entries, looked up two bytes at a time; 65536 for 16-bit gray),
+    summed per exact integer block (see _block_counts) chunk by chunk,
+    and only the grid-sized means are encoded back through the inverse
+    LUT. Colors of images with alpha are weighted by alpha, like
+    Pillow's premultiplied averaging.
+    
+    With reduce_factor > 1, 8-bit images are decoded and averaged over
+    reduce_factor x reduce_factor blocks by Pillow instead, still in
+    linear light (see _linear_reduced); the exact blocks are then taken
+    on that smaller image. I;16 images ignore reduce_factor (Pillow has
+    no 16-bit lookup or reduce).
+    
+    Args:
+        image (PIL.Image): Source image (converted to L, RGB or RGBA
+                           unless it is I;16)
+        grid_size (Tuple[int, int]): Grid (width, height)
+        counts: Block sizes (x_counts, y_counts) (see _numpy_grid)
+        reduce_factor (int): Linear-light integer pre-reduction (see
+                             pixelate_grid's reducing_gap)
+        
+    Returns:
+        PIL.Image: The pixel grid
+    """
+    import numpy as np
+    
+    if image.mode not in _LINEAR_MODES:
+        has_alpha = "A" in image.getbands() or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    
+    decoded = None
+    if reduce_factor > 1 and image.mode != "I;16":
+        decoded = _linear_reduced(image, reduce_factor)
+    size = image.size if decoded is None else (decoded.shape[1], decoded.shape[0])
+    
+    small_w, small_h = grid_size
+    if small_w > size[0] or small_h > size[1]:
+        # Blocks of at most one pixel: nothing to average
+        return image.resize(grid_size, Image.Resampling.BOX)
+    
+    encode = _srgb_lut(16 if image.mode == "I;16" else 8)
+    pixels = np.asarray(image) if decoded is None else decoded
+    if pixels.ndim == 2:
+        pixels = pixels[:, :, None]
+    has_alpha = image.mode == "RGBA"
+    colors = pixels.shape[2] - has_alpha
+    
+    grid = np.empty((small_h, small_w, pixels.shape[2]), dtype=encode.dtype)
+    for first, end, top, bottom, y_counts, x_counts in _block_chunks(size, grid_size, counts):
+        # Whole rows, so the chunk is contiguous (alpha is decoded too, unused)
+        band = pixels[top:bottom]
+        linear = _decode_linear(band) if decoded is None else band
+        counts = (y_counts[:, None] * x_counts[None, :])[:, :, None]
+        if has_alpha:
+            alpha = band[:, :, 3:]
+            if decoded is None:
+                scale = 1
+                weighted = linear[:, :, :colors] * alpha.astype(np.uint32)
+            else:
+                # Already premultiplied, alpha scaled (see _linear_reduced)
+                scale = _LINEAR_ALPHA_SCALE
+                weighted = band[:, :, :colors]
+            weights = _block_sums(alpha, y_counts, x_counts, np.uint32)
+            sums = _block_sums(weighted, y_counts, x_counts, np.uint64)
+            means = np.where(weights > 0, sums * scale / np.maximum(weights, 1), 0)
+            # Pillow rounds both reduced means, so their ratio may pass white
+            means = np.minimum(means, _LINEAR_MAX)
+            grid[first:end, :, 3:] = np.rint(weights / (counts * scale))
+        else:
+            # uint32 holds a column sum of blocks up to 65537 rows tall
+            means = _block_sums(linear, y_counts, x_counts, np.uint32) / counts
+        grid[first:end, :, :colors] = encode[np.rint(means).astype(np.intp)]
+    
+    return _from_array(grid[:, :, 0] if pixels.shape[2] == 1 else grid, image.mode)
+
+
+def _from_array(values, mode: str) -> Image.Image:
+    """Image.fromarray(values, mode), inferring I;16 from uint16 (its mode argument is deprecated)"""
+    if mode == "I;16":
+        return Image.fromarray(values)
+    return Image.fromarray(values, mode)
+
+
+def _palette_colors(palette: Union[str, Sequence[RGB]]) -> Tuple[RGB, ...]:
+    """Resolve a palette name or sequence of (r, g, b) to a tuple of colors"""
+    if isinstance(palette, str):
+        if palette.lower() not in PALETTES:
+            raise ValueError(f"Unknown palette '{palette}'. Use: {', '.join(PALETTES)}")
+        return PALETTES[palette.lower()]
+    
+    colors = tuple(tuple(int(c) for c in color) for color in palette)
+    if not 1 <= len(colors) <= 255 or any(len(c) != 3 for c in colors):
+        raise ValueError("palette must hold 1-255 (r, g, b) colors")
+    return colors
+
+
+@lru_cache(maxsize=16)
+def _palette_lut(colors: Tuple[RGB, ...]):
+    """
+    Nearest palette index for every color, quantized to _LUT_BITS per channel
+    
+    Built once per palette: distances from the center of each LUT cell to
+    every palette color, as one matrix product. A cell whose two nearest
+    palette colors are closer in distance than the cell's diameter may
+    hold colors nearest to either; it is marked _LUT_AMBIGUOUS and its
+    pixels are resolved exactly.
+    
+    Returns:
+        numpy.ndarray: uint8 array of shape (2^_LUT_BITS,) * 3 (read-only)
+    """
+    import numpy as np
+    
+    steps = 1 << _LUT_BITS
+    cell = 1 << (8 - _LUT_BITS)
+    levels = np.arange(steps) * cell + (cell - 1) / 2
+    r, g, b = np.meshgrid(levels, levels, levels, indexing="ij")
+    centers = np.stack([r.ravel(), g.ravel(), b.ravel()], axis=1).astype(np.float32)
+    
+    palette = np.asarray(colors, dtype=np.float32)
+    distances = (
+        (centers ** 2).sum(axis=1)[:, None]
+        + (palette ** 2).sum(axis=1)
+        - 2 * centers @ palette.T
+    )
+    lut = distances.argmin(axis=1).astype(np.uint8)
+    
+    if len(colors) > 1:
+        nearest_two = np.sqrt(np.maximum(np.partition(distances, 1, axis=1)[:, :2], 0))
+        diameter = math.sqrt(3) * (cell - 1)
+        lut[nearest_two[:, 1] - nearest_two[:, 0] <= diameter] = _LUT_AMBIGUOUS
+    
+    lut = lut.reshape(steps, steps, steps)
+    lut.setflags(write=False)
+    return lut
+
+
+def _direct_indices(rgb, colors: Tuple[RGB, ...]):
+    """
+    Nearest palette index of every pixel of an (h, w, 3) uint8 array, without a LUT
+    
+    For palettes used once (adaptive ones, up to 256 colors): the LUT
+    costs a distance matrix over all its 2^(3 * _LUT_BITS) cells, far
+    more than the pixels of a grid. Distances are computed per chunk of
+    pixels as one matrix product; they are integers below 2^24, so the
+    float32 result is exact.
+    """
+    import numpy as np
+    
+    pixels = rgb.reshape(-1, 3).astype(np.float32)
+    palette = np.asarray(colors, dtype=np.float32)
+    # |pixel|^2 is the same for every color of a pixel, so it is left out
+    norms = (palette ** 2).sum(axis=1)
+    indices = np.empty(len(pixels), dtype=np.uint8)
+    for start in range(0, len(pixels), _NEAREST_CHUNK):
+        chunk = pixels[start:start + _NEAREST_CHUNK]
+        indices[start:start + len(chunk)] = (norms - 2 * chunk @ palette.T).argmin(axis=1)
+    return indices.reshape(rgb.shape[:2])
+
+
+def _nearest_indices(rgb, colors: Tuple[RGB, ...], lut: bool = True):
+    """
+    Nearest palette index of every pixel of an (h, w, 3) uint8 array
+    
+    Looks up the cached LUT; pixels in ambiguous cells are compared
+    against every palette color. lut=False compares every pixel directly
+    (see _direct_indices).
+    """
+    import numpy as np
+    
+    if not lut:
+        return _direct_indices(rgb, colors)
+    
+    cells = rgb >> (8 - _LUT_BITS)
+    indices = _palette_lut(colors)[cells[..., 0], cells[..., 1], cells[..., 2]]
+    
+    ambiguous = indices == _LUT_AMBIGUOUS
+    if ambiguous.any():
+        exact = rgb[ambiguous].astype(np.int32)
+        palette = np.asarray(colors, dtype=np.int32)
+        distances = ((exact[:, None, :] - palette[None, :, :]) ** 2).sum(axis=2)
+        indices[ambiguous] = distances.argmin(axis=1)
+    return indices
+
+
+@lru_cache(maxsize=4)
+def _bayer_matrix(size: int):
+    """
+    Bayer threshold matrix of side size (a power of two)
+    
+    Returns:
+        numpy.ndarray: float32 thresholds evenly spread over (-0.5, 0.5)
+    """
+    import numpy as np
+    
+    matrix = np.zeros((1, 1), dtype=np.int32)
+    while matrix.shape[0] < size:
+        matrix = np.block([[4 * matrix, 4 * matrix + 2], [4 * matrix + 3, 4 * matrix + 1]])
+    thresholds = ((matrix + 0.5) / matrix.size - 0.5).astype(np.float32)
+    thresholds.setflags(write=False)
+    return thresholds
+
+
+@lru_cache(maxsize=8)
+def _tiled_thresholds(shape: Tuple[int, int]):
+    """Bayer thresholds tiled over a (height, width) grid, phase fixed at (0, 0)"""
+    import numpy as np
+    
+    height, width = shape
+    matrix = _bayer_matrix(_BAYER_SIZE)
+    reps = (-(-height // _BAYER_SIZE), -(-width // _BAYER_SIZE))
+    tiled = np.ascontiguousarray(np.tile(matrix, reps)[:height, :width, None])
+    tiled.setflags(write=False)
+    return tiled
+
+
+@lru_cache(maxsize=16)
+def _dither_spread(colors: Tuple[RGB, ...]) -> float:
+    """
+    Amplitude of the ordered-dither offsets for a palette
+    
+    The median distance from each color to its nearest neighbour: about
+    the step between adjacent palette colors, so a threshold offset can
+    push a pixel to either of the two colors around it.
+    """
+    import numpy as np
+    
+    if len(colors) < 2:
+        return 0.0
+    palette = np.asarray(colors, dtype=np.float64)
+    distances = np.sqrt(((palette[:, None, :] - palette[None, :, :]) ** 2).sum(axis=2))
+    np.fill_diagonal(distances, np.inf)
+    return float(np.median(distances.min(axis=1)))
+
+
+def _ordered_indices(rgb, colors: Tuple[RGB, ...], lut: bool = True):
+    """
+    Ordered dithering: nearest color after adding tiled Bayer offsets
+    
+    Whole-array operations only, so the cost is a few array passes over
+    the grid on top of the plain nearest-color lookup.
+    """
+    import numpy as np
+    
+    offsets = _tiled_thresholds(rgb.shape[:2]) * _dither_spread(colors)
+    shifted = np.clip(rgb + offsets, 0, 255).astype(np.uint8)
+    return _nearest_indices(shifted, colors, lut)
+
+
+def _diffused_indices(rgb, colors: Tuple[RGB, ...]):
+    """
+    Floyd-Steinberg error diffusion to a palette
+    
+    Error diffusion is sequential along each row, so it runs in Pillow's C
+    quantizer (row by row, left to right) rather than in NumPy; Pillow
+    picks colors through its own nearest-color cache.
+    """
+    import numpy as np
+    
+    palette_image = Image.new("P", (1, 1))
+    palette_image.putpalette([channel for color in colors for channel in color])
+    dithered = Image.fromarray(rgb, "RGB").quantize(
+        palette=palette_image, dither=Image.Dither.FLOYDSTEINBERG
+    )
+    # Writable copy (callers mark transparent pixels in place)
+    return np.array(dithered)
+
+
+def _map_to_palette(
+    image: Image.Image, colors: Tuple[RGB, ...], dither: Optional[str] = None, lut: bool = True
+):
+    """
+    Map an image to the nearest palette colors
+    
+    Args:
+        image (PIL.Image): Image to map
+        colors (Tuple[RGB, ...]): Palette
+        dither (str): One of DITHERS (None = "none")
+        lut (bool): Use the cached LUT (fixed palettes); False compares
+                    pixels directly (palettes used once, up to 256 colors)
+    
+    Returns:
+        Tuple[numpy.ndarray, numpy.ndarray]: (uint8 palette indices,
+        transparent-pixel mask or None)
+    """
+    import numpy as np
+    
+    has_alpha = "A" in image.getbands() or "transparency" in image.info
+    rgba = image.convert("RGBA") if has_alpha else image.convert("RGB")
+    pixels = np.asarray(rgba)
+    rgb = pixels[..., :3]
+    
+    if dither == "ordered":
+        indices = _ordered_indices(rgb, colors, lut)
+    elif dither == "diffusion":
+        indices = _diffused_indices(np.ascontiguousarray(rgb), colors)
+    else:
+        indices = _nearest_indices(rgb, colors, lut)
+    
+    transparent = None
+    if has_alpha:
+        transparent = pixels[..., 3] < _ALPHA_THRESHOLD
+    return indices, transparent
+
+
+def _check_dither(dither: Optional[str], colors: Optional[int], palette) -> Optional[str]:
+    """Validate a dither name, returning None for no dithering"""
+    if dither is None or dither == "none":
+        return None
+    if dither not in DITHERS:
+        raise ValueError(f"Unknown dither '{dither}'. Use: {', '.join(DITHERS)}")
+    if colors is None and palette is None:
+        raise ValueError("dither needs colors or palette")
+    return dither
+
+
+def reduce_palette(
+    image: Image.Image,
+    colors: Optional[int] = None,
+    palette: Union[str, Sequence[RGB], None] = None,
+    dither: Optional[str] = None
+) -> Image.Image:
+    """
+    Reduce an image to an indexed (mode "P") palette image
+    
+    Meant for pixel grids: they have few pixels, so this is far cheaper
+    than quantizing the upscaled image, and the upscaled result stays
+    indexed (1 byte per pixel, small indexed PNG/GIF files).
+    
+    Args:
+        image (PIL.Image): Image to reduce, usually PixelGrid.grid
+        colors (int): Palette size (2-256). Without a fixed palette the
+                      colors are chosen from the image (median cut; fast
+                      octree, and at most 255 colors plus the transparent
+                      entry, for images with alpha)
+        palette: Fixed palette, a name in PALETTES or a sequence of
+                 (r, g, b); every pixel gets the nearest color. With
+                 colors, only the colors most used entries are kept.
+        dither (str): One of DITHERS, to keep gradients from banding:
+                      "ordered"   - tiled 8x8 Bayer thresholds (vectorized,
+                                    stable pattern while the grid changes)
+                      "diffusion" - Floyd-Steinberg error diffusion
+                      None/"none" - plain nearest color
+        
+    Returns:
+        PIL.Image: Mode "P" image; pixels with alpha below 128 use a
+        transparent palette entry
+        
+    Raises:
+        ValueError: If neither colors nor palette is given, or they are invalid
+    """
+    if colors is None and palette is None:
+        raise ValueError("reduce_palette needs colors or palette")
+    if colors is not None and not 2 <= colors <= 256:
+        raise ValueError(f"colors must be 2-256, got {colors}")
+    dither = _check_dither(dither, colors, palette)
+    
+    import numpy as np
+    
+    if palette is None:
+        has_alpha = "A" in image.getbands() or "transparency" in image.info
+        source = image.convert("RGBA" if has_alpha else "RGB")
+        method = Image.Quantize.FASTOCTREE if has_alpha else Image.Quantize.MEDIANCUT
+        # With alpha, one palette entry stays free for transparent pixels
+        count = min(colors, 255) if has_alpha else colors
+        adaptive = source.quantize(count, method=method, dither=Image.Dither.NONE)
+        if dither is None and not has_alpha:
+            return adaptive
+        
+        rgb = adaptive.getpalette("RGB")
+        used = int(max(adaptive.getextrema()[1], 0)) + 1
+        palette_colors = tuple(tuple(rgb[i:i + 3]) for i in range(0, used * 3, 3))
+        if dither is None:
+            # Keep the octree's colors, but make alpha one transparent
+            # index like fixed palettes (its RGBA palette has partial alpha)
+            indices = np.array(adaptive)
+            transparent = np.asarray(source.getchannel("A")) < _ALPHA_THRESHOLD
+        else:
+            # Dither against the chosen colors (used once: no cached LUT)
+            indices, transparent = _map_to_palette(image, palette_colors, dither, lut=False)
+        colors = None
+    else:
+        palette_colors = _palette_colors(palette)
+        indices, transparent = _map_to_palette(image, palette_colors, dither)
+    
+    if colors is not None and colors < len(palette_colors):
+        # Keep the most used entries and map again to just those
+        usage = np.bincount(
+            indices[~transparent] if transparent is not None else indices.ravel(),
+            minlength=len(palette_colors)
+        )
+        keep = sorted(np.argsort(usage, kind="stable")[::-1][:colors])
+        palette_colors = tuple(palette_colors[i] for i in keep)
+        indices, transparent = _map_to_palette(image, palette_colors, dither)
+    
+    flat = [channel for color in palette_colors for channel in color]
+    has_transparent = transparent is not None and bool(transparent.any())
+    if has_transparent:
+        # One extra entry for transparent pixels
+        indices[transparent] = len(palette_colors)
+        flat += [0, 0, 0]
+    
+    result = Image.fromarray(indices, "P")
+    result.putpalette(flat)
+    if has_transparent:
+        result.info["transparency"] = len(palette_colors)
+    return result
+
+
+class PixelGrid:
+    """
+    Pixelation result stored as its small grid plus the target size
+    
+    Every segment of a pixelated image is one grid pixel, so the grid holds
+    all the information at a tiny fraction of the memory. Full-resolution
+    pixels are produced on demand (to_image) and never kept.
+    
+    Attributes:
+        grid (PIL.Image): One pixel per segment
+        size (Tuple[int, int]): Full-resolution (width, height)
+    """
+    
+    def __init__(self, grid: Image.Image, size: Tuple[int, int]):
+        self.grid = grid
+        self.size = tuple(size)
+    
+    @property
+    def width(self) -> int:
+        return self.size[0]
+    
+    @property
+    def height(self) -> int:
+        return self.size[1]
+    
+    @property
+    def mode(self) -> str:
+        return self.grid.mode
+    
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the grid"""
+        return self.grid.width * self.grid.height * len(self.grid.getbands())
+    
+    def to_image(self, workers: Optional[int] = None) -> Image.Image:
+        """
+        Upscale the grid to full resolution
+        
+        Args:
+            workers (int): Threads for large outputs (same pixels either way)
+            
+        Returns:
+            PIL.Image: Pixelated image at self.size
+        """
+        if workers and workers > 1 and self.grid.mode in _BAND_MODES:
+            return _expand_threaded(self.grid, self.size, workers)
+        
+        # NEAREST interpolation preserves sharp pixel boundaries
+        return self.grid.resize(self.size, resample=Image.Resampling.NEAREST)
+    
+    def scaled(self, scale: int) -> Image.Image:
+        """
+        Enlarge the grid by an integer factor (every segment = scale x scale px)
+        
+        Args:
+            scale (int): Enlargement factor, 1 = the bare grid
+            
+        Returns:
+            PIL.Image: Image of size (grid width * scale, grid height * scale)
+        """
+        if scale < 1:
+            raise ValueError(f"scale must be >= 1, got {scale}")
+        if scale == 1:
+            return self.grid.copy()
+        return self.grid.resize(
+            (self.grid.width * scale, self.grid.height * scale),
+            resample=Image.Resampling.NEAREST
+        )
+    
+    def quantized(
+        self,
+        colors: Optional[int] = None,
+        palette: Union[str, Sequence[RGB], None] = None,
+        dither: Optional[str] = None
+    ) -> "PixelGrid":
+        """
+        Reduce the grid to an indexed palette (see reduce_palette)
+        
+        Returns:
+            PixelGrid: Same size, grid in mode "P"
+        """
+        return PixelGrid(reduce_palette(self.grid, colors, palette, dither), self.size)
+    
+    def save(self, fp, format: Optional[str] = None, scale: Optional[int] = None, **params):
+        """
+        Save the pixelated image
+        
+        Args:
+            fp: File name or file object
+            format (str): Pillow format name (default: from the file name)
+            scale (int): None = original size, N = grid enlarged N times
+                         (much cheaper to encode for heavy pixelation)
+            **params: Encoder options passed to PIL.Image.save
+        """
+        image = self.to_image() if scale is None else self.scaled(scale)
+        image.save(fp, format=format, **params)
+    
+    def __repr__(self):
+        return (
+            f"<PixelGrid grid={self.grid.width}x{self.grid.height} "
+            f"size={self.width}x{self.height} mode={self.mode}>"
+        )
+
+
+def pixelate_grid(
+    image: Image.Image, 
+    segments_count: int, 
+    workers: Optional[int] = None,
+    reducing_gap: Optional[float] = None,
+    colors: Optional[int] = None,
+    palette: Union[str, Sequence[RGB], None] = None,
+    dither: Optional[str] = None,
+    reducer: str = "mean",
+    linear: bool = False
+) -> PixelGrid:
+    """
+    Compute the pixel grid of an image without upscaling it
+    
+    Takes the same arguments as apply_pixelate(); 
+    pixelate_grid(...).to_image() == apply_pixelate(...).
+    
+    Returns:
+        PixelGrid: Grid plus the original size
+        
+    Raises:
+        ValueError: If segments_count, workers, colors, palette, dither or
+                    reducer is invalid
+    """
+    # Validate input
+    if segments_count <= 0:
+        raise ValueError(f"segments_count must be positive, got {segments_count}")
+    
+    if not isinstance(image, Image.Image):
+        raise TypeError(f"Expected PIL Image, got {type(image)}")
+    
+    if workers is not None and workers <= 0:
+        raise ValueError(f"workers must be positive, got {workers}")
+    
+    _check_reducing_gap(reducing_gap)
+    
+    if colors is not None and not 2 <= colors <= 256:
+        raise ValueError(f"colors must be 2-256, got {colors}")
+    if palette is not None:
+        _palette_colors(palette)
+    _check_dither(dither, colors, palette)
+    
+    if reducer not in REDUCERS:
+        raise ValueError(f"Unknown reducer '{reducer}'. Use: {', '.join(REDUCERS)}")
+
+    # Store original dimensions
+    original_size = image.size
+    
+    # Calculate downscaled dimensions
+    small_w, small_h = _grid_size(original_size, segments_count)
+    
+    try:
+        linear_factor = 1
+        if reducing_gap and (reducer != "mean" or linear or image.mode in _REDUCE_MODES):
+            # Integer block average first, keeping reducing_gap pixels per
+            # grid pixel; block edges shift by less than 1/reducing_gap cell
+            min_w, min_h = min_source_size(original_size, segments_count, reducing_gap)
+            factor = min(original_size[0] // min_w, original_size[1] // min_h)
+            if factor > 1 and reducer == "mean" and linear:
+                # reduce() would average in sRGB: _linear_grid reduces in linear light
+                linear_factor = factor
+            elif factor > 1 and reducer == "mean":
+                image = image.reduce(factor)
+            elif factor > 1:
+                # Averaging would blend the colors median/mode pick from:
+                # keep every factor-th pixel instead
+                image = image.resize(
+                    (image.width // factor, image.height // factor), Image.Resampling.NEAREST
+                )
+        
+        if reducer != "mean":
+            small_img = _rank_grid(image, (small_w, small_h), reducer)
+        elif linear:
+            # Exact integer blocks (see _block_counts), averaged in linear light
+            small_img = _linear_grid(image, (small_w, small_h), reduce_factor=linear_factor)
+        elif workers and workers > 1 and image.mode in _BAND_MODES:
+            small_img = _reduce_threaded(image, (small_w, small_h), workers)
+        else:
+            # Downscale to create pixel grid
+            # BOX resampling averages colors within each segment for better quality
+            small_img = image.resize(
+                (small_w, small_h), 
+                resample=Image.Resampling.BOX
+            )
+        
+        if colors is not None or palette is not None:
+            # Palette reduction and dithering work on the grid, before the upscale
+            small_img = reduce_palette(small_img, colors, palette, dither)
+        
+        return PixelGrid(small_img, original_size)
+        
+    except Exception as e:
+        raise RuntimeError(f"Pixelation failed: {str(e)}") from e
+
+
+def pixelate_crop(
+    source, 
+    box: Tuple[float, float, float, float], 
+    segments_count: int,
+    reducing_gap: Optional[float] = None
+) -> PixelGrid:
+    """
+    Crop and pixelate in one step, without an intermediate crop image
+    
+    The grid is resampled straight from the box region of the source
+    (Image.resize(box=...)). Given an image_io.BandReader, only the rows
+    inside the box are decoded. Alpha modes are cropped first, because
+    Pillow would otherwise premultiply the whole source.
+    
+    The result matches pixelate_grid(source.crop(box), segments_count)
+    except where a source row or column lies exactly on a block boundary:
+    Pillow's float coefficients may then assign it to the neighbouring
+    block.
+    
+    Args:
+        source: PIL Image or image_io.BandReader
+        box (Tuple): Crop box (left, top, right, bottom), rounded like
+                     Image.crop
+        segments_count (int): Number of pixel segments along the box width
+        reducing_gap (float): Let Pillow reduce() the region first while at
+                              least this many source pixels remain per grid
+                              pixel (None = exact)
+        
+    Returns:
+        PixelGrid: Grid plus the crop size
+        
+    Raises:
+        ValueError: If segments_count, the box or reducing_gap is invalid
+    """
+    if segments_count <= 0:
+        raise ValueError(f"segments_count must be positive, got {segments_count}")
+    _check_reducing_gap(reducing_gap)
+    
+    left, top, right, bottom = (int(round(v)) for v in box)
+    width, height = source.size
+    if not (0 <= left < right <= width and 0 <= top < bottom <= height):
+        raise ValueError(
+            f"Crop box ({left}, {top}, {right}, {bottom}) is outside the "
+            f"{width}x{height} image"
+        )
+    
+    crop_size = (right - left, bottom - top)
+    grid_size = _grid_size(crop_size, segments_count)
+    
+    try:
+        if isinstance(source, Image.Image):
+            region, region_top = source, 0
+        else:
+            region, region_top = source.read_rows(top, bottom), top
+        
+        region_box = (left, top - region_top, right, bottom - region_top)
+        if region.mode in _PREMULTIPLIED_MODES:
+            region, region_box = region.crop(region_box), None
+        
+        small_img = region.resize(
+            grid_size, resample=Image.Resampling.BOX, box=region_box, reducing_gap=reducing_gap
+        )
+        return PixelGrid(small_img, crop_size)
+        
+    except Exception as e:
+        raise RuntimeError(f"Pixelation failed: {str(e)}") from e
+
+
+def pixelate_crop_file(
+    image_path: str, 
+    box: Optional[Tuple[int, int, int, int]], 
+    segments_count: int,
+    reducing_gap: Optional[float] = None
+) -> PixelGrid:
+    """
+    Crop and pixelate an image file, decoding as little as possible
+    
+    With reducing_gap, JPEG files are decoded at 1/2, 1/4 or 1/8 scale
+    (Image.draft) when at least reducing_gap decoded pixels remain per grid
+    pixel, and other formats are reduce()d early. Without it, uncompressed
+    files (PPM, BMP, raw TIFF) decode only the rows inside the box.
+    
+    Args:
+        image_path (str): Input image path
+        box (Tuple): Crop box (left, top, right, bottom), None = whole image
+        segments_count (int): Number of pixel segments along the box width
+        reducing_gap (float): Decode/reduce tolerance (None = exact)
+        
+    Returns:
+        PixelGrid: Grid plus the crop size
+    """
+    _check_reducing_gap(reducing_gap)
+    
+    with BandReader(image_path) as reader:
+        if box is None:
+            box = (0, 0) + reader.size
+        
+        if reducing_gap and reader.format == "JPEG":
+            left, top, right, bottom = box
+            crop_w, crop_h = right - left, bottom - top
+            min_w, min_h = min_source_size((crop_w, crop_h), segments_count, reducing_gap)
+            draft_size = (
+                math.ceil(reader.size[0] * min_w / crop_w),
+                math.ceil(reader.size[1] * min_h / crop_h),
+            )
+            with open_draft(image_path, draft_size)[0] as img:
+                if img.size != reader.size:
+                    return _pixelate_scaled(img, reader.size, box, segments_count, reducing_gap)
+        
+        if reader.streaming:
+            return pixelate_crop(reader, box, segments_count, reducing_gap)
+    
+    with open_image(image_path) as img:
+        return pixelate_crop(img, box, segments_count, reducing_gap)
+
+
+def _pixelate_scaled(
+    image: Image.Image, 
+    full_size: Tuple[int, int], 
+    box: Tuple[int, int, int, int], 
+    segments_count: int,
+    reducing_gap: float
+) -> PixelGrid:
+    """Pixelate a box given in full-size coordinates from a draft-decoded image"""
+    left, top, right, bottom = box
+    if not (0 <= left < right <= full_size[0] and 0 <= top < bottom <= full_size[1]):
+        raise ValueError(
+            f"Crop box ({left}, {top}, {right}, {bottom}) is outside the "
+            f"{full_size[0]}x{full_size[1]} image"
+        )
+    
+    scale_x = image.width / full_size[0]
+    scale_y = image.height / full_size[1]
+    crop_size = (right - left, bottom - top)
+    
+    try:
+        # The grid size comes from the full-size crop, so the output aspect
+        # ratio is the same as without drafting
+        small_img = image.resize(
+            _grid_size(crop_size, segments_count),
+            resample=Image.Resampling.BOX,
+            box=(left * scale_x, top * scale_y, right * scale_x, bottom * scale_y),
+            reducing_gap=reducing_gap,
+        )
+        return PixelGrid(small_img, crop_size)
+        
+    except Exception as e:
+        raise RuntimeError(f"Pixelation failed: {str(e)}") from e
+
+
+def iter_pixelate_bands(
+    source, 
+    segments_count: int, 
+    band_height: int = DEFAULT_BAND_HEIGHT
+) -> Iterator[Tuple[int, Image.Image]]:
+    """
+    Pixelate an image band by band, yielding output rows top to bottom
+    
+    Produces exactly the same pixels as apply_pixelate(), but never holds the
+    full-resolution output: the source is read once in bands aligned to
+    segment boundaries, reduced to the grid, and the grid is expanded one
+    band at a time. Peak memory is the band size plus a
+    (segments_count x height) strip; images over 100 times taller than
+    wide, which Pillow reduces vertically first, are held whole instead.
+    
+    Args:
+        source: PIL Image or image_io.BandReader
+        segments_count (int): Number of pixel segments along width
+        band_height (int): Approximate output rows per band
+        
+    Yields:
+        Tuple[int, PIL.Image]: (top row, band image)
+        
+    Raises:
+        ValueError: If segments_count, band_height or the image mode is invalid
+    """
+    if segments_count <= 0:
+        raise ValueError(f"segments_count must be positive, got {segments_count}")
+    if band_height <= 0:
+        raise ValueError(f"band_height must be positive, got {band_height}")
+    if source.mode not in _BAND_MODES:
+        raise ValueError(f"Band processing does not support mode {source.mode}")
+    
+    if isinstance(source, Image.Image):
+        def read_rows(top, bottom):
+            return source.crop((0, top, source.width, bottom))
+    else:
+        read_rows = source.read_rows
+    
+    width, height = source.size
+    grid_size = _grid_size(source.size, segments_count)
+    bands = _group_runs(_grid_runs(grid_size[1], height), band_height)
+    
+    reducer = _StripReducer(source.size, source.mode, grid_size)
+    for runs in bands:
+        reducer.add(runs[0][1], read_rows(runs[0][1], runs[-1][2]))
+    grid = reducer.finish()
+    
+    for runs in bands:
+        yield runs[0][1], _expand_band(grid, width, runs)
+
+
+def pixelate_file(
+    source_path: str, 
+    output_path: str, 
+    segments_count: int, 
+    band_height: int = DEFAULT_BAND_HEIGHT
+) -> Tuple[int, int]:
+    """
+    Pixelate an image file into another file with bounded memory
+    
+    Intended for very large scans. Uncompressed sources (PPM, BMP, raw TIFF)
+    are decoded band by band; PNG/PPM outputs are encoded band by band
+    (see image_io.BandReader / BandWriter for the other formats).
+    
+    Args:
+        source_path (str): Input image path
+        output_path (str): Output image path (format from extension)
+        segments_count (int): Number of pixel segments along width
+        band_height (int): Approximate rows per band
+        
+    Returns:
+        Tuple[int, int]: Output (width, height)
+    """
+    with BandReader(source_path) as reader:
+        with BandWriter(output_path, reader.size, reader.mode) as writer:
+            for _, band in iter_pixelate_bands(reader, segments_count, band_height):
+                writer.write(band)
+        return reader.size
+
 
-def apply_pixelate(image: Image.Image, segments_count: int) -> Image.Image:
+def apply_pixelate(
+    image: Image.Image, 
+    segments_count: int, 
+    workers: Optional[int] = None,
+    reducing_gap: Optional[float] = None,
+    colors: Optional[int] = None,
+    palette: Union[str, Sequence[RGB], None] = None,
+    dither: Optional[str] = None,
+    reducer: str = "mean",
+    linear: bool = False
+) -> Image.Image:
     """
     Apply pixelation effect to an image
     
@@ -21,58 +1635,245 @@ def apply_pixelate(image: Image.Image, segments_count: int) -> Image.Image:
         segments_count (int): Number of pixel segments along width
                              Higher values = less pixelation
                              Typical range: 8-200
+        workers (int): Threads for tile-parallel processing of large images.
+                       None or 1 = single-threaded. The result is identical
+                       either way; modes "1" and "P" always run single-threaded.
+        reducing_gap (float): Tolerance for early reduction. If set, the
+                              image is first shrunk with Image.reduce() by
+                              the largest integer factor that keeps at
+                              least this many pixels per grid pixel
+                              (DEFAULT_REDUCING_GAP = 3.0 is practically
+                              lossless). None = exact; alpha modes are
+                              only reduced with linear (premultiplied).
+        colors (int): Reduce the grid to this many colors before upscaling
+                      (see reduce_palette); the result is then mode "P"
+        palette: Fixed palette for the grid, a name in PALETTES
+                 ("pico-8", "gameboy") or a sequence of (r, g, b)
+        dither (str): Dithering of the palette-reduced grid, one of DITHERS
+                      ("ordered" or "diffusion"; needs colors or palette)
+        reducer (str): How a block becomes one grid pixel, one of REDUCERS:
+                       "mean"   - average color (workers apply)
+                       "median" - per-channel median, keeps edges crisp
+                       "mode"   - dominant color of the block, keeps the
+                                  flat colors of pixel art / line art
+                       median and mode sample every n-th pixel instead of
+                       averaging when reducing_gap allows it.
+        linear (bool): Average the mean reducer's blocks in linear light
+                       instead of on sRGB codes, so fine high-contrast
+                       detail keeps its brightness (black/white stripes
+                       give gray 188, not 128). Replaces workers;
+                       with reducing_gap the early reduction of 8-bit
+                       images (alpha modes too) is done in linear light.
         
     Returns:
         PIL.Image: Pixelated image at original resolution
         
     Raises:
-        ValueError: If segments_count is invalid
+        ValueError: If segments_count, workers, colors, palette, dither or
+                    reducer is invalid
         
     Examples:
         >>> img = Image.open("photo.jpg")
         >>> pixelated = apply_pixelate(img, 32)  # 32 segments = heavy pixelation
         >>> pixelated = apply_pixelate(img, 128) # 128 segments = light pixelation
+        >>> pixelated = apply_pixelate(img, 64, workers=4)
+        >>> pixelated = apply_pixelate(img, 64, palette="pico-8")
+        >>> pixelated = apply_pixelate(img, 64, colors=8, dither="ordered")
+        >>> pixelated = apply_pixelate(img, 64, reducer="mode")
+        >>> pixelated = apply_pixelate(img, 64, linear=True)
+        
+    See also:
+        pixelate_grid() returns the grid without upscaling (PixelGrid)
     """
-    # Validate input
-    if segments_count <= 0:
-        raise ValueError(f"segments_count must be positive, got {segments_count}")
+    # Step 1: Downscale to create pixel grid
+    pixel_grid = pixelate_grid(
+        image, segments_count, workers, reducing_gap, colors, palette, dither, reducer, linear
+    )
     
-    if not isinstance(image, Image.Image):
-        raise TypeError(f"Expected PIL Image, got {type(image)}")
+    try:
+        # Step 2: Upscale back to original size
+        return pixel_grid.to_image(workers)
+        
+    except Exception as e:
+        raise RuntimeError(f"Pixelation failed: {str(e)}") from e
 
-    # Store original dimensions
-    original_size = image.size
+
+def pixelate_regions(
+    image: Image.Image,
+    segments_count: int,
+    regions: Optional[Sequence[Tuple[int, int, int, int]]] = None,
+    mask: Optional[Image.Image] = None,
+    reducer: str = "mean",
+    linear: bool = False
+) -> List[Tuple[int, int, int, int]]:
+    """
+    Pixelate only some regions of an image, in place (e.g. to redact faces)
     
-    # Calculate downscaled dimensions
-    # Width becomes segments_count, height scales proportionally
-    w, h = original_size
+    Blocks follow the image's global grid: every region is widened to the
+    whole blocks it touches, only that crop is reduced (exact integer
+    blocks, see _block_counts), and the blocks are pasted back inside the
+    region alone. Inside a region every block is the exact mean of its
+    pixels in the whole image's grid (or the given reducer/linear), so
+    adjacent and overlapping regions line up seamlessly; pixels outside all regions are not touched. Work and
+    memory follow the area of the regions, not of the image.
     
-    if w <= 0 or h <= 0:
-        raise ValueError(f"Invalid image dimensions: {w}x{h}")
+    Args:
+        image (PIL.Image): Image to modify (mode in _NUMPY_MODES)
+        segments_count (int): Segments along the full image width (at most
+                              the width)
+        regions (Sequence): (left, top, right, bottom) boxes; parts outside
+                            the image are ignored
+        mask (PIL.Image): Mode "1" or "L" mask of the image's size; nonzero
+                          pixels are pixelated (L values between 0 and 255
+                          blend, for soft edges). Its bounding box is the
+                          area processed.
+        reducer (str): Block reducer, one of REDUCERS
+        linear (bool): Average the mean reducer in linear light
+        
+    Returns:
+        List[Tuple[int, int, int, int]]: Boxes that were pixelated (the
+        regions clipped to the image, then the mask's bounding box)
+        
+    Raises:
+        ValueError: If the arguments are invalid
+        
+    Examples:
+        >>> pixelate_regions(img, 64, regions=[(120, 80, 220, 200)])
+        >>> pixelate_regions(img, 64, mask=faces_mask, reducer="median")
+    """
+    import numpy as np
     
-    aspect_ratio = h / w
-    small_w = segments_count
-    small_h = max(1, int(small_w * aspect_ratio))  # Ensure at least 1 pixel height
+    if not isinstance(image, Image.Image):
+        raise TypeError(f"Expected PIL Image, got {type(image)}")
+    if image.mode not in _NUMPY_MODES:
+        raise ValueError(f"pixelate_regions does not support mode {image.mode}")
+    width, height = image.size
+    if not 0 < segments_count <= width:
+        raise ValueError(f"segments_count must be 1-{width} (the image width), got {segments_count}")
+    if reducer not in REDUCERS:
+        raise ValueError(f"Unknown reducer '{reducer}'. Use: {', '.join(REDUCERS)}")
+    if linear and reducer != "mean":
+        raise ValueError("linear needs the mean reducer")
+    if regions is None and mask is None:
+        raise ValueError("pixelate_regions needs regions or a mask")
+    if mask is not None:
+        if mask.mode not in ("1", "L"):
+            raise ValueError(f"mask must be mode 1 or L, got {mask.mode}")
+        if mask.size != image.size:
+            raise ValueError(f"mask size {mask.size} differs from the image size {image.size}")
     
-    try:
-        # Step 1: Downscale to create pixel grid
-        # BOX resampling averages colors within each segment for better quality
-        small_img = image.resize(
-            (small_w, small_h), 
-            resample=Image.Resampling.BOX
-        )
+    areas = []  # (box, mask or None)
+    for left, top, right, bottom in regions or ():
+        box = (max(0, left), max(0, top), min(width, right), min(height, bottom))
+        if box[0] < box[2] and box[1] < box[3]:
+            areas.append((box, None))
+    if mask is not None:
+        bbox = mask.getbbox()
+        if bbox is not None:
+            areas.append((bbox, mask))
+    
+    # Global block edges (what the NEAREST upscale of the full grid paints)
+    small_w, small_h = _grid_size(image.size, segments_count)
+    x_counts = _block_counts(small_w, width)
+    y_counts = _block_counts(small_h, height)
+    x_edges = np.concatenate(([0], np.cumsum(x_counts)))
+    y_edges = np.concatenate(([0], np.cumsum(y_counts)))
+    
+    # All blocks are computed before anything is pasted, so overlapping
+    # regions read the original pixels
+    patches = []
+    for box, area_mask in areas:
+        left, top, right, bottom = box
+        x0 = int(np.searchsorted(x_edges, left, "right")) - 1
+        x1 = int(np.searchsorted(x_edges, right, "left"))
+        y0 = int(np.searchsorted(y_edges, top, "right")) - 1
+        y1 = int(np.searchsorted(y_edges, bottom, "left"))
+        counts = (x_counts[x0:x1], y_counts[y0:y1])
+        aligned = (int(x_edges[x0]), int(y_edges[y0]), int(x_edges[x1]), int(y_edges[y1]))
         
-        # Step 2: Upscale back to original size
-        # NEAREST interpolation preserves sharp pixel boundaries
-        pixelated = small_img.resize(
-            original_size, 
-            resample=Image.Resampling.NEAREST
-        )
+        source = image.crop(aligned)
+        grid_size = (x1 - x0, y1 - y0)
+        if reducer != "mean":
+            grid = _rank_grid(source, grid_size, reducer, counts)
+        elif linear:
+            grid = _linear_grid(source, grid_size, counts)
+        else:
+            grid = _numpy_grid(source, grid_size, counts)
+        if grid.mode != image.mode:
+            grid = grid.convert(image.mode)
         
-        return pixelated
+        # Expand every grid pixel to the part of its block inside the region
+        x_parts, y_parts = counts[0].copy(), counts[1].copy()
+        x_parts[0] -= left - aligned[0]
+        x_parts[-1] -= aligned[2] - right
+        y_parts[0] -= top - aligned[1]
+        y_parts[-1] -= aligned[3] - bottom
+        # Columns first, on the few grid rows; the full-size pass then copies whole rows
+        rows = np.repeat(np.asarray(grid), x_parts, axis=1)
+        patch = _from_array(np.repeat(rows, y_parts, axis=0), image.mode)
+        patches.append((patch, box, None if area_mask is None else area_mask.crop(box)))
+    
+    for patch, box, patch_mask in patches:
+        image.paste(patch, box[:2], patch_mask)
+    return [box for box, _ in areas]
+
+
+def make_proxy(image: Image.Image, max_size: Tuple[int, int]) -> Image.Image:
+    """
+    Downscale an image to fit max_size for previews
+    
+    Args:
+        image (PIL.Image): Full-resolution image
+        max_size (Tuple[int, int]): Bounding (width, height), e.g. the display size
         
-    except Exception as e:
-        raise RuntimeError(f"Pixelation failed: {str(e)}") from e
+    Returns:
+        PIL.Image: Downscaled copy, or the image itself if it already fits
+    """
+    width, height = image.size
+    scale = min(max_size[0] / width, max_size[1] / height)
+    if scale >= 1:
+        return image
+    
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return image.resize(size, Image.Resampling.BOX, reducing_gap=DEFAULT_REDUCING_GAP)
+
+
+def pixelate_proxy(
+    proxy: Image.Image, 
+    full_size: Tuple[int, int], 
+    segments_count: int,
+    reducer: str = "mean",
+    linear: bool = False
+) -> PixelGrid:
+    """
+    Preview pixelation computed on a downscaled proxy (see make_proxy)
+    
+    The grid has the same size as the full-resolution result, so the preview
+    shows the same blocks; only block colors and edges are approximate.
+    
+    Args:
+        proxy (PIL.Image): Downscaled image
+        full_size (Tuple[int, int]): Size of the full-resolution image
+        segments_count (int): Number of pixel segments along width
+        reducer (str): Block reducer (see apply_pixelate)
+        linear (bool): Average the mean reducer in linear light (see apply_pixelate)
+        
+    Returns:
+        PixelGrid: Grid sized for the proxy
+    """
+    if segments_count <= 0:
+        raise ValueError(f"segments_count must be positive, got {segments_count}")
+    if reducer not in REDUCERS:
+        raise ValueError(f"Unknown reducer '{reducer}'. Use: {', '.join(REDUCERS)}")
+    
+    grid_size = _grid_size(full_size, segments_count)
+    if reducer != "mean":
+        return PixelGrid(_rank_grid(proxy, grid_size, reducer), proxy.size)
+    if linear:
+        return PixelGrid(_linear_grid(proxy, grid_size), proxy.size)
+    
+    grid = proxy.resize(grid_size, resample=Image.Resampling.BOX)
+    return PixelGrid(grid, proxy.size)
 
 
 def get_recommended_segment_count(image: Image.Image, intensity: str = "medium") -> int:
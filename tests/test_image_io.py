@@ -0,0 +1,48 @@
+"""
+Tests for image_io.BandWriter: bands written through <path>.part
+
+    python -m pytest tests
+"""
+
+import os
+
+import pytest
+from PIL import Image
+
+from image_io import BandWriter, open_image
+
+
+@pytest.mark.parametrize("name", ["out.png", "out.ppm", "out.bmp"])
+def test_band_writer_renames_on_close(tmp_path, name):
+    path = str(tmp_path / name)
+    image = Image.linear_gradient("L").convert("RGB")
+    with BandWriter(path, image.size, "RGB") as writer:
+        for top in range(0, image.height, 100):
+            writer.write(image.crop((0, top, image.width, min(top + 100, image.height))))
+            assert not os.path.exists(path)
+
+    assert os.listdir(tmp_path) == [name]
+    with open_image(path) as result:
+        assert result.tobytes() == image.tobytes()
+
+
+@pytest.mark.parametrize("name", ["out.png", "out.ppm", "out.bmp"])
+def test_band_writer_failure_keeps_previous_file(tmp_path, name):
+    path = tmp_path / name
+    path.write_bytes(b"previous")
+    with pytest.raises(RuntimeError):
+        with BandWriter(str(path), (64, 64), "RGB") as writer:
+            writer.write(Image.new("RGB", (64, 32)))
+            raise RuntimeError("interrupted")
+
+    assert os.listdir(tmp_path) == [name]
+    assert path.read_bytes() == b"previous"
+
+
+def test_band_writer_missing_rows_leave_nothing(tmp_path):
+    path = str(tmp_path / "out.png")
+    writer = BandWriter(path, (64, 64), "RGB")
+    writer.write(Image.new("RGB", (64, 32)))
+    with pytest.raises(ValueError):
+        writer.close()
+    assert os.listdir(tmp_path) == []
\ No newline at end of file
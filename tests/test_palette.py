@@ -0,0 +1,46 @@
+"""
+Tests for pixel_transform.reduce_palette: adaptive palettes of every size,
+with and without dithering, and alpha on GIF export
+
+    python -m pytest tests
+"""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from pixel_transform import _nearest_indices, pixelate_grid
+from test_pixel_transform import make_image
+
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA"])
+@pytest.mark.parametrize("dither", ["ordered", "diffusion"])
+def test_dither_with_256_colors(mode, dither):
+    image = make_image((800, 600), mode)
+    grid = pixelate_grid(image, 200, colors=256, dither=dither).grid
+    assert grid.mode == "P" and grid.size == (200, 150)
+    used = np.unique(np.asarray(grid))
+    assert len(grid.getpalette()) // 3 <= 256 and used.max() < len(grid.getpalette()) // 3
+
+
+def test_direct_mapping_matches_the_lut():
+    # Palettes used once skip the LUT but must pick the same nearest colors
+    rng = np.random.default_rng(1)
+    rgb = rng.integers(0, 256, (300, 400, 3), dtype=np.uint8)
+    colors = tuple(tuple(int(c) for c in color) for color in rng.integers(0, 256, (200, 3)))
+    assert (_nearest_indices(rgb, colors, lut=False) == _nearest_indices(rgb, colors)).all()
+
+@pytest.mark.parametrize("dither", [None, "ordered"])
+def test_transparent_grid_exports_to_gif(tmp_path, dither):
+    image = make_image((400, 300), "RGBA")
+    pixels = np.array(image)
+    pixels[:150, :, 3] = 0  # top half fully transparent
+    pixels[150:, :, 3] = 255
+    grid = pixelate_grid(Image.fromarray(pixels, "RGBA"), 40, colors=256, dither=dither).grid
+    assert grid.mode == "P" and "transparency" in grid.info
+
+    path = tmp_path / "grid.gif"
+    grid.save(path)
+    with Image.open(path) as saved:
+        alpha = np.asarray(saved.convert("RGBA"))[:, :, 3]
+    assert (alpha[:15] == 0).all() and (alpha[15:] == 255).all()
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+Tests for pixel_transform: exact integer blocks (pixelate_regions over the
+whole image) against Pillow's BOX grid
+
+    python -m pytest tests
+"""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from pixel_transform import DEFAULT_REDUCING_GAP, apply_pixelate, pixelate_grid, pixelate_regions
+
+
+def make_image(size, mode="RGB", seed=0, min_alpha=0):
+    """Noise over a gradient, so neighbouring blocks have distinct means"""
+    width, height = size
+    rng = np.random.default_rng(seed)
+    gradient = np.linspace(0, 160, width)[None, :, None] + np.linspace(0, 60, height)[:, None, None]
+    pixels = (gradient + rng.integers(0, 96, (height, width, 4))).astype(np.uint8)
+    pixels[:, :, 3] = np.maximum(pixels[:, :, 3], min_alpha)
+    image = Image.fromarray(pixels, "RGBA")
+    return image if mode == "RGBA" else image.convert(mode)
+
+
+def exact_pixelate(image, segments):
+    """The whole image as one region: exact integer block means"""
+    result = image.copy()
+    pixelate_regions(result, segments, [(0, 0, image.width, image.height)])
+    return result
+
+
+# Largest difference from BOX: 1 level of rounding, which alpha modes turn into
+# up to 255 / alpha levels when dividing the premultiplied color by alpha
+# again (the tests keep alpha >= 192)
+TOLERANCE = {"L": 1, "RGB": 1, "RGBA": 3}
+
+
+def max_difference(a, b):
+    assert a.size == b.size and a.mode == b.mode
+    return int(np.abs(np.asarray(a, dtype=np.int16) - np.asarray(b, dtype=np.int16)).max())
+
+
+@pytest.mark.parametrize("mode", ["L", "RGB", "RGBA"])
+@pytest.mark.parametrize("size, segments", [((640, 480), 64), ((600, 400), 200)])
+def test_exact_blocks_match_pillow_on_whole_blocks(mode, size, segments):
+    # Blocks that divide the image evenly have the same edges in both
+    image = make_image(size, mode, min_alpha=192)
+    pillow = apply_pixelate(image, segments)
+    exact = exact_pixelate(image, segments)
+    assert max_difference(pillow, exact) <= TOLERANCE[mode]
+
+
+@pytest.mark.parametrize("mode", ["L", "RGB", "RGBA"])
+def test_exact_blocks_close_to_pillow_on_fractional_blocks(mode):
+    # Smooth content: moving a block edge by a fraction of a pixel barely matters
+    image = make_image((100, 67), mode, min_alpha=192).resize((1001, 667), Image.Resampling.BICUBIC)
+    pillow = apply_pixelate(image, 37)
+    exact = exact_pixelate(image, 37)
+    assert max_difference(pillow, exact) <= TOLERANCE[mode]
+
+
+def test_exact_blocks_are_exact_means():
+    image = make_image((12, 9), "L")
+    result = np.asarray(exact_pixelate(image, 4))
+    pixels = np.asarray(image, dtype=np.int64)
+    for top in range(0, 9, 3):
+        for left in range(0, 12, 3):
+            block = pixels[top:top + 3, left:left + 3]
+            # Rounded half up, and painted over the whole block
+            assert (result[top:top + 3, left:left + 3] == (block.sum() + 4) // 9).all()
+
+@pytest.mark.parametrize("mode", ["L", "RGB", "RGBA", "LA"])
+def test_linear_reducing_gap_close_to_exact(mode):
+    # The early reduction is done by Pillow in linear light, alpha premultiplied;
+    # on gradients its shifted block edges barely matter
+    x = np.linspace(0, 255, 1203)[None, :]
+    y = np.linspace(0, 255, 807)[:, None]
+    channels = [x + 0 * y, y + 0 * x, (x + y) / 2, 64 + x * y / 340]
+    image = Image.fromarray(np.stack(channels, axis=2).astype(np.uint8), "RGBA").convert(mode)
+    exact = pixelate_grid(image, 100, linear=True).grid
+    reduced = pixelate_grid(image, 100, linear=True, reducing_gap=DEFAULT_REDUCING_GAP).grid
+    assert max_difference(exact, reduced) <= 2
\ No newline at end of file
@@ -0,0 +1,50 @@
+"""
+Tests for the streaming pixel_transform path: bands producing exactly the
+pixels of the in-memory apply_pixelate
+
+    python -m pytest tests
+"""
+
+import pytest
+from PIL import Image
+
+from image_io import open_image
+from pixel_transform import apply_pixelate, iter_pixelate_bands, pixelate_file
+from test_pixel_transform import make_image
+
+
+@pytest.mark.parametrize("mode", ["L", "RGB", "RGBA"])
+@pytest.mark.parametrize("band_height", [1, 37, 256, 5000])
+def test_bands_are_bit_identical(mode, band_height):
+    image = make_image((811, 613), mode)
+    expected = apply_pixelate(image, 29)
+    banded = Image.new(mode, image.size)
+    for top, band in iter_pixelate_bands(image, 29, band_height):
+        banded.paste(band, (0, top))
+    assert banded.tobytes() == expected.tobytes()
+
+
+@pytest.mark.parametrize("output", ["out.png", "out.ppm", "out.bmp"])
+def test_pixelate_file_is_bit_identical(tmp_path, output):
+    # PPM is decoded band by band, PNG and PPM are encoded band by band
+    source = tmp_path / "source.ppm"
+    make_image((900, 700)).save(source)
+    size = pixelate_file(str(source), str(tmp_path / output), 40, band_height=64)
+
+    with open_image(str(source)) as image:
+        expected = apply_pixelate(image, 40)
+    with open_image(str(tmp_path / output)) as result:
+        assert size == result.size
+        assert result.tobytes() == expected.tobytes()
+
+
+@pytest.mark.parametrize("mode", ["L", "RGBA"])
+@pytest.mark.parametrize("width", [10, 20])
+def test_tall_image_bands_are_bit_identical(mode, width):
+    # Over 100 times taller than wide: Pillow reduces vertically first
+    image = make_image((width, 3000), mode)
+    expected = apply_pixelate(image, 7)
+    banded = Image.new(mode, image.size)
+    for top, band in iter_pixelate_bands(image, 7, 256):
+        banded.paste(band, (0, top))
+    assert banded.tobytes() == expected.tobytes()
\ No newline at end of file
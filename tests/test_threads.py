@@ -0,0 +1,31 @@
+"""
+Tests for the threaded pixel_transform paths: bands reduced and expanded on
+a thread pool producing exactly the pixels of the single-threaded ones
+
+    python -m pytest tests
+"""
+
+import pytest
+
+from pixel_transform import PixelGrid, apply_pixelate
+from test_pixel_transform import make_image
+
+
+# Images over 100 times taller than wide are reduced vertically first by Pillow
+@pytest.mark.parametrize("mode", ["L", "LA", "RGB", "RGBA", "P"])
+@pytest.mark.parametrize(
+    "size, segments", [((1203, 807), 50), ((317, 1999), 13), ((10, 3000), 7), ((20, 3000), 7)]
+)
+@pytest.mark.parametrize("workers", [2, 3, 8])
+def test_threaded_pixelation_is_bit_identical(mode, size, segments, workers):
+    image = make_image(size, mode)
+    single = apply_pixelate(image, segments)
+    threaded = apply_pixelate(image, segments, workers=workers)
+    assert threaded.tobytes() == single.tobytes()
+
+
+@pytest.mark.parametrize("workers", [2, 5])
+def test_threaded_upscale_is_bit_identical(workers):
+    grid = make_image((71, 43))
+    pixel_grid = PixelGrid(grid, (1500, 1001))
+    assert pixel_grid.to_image(workers=workers).tobytes() == pixel_grid.to_image().tobytes()
\ No newline at end of file
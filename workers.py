@@ -0,0 +1,154 @@
+"""
+Background Workers - Run slow image operations off the GUI thread
+
+Each JobLane runs one kind of job (crop, pixelation, ...) on its own
+single-thread QThreadPool. Every submission gets a new generation number;
+results of superseded generations are dropped, and a superseded job that
+has not started yet is taken back out of the pool. Pillow calls cannot be
+interrupted, so a job that is already running finishes in the background
+and its result is discarded.
+"""
+
+import time
+
+from PyQt6 import QtCore
+
+
+class _JobSignals(QtCore.QObject):
+    """Signals emitted from the worker thread (delivered on the GUI thread)"""
+    
+    finished = QtCore.pyqtSignal(int, object, float)  # generation, result, seconds
+    failed = QtCore.pyqtSignal(int, str)               # generation, error message
+    progress = QtCore.pyqtSignal(int, float, str)      # generation, fraction, stage
+
+
+class _Job(QtCore.QRunnable):
+    """Runnable that calls fn(*args, **kwargs) unless it was superseded"""
+    
+    def __init__(self, lane, generation, fn, args, kwargs, with_progress=False):
+        super().__init__()
+        # Kept alive by the lane so it can still be taken back from the pool
+        self.setAutoDelete(False)
+        self.generation = generation
+        self.signals = _JobSignals()
+        self._lane = lane
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+        if with_progress:
+            self._kwargs = dict(kwargs, progress=self._report)
+    
+    def _report(self, fraction, stage=""):
+        """Progress callback handed to fn (worker thread)"""
+        self.signals.progress.emit(self.generation, fraction, stage)
+    
+    def run(self):
+        if self.generation != self._lane.generation:
+            # Superseded while queued: skip the work entirely
+            self.signals.finished.emit(self.generation, None, 0.0)
+            return
+        
+        start = time.perf_counter()
+        try:
+            result = self._fn(*self._args, **self._kwargs)
+        except Exception as e:
+            self.signals.failed.emit(self.generation, str(e))
+        else:
+            self.signals.finished.emit(self.generation, result, time.perf_counter() - start)
+
+
+class JobLane(QtCore.QObject):
+    """
+    Runs jobs one at a time in the background, delivering only the latest
+    
+    Signals:
+        busy_changed(bool): Jobs started running / all jobs are done
+    """
+    
+    busy_changed = QtCore.pyqtSignal(bool)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.generation = 0
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._jobs = {}  # generation -> (job, on_done, on_error, on_progress)
+    
+    @property
+    def busy(self) -> bool:
+        return bool(self._jobs)
+    
+    def submit(self, fn, *args, on_done, on_error=None, on_progress=None, **kwargs) -> int:
+        """
+        Run fn(*args, **kwargs) in the background, superseding earlier jobs
+        
+        Args:
+            fn (Callable): Function to run on the worker thread
+            on_done (Callable): Called on the GUI thread as
+                                on_done(result, seconds), only if this is
+                                still the latest job
+            on_error (Callable): Called on the GUI thread as on_error(message)
+                                 if fn raised and this is still the latest job
+            on_progress (Callable): If given, fn also receives a progress
+                                    keyword argument, progress(fraction, stage),
+                                    forwarded to the GUI thread as
+                                    on_progress(fraction, stage) for the latest job
+            
+        Returns:
+            int: Generation number of the new job
+        """
+        was_busy = self.busy
+        self._supersede()
+        
+        job = _Job(self, self.generation, fn, args, kwargs, with_progress=on_progress is not None)
+        job.signals.finished.connect(self._on_finished)
+        job.signals.failed.connect(self._on_failed)
+        job.signals.progress.connect(self._on_progress)
+        
+        self._jobs[job.generation] = (job, on_done, on_error, on_progress)
+        self._pool.start(job)
+        if not was_busy:
+            self.busy_changed.emit(True)
+        return job.generation
+    
+    def cancel(self):
+        """Supersede all submitted jobs (their results will be dropped)"""
+        was_busy = self.busy
+        self._supersede()
+        if was_busy and not self.busy:
+            self.busy_changed.emit(False)
+    
+    def _supersede(self):
+        self.generation += 1
+        
+        # Queued jobs that have not started can be removed outright
+        for generation, (job, *_) in list(self._jobs.items()):
+            if self._pool.tryTake(job):
+                del self._jobs[generation]
+    
+    def wait(self, msecs: int = -1) -> bool:
+        """Block until the worker thread is idle (results are still queued)"""
+        return self._pool.waitForDone(msecs)
+    
+    def _on_finished(self, generation, result, seconds):
+        _, on_done, _, _ = self._take(generation)
+        if generation == self.generation:
+            on_done(result, seconds)
+    
+    def _on_failed(self, generation, message):
+        _, _, on_error, _ = self._take(generation)
+        if generation == self.generation and on_error is not None:
+            on_error(message)
+    
+    def _on_progress(self, generation, fraction, stage):
+        entry = self._jobs.get(generation)
+        if entry is not None and generation == self.generation:
+            entry[3](fraction, stage)
+    
+    def _take(self, generation):
+        entry = self._jobs.pop(generation, None)
+        if entry is None:
+            return None, None, None, None
+        if not self._jobs:
+            self.busy_changed.emit(False)
+        return entry
\ No newline at end of file